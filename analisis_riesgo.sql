@@ -2,143 +2,161 @@
 -- Proyecto: Backend Bancario - Base de Datos de Riesgo
 -- Autor: William Lujan Arispe (Ingeniero de Sistemas)
 -- Fecha: Febrero 2026
--- Descripción: Script SQL para estructurar y analizar cartera de créditos.
---              Demuestra DDL, DML, JOINs, CASE WHEN y análisis de morosidad.
--- Herramienta: SQLiteOnline.com / SQLite / cualquier RDBMS compatible
+-- Descripción: Script SQL para analizar la cartera de créditos sobre el
+--              Star Schema real del ETL (Fact_Prestamos + dimensiones + cubo).
+--              Demuestra JOINs, CASE WHEN, agregaciones y análisis de morosidad.
+-- Herramienta: SQLite / DuckDB (misma sintaxis en ambos motores)
 -- =============================================================================
 
 
 -- ═══════════════════════════════════════════════════════════════════════════
--- PASO 1: ARQUITECTURA (DDL - Data Definition Language)
--- Creamos el esquema relacional con Primary Keys y Foreign Keys
+-- PASO 1: ARQUITECTURA Y CARGA (DDL + DML)
+-- El ETL crea las tablas con Primary Keys, Foreign Keys e índices y carga
+-- los datos reales por lotes (ver PASO 5B en etl_pipeline/pipeline.py):
+--
+--   python3 -m etl_pipeline --base-datos data/processed/riesgo.db     (SQLite)
+--   python3 -m etl_pipeline --base-datos data/processed/riesgo.duckdb (DuckDB)
+--
+-- Esquema resultante:
+--   Dim_Proposito (ID_Proposito PK, Proposito, Categoria_Proposito)
+--   Dim_Tiempo    (ID_Tiempo PK = YYYYMMDD, Fecha, Anio, Mes, Nombre_Mes, Trimestre, ...,
+--                  Es_Feriado, Es_Dia_Habil, Anio_Fiscal, ...): calendario completo
+--   Dim_Riesgo    (ID_Riesgo PK, Estado_Riesgo, Descripcion, Etiqueta_ES, Color_HEX)
+--   Dim_Cliente   (ID_Cliente PK, Codigo_Cliente, Version, Prestamo_Desde, Genero,
+--                  Estado_Civil, Trabajo, Vivienda, ...): una fila por versión del
+--                  cliente (SCD 2), en orden de carga
+--   Fact_Prestamos(ID_Prestamo PK, ID_Cliente FK, ID_Proposito FK, ID_Tiempo FK,
+--                  ID_Riesgo FK, Monto, Duracion, Tasa, Cuota_Mensual, ...,
+--                  Categoria_Score, Rango_Monto, Edad, Rango_Edad, Status_Cuenta, ...)
+--   Cubo_Riesgo   (Propósito × Año/Trimestre/Mes × Rango_Edad × Categoria_Score ×
+--                  Estado_Riesgo → Creditos, Creditos_Malos, Monto_Total, ...)
+-- Índices: Fact_Prestamos(ID_Cliente), (ID_Proposito), (ID_Tiempo),
+--          (ID_Riesgo); Dim_Cliente(Codigo_Cliente); Dim_Riesgo(Estado_Riesgo);
+--          Cubo_Riesgo(ID_Proposito), (Estado_Riesgo)
+-- Version_Datos (Version, Fecha): cambia en cada carga. `python3 -m etl_pipeline report`
+-- materializa estas consultas en tablas Resumen_* y las actualiza con los
+-- hechos nuevos cuando cambia la versión.
 -- ═══════════════════════════════════════════════════════════════════════════
 
--- 1. Crear la tabla de CLIENTES (Datos demográficos)
-CREATE TABLE Clientes (
-    id_cliente INT PRIMARY KEY,
-    edad INT,
-    genero VARCHAR(10),
-    trabajo VARCHAR(50),
-    vivienda VARCHAR(20)
-);
-
--- 2. Crear la tabla de PRESTAMOS (Datos financieros)
--- Esta tabla se conecta con Clientes mediante una Foreign Key
-CREATE TABLE Prestamos (
-    id_prestamo INT PRIMARY KEY,
-    id_cliente INT,
-    monto DECIMAL(10,2),
-    proposito VARCHAR(50),
-    riesgo VARCHAR(10), -- 'Good' o 'Bad'
-    FOREIGN KEY (id_cliente) REFERENCES Clientes(id_cliente)
-);
-
-
--- ═══════════════════════════════════════════════════════════════════════════
--- PASO 2: INGESTA DE DATOS (DML - Data Manipulation Language)
--- Muestra representativa basada en el German Credit Data real
--- ═══════════════════════════════════════════════════════════════════════════
-
--- Insertar datos de prueba en CLIENTES
-INSERT INTO Clientes VALUES 
-(1, 22, 'Mujer', 'Calificado', 'Propia'),
-(2, 45, 'Hombre', 'No calificado', 'Gratis'),
-(3, 33, 'Hombre', 'Profesional', 'Alquiler'),
-(4, 28, 'Mujer', 'Calificado', 'Alquiler'),
-(5, 50, 'Hombre', 'Ejecutivo', 'Propia');
-
--- Insertar datos de prueba en PRESTAMOS
--- Fíjate cómo algunos son 'Bad' (Riesgo)
-INSERT INTO Prestamos VALUES 
-(101, 1, 5000.00, 'Radio/TV', 'Bad'),
-(102, 2, 1200.00, 'Educacion', 'Good'),
-(103, 3, 9500.00, 'Auto Nuevo', 'Bad'),
-(104, 4, 2500.00, 'Muebles', 'Good'),
-(105, 5, 15000.00, 'Negocios', 'Good'),
-(106, 1, 800.00, 'Reparaciones', 'Bad'); -- El cliente 1 pidió otro préstamo
-
 
 -- ═══════════════════════════════════════════════════════════════════════════
--- PASO 3: ANÁLISIS (DQL - Data Query Language)
+-- PASO 2: ANÁLISIS (DQL - Data Query Language)
 -- Consultas de inteligencia de negocio sobre la cartera
 -- ═══════════════════════════════════════════════════════════════════════════
 
 -- ─── 3.1 CONSULTA MAESTRA DE RIESGO ──────────────────────────────────────
 -- "¿Cuánto dinero hemos prestado por categoría y cuántos son de alto riesgo?"
--- Técnicas: JOIN, GROUP BY, CASE WHEN, Agregaciones
-SELECT 
-    p.proposito AS Categoria,
-    COUNT(*) AS Total_Prestamos,
-    SUM(p.monto) AS Dinero_Total_Prestado,
+-- Técnicas: JOIN, GROUP BY, Agregaciones sobre el cubo pre-agregado
+-- (mismo resultado que agrupar Fact_Prestamos, sin recorrer los hechos)
+SELECT
+    p.Proposito AS Categoria,
+    SUM(c.Creditos) AS Total_Prestamos,
+    SUM(c.Monto_Total) AS Dinero_Total_Prestado,
     -- Aquí calculamos cuántos son tóxicos (Bad)
-    SUM(CASE WHEN p.riesgo = 'Bad' THEN 1 ELSE 0 END) AS Prestamos_Riesgosos,
+    SUM(c.Creditos_Malos) AS Prestamos_Riesgosos,
     -- Calculamos el % de Riesgo
-    ROUND(CAST(SUM(CASE WHEN p.riesgo = 'Bad' THEN 1 ELSE 0 END) AS FLOAT) / COUNT(*) * 100, 1) || '%' AS Tasa_Morosidad
-FROM Prestamos p
-JOIN Clientes c ON p.id_cliente = c.id_cliente
-GROUP BY p.proposito
+    ROUND(CAST(SUM(c.Creditos_Malos) AS DOUBLE) / SUM(c.Creditos) * 100, 1) || '%' AS Tasa_Morosidad
+FROM Cubo_Riesgo c
+JOIN Dim_Proposito p ON c.ID_Proposito = p.ID_Proposito
+GROUP BY p.Proposito
 ORDER BY Dinero_Total_Prestado DESC;
 
 
 -- ─── 3.2 PERFIL DE CLIENTES MOROSOS ──────────────────────────────────────
 -- "¿Quiénes son los clientes que no pagan? ¿Qué tienen en común?"
-SELECT 
-    c.id_cliente,
-    c.edad,
-    c.genero,
-    c.trabajo,
-    c.vivienda,
-    COUNT(p.id_prestamo) AS Num_Prestamos,
-    SUM(p.monto) AS Deuda_Total,
-    SUM(CASE WHEN p.riesgo = 'Bad' THEN p.monto ELSE 0 END) AS Monto_En_Riesgo
-FROM Clientes c
-JOIN Prestamos p ON c.id_cliente = p.id_cliente
-GROUP BY c.id_cliente
-HAVING SUM(CASE WHEN p.riesgo = 'Bad' THEN 1 ELSE 0 END) > 0
-ORDER BY Monto_En_Riesgo DESC;
+-- Un cliente (Codigo_Cliente) puede tener varios préstamos y varias versiones
+-- en Dim_Cliente: se suman todos sus préstamos, el perfil es el de su
+-- versión vigente (la de mayor ID_Cliente) y la edad, la mayor de sus préstamos
+SELECT
+    m.Codigo_Cliente,
+    m.Edad,
+    c.Genero,
+    c.Trabajo,
+    c.Vivienda,
+    m.Num_Prestamos,
+    m.Deuda_Total,
+    m.Monto_En_Riesgo
+FROM (
+    SELECT
+        d.Codigo_Cliente,
+        COUNT(*) AS Num_Prestamos,
+        SUM(f.Monto) AS Deuda_Total,
+        SUM(CASE WHEN f.ID_Riesgo = b.ID_Riesgo THEN f.Monto ELSE 0 END) AS Monto_En_Riesgo,
+        MAX(d.ID_Cliente) AS Ultimo_Cliente,
+        MAX(f.Edad) AS Edad
+    FROM Fact_Prestamos f
+    CROSS JOIN (SELECT ID_Riesgo FROM Dim_Riesgo WHERE Estado_Riesgo = 'Bad') b
+    JOIN Dim_Cliente d ON f.ID_Cliente = d.ID_Cliente
+    GROUP BY d.Codigo_Cliente
+    HAVING SUM(CASE WHEN f.ID_Riesgo = b.ID_Riesgo THEN 1 ELSE 0 END) > 0
+) m
+JOIN Dim_Cliente c ON m.Ultimo_Cliente = c.ID_Cliente
+ORDER BY m.Monto_En_Riesgo DESC, m.Codigo_Cliente;
 
 
 -- ─── 3.3 RESUMEN EJECUTIVO DE LA CARTERA ─────────────────────────────────
--- KPIs globales: exactamente lo que mostramos en Power BI
+-- KPIs globales: exactamente lo que mostramos en Power BI (desde el cubo)
 SELECT
-    COUNT(*) AS Total_Prestamos,
-    SUM(monto) AS Monto_Total_Prestado,
-    SUM(CASE WHEN riesgo = 'Bad' THEN monto ELSE 0 END) AS Monto_En_Riesgo,
-    ROUND(CAST(SUM(CASE WHEN riesgo = 'Bad' THEN 1 ELSE 0 END) AS FLOAT) / COUNT(*) * 100, 1) || '%' AS Tasa_Morosidad_Global,
-    ROUND(AVG(monto), 2) AS Monto_Promedio_Prestamo
-FROM Prestamos;
+    SUM(Creditos) AS Total_Prestamos,
+    SUM(Monto_Total) AS Monto_Total_Prestado,
+    SUM(CASE WHEN Estado_Riesgo = 'Bad' THEN Monto_Total ELSE 0 END) AS Monto_En_Riesgo,
+    ROUND(CAST(SUM(Creditos_Malos) AS DOUBLE) / SUM(Creditos) * 100, 1) || '%' AS Tasa_Morosidad_Global,
+    ROUND(CAST(SUM(Monto_Total) AS DOUBLE) / SUM(Creditos), 2) AS Monto_Promedio_Prestamo
+FROM Cubo_Riesgo;
 
 
 -- ─── 3.4 ANÁLISIS POR TIPO DE VIVIENDA ──────────────────────────────────
 -- "¿Los que alquilan son más riesgosos que los propietarios?"
+-- El ID de 'Bad' se resuelve una vez (CROSS JOIN de una fila): así los
+-- hechos se recorren en orden en lugar de buscarse por índice de riesgo
 SELECT
-    c.vivienda,
+    c.Vivienda,
     COUNT(*) AS Total_Prestamos,
-    ROUND(AVG(p.monto), 2) AS Monto_Promedio,
-    SUM(CASE WHEN p.riesgo = 'Bad' THEN 1 ELSE 0 END) AS Malos,
-    ROUND(CAST(SUM(CASE WHEN p.riesgo = 'Bad' THEN 1 ELSE 0 END) AS FLOAT) / COUNT(*) * 100, 1) || '%' AS Tasa_Morosidad
-FROM Prestamos p
-JOIN Clientes c ON p.id_cliente = c.id_cliente
-GROUP BY c.vivienda
+    ROUND(AVG(f.Monto), 2) AS Monto_Promedio,
+    SUM(CASE WHEN f.ID_Riesgo = b.ID_Riesgo THEN 1 ELSE 0 END) AS Malos,
+    ROUND(CAST(SUM(CASE WHEN f.ID_Riesgo = b.ID_Riesgo THEN 1 ELSE 0 END) AS DOUBLE) / COUNT(*) * 100, 1) || '%' AS Tasa_Morosidad
+FROM Fact_Prestamos f
+CROSS JOIN (SELECT ID_Riesgo FROM Dim_Riesgo WHERE Estado_Riesgo = 'Bad') b
+JOIN Dim_Cliente c ON f.ID_Cliente = c.ID_Cliente
+GROUP BY c.Vivienda
 ORDER BY Tasa_Morosidad DESC;
 
 
 -- ─── 3.5 TOP CLIENTES POR EXPOSICIÓN ────────────────────────────────────
 -- "¿Quién nos debe más dinero?" (Útil para gestión de cobranzas)
+-- La exposición suma todos los préstamos del cliente (Codigo_Cliente) y el
+-- perfil es el de su versión vigente, como en 3.2
 SELECT
-    c.id_cliente,
-    c.genero || ', ' || c.edad || ' años, ' || c.trabajo AS Perfil_Cliente,
-    SUM(p.monto) AS Exposicion_Total,
-    GROUP_CONCAT(p.proposito, ' | ') AS Propositos,
-    GROUP_CONCAT(p.riesgo, ' | ') AS Estados_Riesgo
-FROM Clientes c
-JOIN Prestamos p ON c.id_cliente = p.id_cliente
-GROUP BY c.id_cliente
-ORDER BY Exposicion_Total DESC;
+    e.Codigo_Cliente,
+    c.Genero || ', ' || e.Edad || ' años, ' || c.Trabajo AS Perfil_Cliente,
+    e.Exposicion_Total,
+    e.Propositos,
+    e.Estados_Riesgo
+FROM (
+    SELECT
+        f.Codigo_Cliente,
+        SUM(f.Monto) AS Exposicion_Total,
+        GROUP_CONCAT(f.Proposito, ' | ') AS Propositos,
+        GROUP_CONCAT(f.Estado_Riesgo, ' | ') AS Estados_Riesgo,
+        MAX(f.ID_Cliente) AS Ultimo_Cliente,
+        MAX(f.Edad) AS Edad
+    FROM (
+        -- Los préstamos de cada cliente se concatenan en orden de ID_Prestamo
+        SELECT d.Codigo_Cliente, f.ID_Prestamo, f.ID_Cliente, f.Edad, f.Monto, p.Proposito, r.Estado_Riesgo
+        FROM Fact_Prestamos f
+        JOIN Dim_Cliente d ON f.ID_Cliente = d.ID_Cliente
+        JOIN Dim_Proposito p ON f.ID_Proposito = p.ID_Proposito
+        JOIN Dim_Riesgo r ON f.ID_Riesgo = r.ID_Riesgo
+        ORDER BY d.Codigo_Cliente, f.ID_Prestamo
+    ) f
+    GROUP BY f.Codigo_Cliente
+) e
+JOIN Dim_Cliente c ON e.Ultimo_Cliente = c.ID_Cliente
+ORDER BY e.Exposicion_Total DESC, e.Codigo_Cliente;
 
 
 -- =============================================================================
 -- FIN DEL SCRIPT
--- Resultado esperado: 5 consultas que demuestran JOIN, CASE WHEN, 
+-- Resultado esperado: 5 consultas que demuestran JOIN, CASE WHEN,
 -- GROUP BY, HAVING, agregaciones y análisis de riesgo crediticio.
 -- =============================================================================
@@ -0,0 +1,108 @@
+"""
+=============================================================================
+ BENCHMARK — Carga a base de datos embebida y consultas de analisis_riesgo.sql
+=============================================================================
+ Construye el Star Schema sobre un dataset sintético de N filas, lo carga en
+ SQLite y/o DuckDB y mide el tiempo de carga y el de cada consulta 3.1–3.5:
+ directa sobre el Star Schema, desde los resúmenes materializados de
+ etl_pipeline/reportes.py y desde su caché.
+
+   python3 benchmarks/bench_base_datos.py --filas 1000000
+   python3 benchmarks/bench_base_datos.py --filas 10000000 --motores duckdb
+=============================================================================
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from etl_pipeline import config, pipeline as etl  # noqa: E402
+from etl_pipeline.reportes import ReportesRiesgo  # noqa: E402
+
+RUTA_SQL = os.path.join(config.BASE_DIR, "analisis_riesgo.sql")
+EXTENSIONES = {'sqlite': 'db', 'duckdb': 'duckdb'}
+
+
+def construir_tablas(filas):
+    """Star Schema + cubo sobre `filas` registros sintéticos."""
+    df = etl.generar_dataset_sintetico(filas, np.random.default_rng(etl.SEMILLA), correlacionar=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = etl.feature_engineering(etl.decodificar(df, verbose=False), verbose=False)
+        tablas = etl.crear_star_schema(df)
+        tablas['Cubo_Riesgo'] = etl.crear_cubo(tablas.base)
+    return tablas
+
+
+def consultas(ruta=RUTA_SQL):
+    """(sección, SQL) de cada consulta del script, en orden."""
+    resultado = []
+    for bloque in open(ruta, encoding='utf-8').read().split(';'):
+        seccion = re.search(r'─── (\d\.\d)', bloque)
+        sql = '\n'.join(l for l in bloque.splitlines() if not l.strip().startswith('--')).strip()
+        if seccion and sql:
+            resultado.append((seccion.group(1), sql))
+    return resultado
+
+
+def conectar(motor, ruta):
+    if motor == 'duckdb':
+        import duckdb
+        return duckdb.connect(ruta, read_only=True)
+    return sqlite3.connect(ruta)
+
+
+def mejor_tiempo(conexion, sql, repeticiones=3):
+    """Mejor tiempo (s) de `repeticiones` ejecuciones completas de la consulta."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        conexion.execute(sql).fetchall()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=100_000)
+    parser.add_argument('--motores', nargs='+', choices=list(EXTENSIONES), default=list(EXTENSIONES))
+    args = parser.parse_args()
+
+    print(f"⏱️  Construyendo Star Schema con {args.filas:,} filas...")
+    tablas = construir_tablas(args.filas)
+
+    for motor in args.motores:
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, f"riesgo.{EXTENSIONES[motor]}")
+            inicio = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                etl.cargar_base_datos(ruta, tablas)
+            t_carga = time.perf_counter() - inicio
+            mb = os.path.getsize(ruta) / 1024 ** 2
+
+            print(f"\n   {motor.upper()}: carga {t_carga:.2f} s ({args.filas / t_carga:,.0f} filas/s), {mb:.1f} MB")
+            conexion = conectar(motor, ruta)
+            directas = {seccion: mejor_tiempo(conexion, sql) for seccion, sql in consultas()}
+            conexion.close()
+
+            with ReportesRiesgo(ruta) as reportes:
+                inicio = time.perf_counter()
+                reportes.actualizar()
+                print(f"   Resúmenes materializados en {time.perf_counter() - inicio:.2f} s")
+                print(f"   {'':4s} {'Directa (ms)':>13s} {'Resumen (ms)':>13s} {'Caché (ms)':>11s}")
+                for seccion, directa in directas.items():
+                    inicio = time.perf_counter()
+                    reportes.reporte(seccion)
+                    t_resumen = time.perf_counter() - inicio
+                    inicio = time.perf_counter()
+                    reportes.reporte(seccion)
+                    t_cache = time.perf_counter() - inicio
+                    print(f"   {seccion}  {directa * 1000:13.1f} {t_resumen * 1000:13.1f} {t_cache * 1000:11.2f}")
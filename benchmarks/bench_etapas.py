@@ -0,0 +1,218 @@
+"""
+=============================================================================
+ BENCHMARK — Etapas del ETL (tiempo, RSS pico y asignaciones)
+=============================================================================
+ Genera datasets sintéticos de N filas y mide cada etapa del pipeline en
+ memoria: descargar_dataset, cargar_y_decodificar, feature_engineering,
+ crear_star_schema, crear_cubo, exportar_tablas y reporte_calidad.
+
+ Por etapa se registra:
+   - segundos: mejor tiempo de pared entre --repeticiones corridas
+   - rss_pico_mb: RSS máximo del proceso durante la etapa
+   - asignado_pico_mb / asignado_neto_mb: memoria asignada según tracemalloc
+     (corrida aparte, porque tracemalloc distorsiona los tiempos)
+
+ Cada tamaño corre en un proceso nuevo y los resultados se guardan en JSON.
+ Con --comparar, la corrida falla (código 1) si alguna etapa es más lenta que
+ en el JSON de referencia por más de --umbral por ciento.
+
+   python3 benchmarks/bench_etapas.py --filas 1000 100000 1000000 10000000
+   python3 benchmarks/bench_etapas.py --filas 100000 --comparar base.json --umbral 15
+=============================================================================
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from etl_pipeline import pipeline as etl  # noqa: E402
+
+TAMANIOS = [1_000, 100_000, 1_000_000, 10_000_000]
+DIR_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+
+# Debajo de este tiempo de referencia la diferencia es ruido del reloj
+MINIMO_SEGUNDOS = 0.05
+
+
+class MedidorRSS:
+    """RSS máximo del proceso mientras dura el bloque `with` (muestreo en un hilo).
+
+    En Linux lee /proc/self/statm cada `intervalo` segundos; en otros sistemas
+    solo queda `ru_maxrss`, que es el máximo de toda la vida del proceso.
+    """
+
+    PAGINA = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+    def __init__(self, intervalo=0.005):
+        self._intervalo = intervalo
+        self._fin = threading.Event()
+        self.pico = 0
+
+    def _rss(self):
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * self.PAGINA
+        except OSError:
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def _muestrear(self):
+        while not self._fin.wait(self._intervalo):
+            self.pico = max(self.pico, self._rss())
+
+    def __enter__(self):
+        self.pico = self._rss()
+        self._hilo = threading.Thread(target=self._muestrear, daemon=True)
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._fin.set()
+        self._hilo.join()
+        self.pico = max(self.pico, self._rss())
+
+
+def etapas():
+    """Etapas en orden: (nombre, función(estado) → nuevo estado)."""
+    return [
+        ('descargar_dataset', lambda _: etl.descargar_dataset()),
+        ('cargar_y_decodificar', etl.cargar_y_decodificar),
+        ('feature_engineering', lambda df: etl.feature_engineering(df, np.random.default_rng(etl.SEMILLA))),
+        ('crear_star_schema', etl.crear_star_schema),
+        ('crear_cubo', lambda tablas: tablas.__setitem__('Cubo_Riesgo', etl.crear_cubo(tablas.base)) or tablas),
+        ('exportar_tablas', lambda tablas: etl.exportar_tablas(tablas) and tablas),   # devuelve el manifiesto
+        ('reporte_calidad', lambda tablas: etl.reporte_calidad(tablas) or tablas),
+    ]
+
+
+def correr_etapas(medir):
+    """Corre el pipeline completo; `medir(nombre)` da el context manager de cada etapa."""
+    estado = None
+    for nombre, etapa in etapas():
+        with medir(nombre), contextlib.redirect_stdout(io.StringIO()):
+            estado = etapa(estado)
+
+
+def medir_tamanio(directorio, repeticiones):
+    """Worker: mide las etapas sobre `directorio/german_credit.data` (proceso nuevo por tamaño)."""
+    etl.RAW_DIR = etl.PROCESSED_DIR = directorio
+    etl.RUTA_METRICAS = os.path.join(directorio, "metricas_calidad.json")
+    resultados = {nombre: {'segundos': float('inf'), 'rss_pico_mb': 0.0} for nombre, _ in etapas()}
+
+    @contextlib.contextmanager
+    def tiempo_y_rss(nombre):
+        with MedidorRSS() as rss:
+            inicio = time.perf_counter()
+            yield
+            segundos = time.perf_counter() - inicio
+        r = resultados[nombre]
+        r['segundos'] = min(r['segundos'], segundos)
+        r['rss_pico_mb'] = max(r['rss_pico_mb'], rss.pico / 1024 ** 2)
+
+    @contextlib.contextmanager
+    def asignaciones(nombre):
+        tracemalloc.reset_peak()
+        antes = tracemalloc.get_traced_memory()[0]
+        yield
+        actual, pico = tracemalloc.get_traced_memory()
+        resultados[nombre]['asignado_pico_mb'] = (pico - antes) / 1024 ** 2
+        resultados[nombre]['asignado_neto_mb'] = (actual - antes) / 1024 ** 2
+
+    for _ in range(repeticiones):
+        correr_etapas(tiempo_y_rss)
+    tracemalloc.start()
+    correr_etapas(asignaciones)
+    tracemalloc.stop()
+    return resultados
+
+
+def commit_actual():
+    """Hash corto del commit de trabajo (None fuera de un repositorio git)."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(etl.__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(actual, referencia, umbral):
+    """Lista de regresiones: (filas, etapa, s referencia, s actual, % de cambio)."""
+    regresiones = []
+    for filas, etapas_ref in referencia['resultados'].items():
+        for nombre, ref in etapas_ref.items():
+            medida = actual['resultados'].get(filas, {}).get(nombre)
+            if medida is None or ref['segundos'] < MINIMO_SEGUNDOS:
+                continue
+            cambio = 100 * (medida['segundos'] / ref['segundos'] - 1)
+            if cambio > umbral:
+                regresiones.append((filas, nombre, ref['segundos'], medida['segundos'], cambio))
+    return regresiones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, nargs='+', default=TAMANIOS)
+    parser.add_argument('--repeticiones', type=int, default=3,
+                        help="Corridas por tamaño; se guarda el mejor tiempo")
+    parser.add_argument('--salida', default=None,
+                        help="JSON de resultados (por defecto benchmarks/resultados/etapas_<commit>.json)")
+    parser.add_argument('--comparar', default=None, help="JSON de referencia para detectar regresiones")
+    parser.add_argument('--umbral', type=float, default=10.0,
+                        help="Porcentaje de enlentecimiento tolerado por etapa")
+    args = parser.parse_args()
+
+    commit = commit_actual()
+    informe = {
+        'commit': commit,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'repeticiones': args.repeticiones,
+        'resultados': {}
+    }
+
+    for filas in args.filas:
+        print(f"⏱️  {filas:,} filas...")
+        with tempfile.TemporaryDirectory(prefix='bench_etapas.') as directorio:
+            with contextlib.redirect_stdout(io.StringIO()):
+                etl.generar_archivo_sintetico(filas, os.path.join(directorio, "german_credit.data"))
+            with ProcessPoolExecutor(1) as pool:
+                resultados = pool.submit(medir_tamanio, directorio, args.repeticiones).result()
+        informe['resultados'][str(filas)] = resultados
+
+        print(f"   {'Etapa':22s} {'Tiempo (s)':>11s} {'RSS pico (MB)':>14s} {'Asignado pico (MB)':>19s}")
+        for nombre, r in resultados.items():
+            print(f"   {nombre:22s} {r['segundos']:11.3f} {r['rss_pico_mb']:14.1f} {r['asignado_pico_mb']:19.1f}")
+
+    salida = args.salida or os.path.join(DIR_RESULTADOS, f"etapas_{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, 'w', encoding='utf-8') as f:
+        json.dump(informe, f, indent=2)
+    print(f"\n💾 Resultados: {salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            referencia = json.load(f)
+        regresiones = comparar(informe, referencia, args.umbral)
+        print(f"\n📊 Comparación con {referencia.get('commit') or args.comparar} (umbral {args.umbral:g}%)")
+        for filas, nombre, antes, ahora, cambio in regresiones:
+            print(f"   🔴 {int(filas):,} filas · {nombre}: {antes:.3f}s → {ahora:.3f}s (+{cambio:.1f}%)")
+        if regresiones:
+            sys.exit(1)
+        print("   ✅ Sin regresiones")
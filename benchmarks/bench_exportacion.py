@@ -0,0 +1,104 @@
+"""
+=============================================================================
+ BENCHMARK — Formatos de exportación (CSV vs Parquet vs Feather)
+=============================================================================
+ Construye el Star Schema sobre el dataset crudo replicado N veces y mide,
+ para cada formato, el tamaño en disco y el tiempo de escritura y lectura.
+ Al final compara `exportar_tablas` (todas las tablas en un pool de hilos y
+ publicación atómica) con el tiempo de escribir solo la tabla más grande.
+
+   python3 benchmarks/bench_exportacion.py --filas 1000000 --workers 8
+=============================================================================
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from etl_pipeline import pipeline as etl  # noqa: E402
+
+LECTORES = {
+    'csv': lambda ruta: pd.read_csv(ruta, encoding='utf-8-sig'),
+    'parquet': pd.read_parquet,
+    'feather': pd.read_feather
+}
+
+CONFIGURACIONES = [
+    ('csv', {}),
+    ('parquet', {'compresion': 'snappy'}),
+    ('parquet', {'compresion': 'zstd'}),
+    ('feather', {'compresion': None}),
+    ('feather', {'compresion': 'lz4'}),
+]
+
+
+def construir_tablas(filas):
+    """Star Schema sobre el dataset crudo replicado hasta `filas` registros."""
+    crudo = pd.read_csv(os.path.join(etl.RAW_DIR, "german_credit.data"), sep=' ',
+                        header=None, names=etl.COLUMN_NAMES, dtype=etl.DTYPES_CRUDOS)
+    repeticiones = -(-filas // len(crudo))
+    crudo = pd.concat([crudo] * repeticiones, ignore_index=True).iloc[:filas]
+    df = etl.feature_engineering(etl.decodificar(crudo, verbose=False), verbose=False)
+    return etl.crear_star_schema(df)
+
+
+def medir(tablas, formato, opciones, directorio):
+    """Escribe y relee todas las tablas; devuelve (MB, s escritura, s lectura)."""
+    inicio = time.perf_counter()
+    for nombre, df in tablas.items():
+        with etl.abrir_escritor(nombre, formato, directorio, **opciones) as escritor:
+            escritor.escribir(df)
+    t_escritura = time.perf_counter() - inicio
+
+    rutas = [os.path.join(directorio, f"{nombre}.{etl.ESCRITORES[formato].extension}")
+             for nombre in tablas]
+    inicio = time.perf_counter()
+    for ruta in rutas:
+        LECTORES[formato](ruta)
+    t_lectura = time.perf_counter() - inicio
+
+    mb = sum(os.path.getsize(r) for r in rutas) / 1024 ** 2
+    return mb, t_escritura, t_lectura
+
+
+def medir_exportacion(tablas, workers, directorio):
+    """Segundos de `exportar_tablas` en CSV y de escribir sola la tabla más grande."""
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        etl.exportar_tablas(tablas, 'csv', directorio, workers=workers)
+    t_total = time.perf_counter() - inicio
+
+    nombre, df = max(tablas.items(), key=lambda item: item[1].memory_usage(deep=True).sum())
+    inicio = time.perf_counter()
+    with etl.abrir_escritor(nombre, 'csv', directorio) as escritor:
+        escritor.escribir(df)
+    return t_total, nombre, time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=None, help="Hilos de exportar_tablas (por defecto, núcleos)")
+    args = parser.parse_args()
+
+    print(f"⏱️  Construyendo Star Schema con {args.filas:,} filas...")
+    tablas = construir_tablas(args.filas)
+
+    print(f"\n   {'Formato':22s} {'Tamaño (MB)':>12s} {'Escritura (s)':>14s} {'Lectura (s)':>12s}")
+    for formato, opciones in CONFIGURACIONES:
+        etiqueta = formato + (f" ({opciones['compresion']})" if opciones.get('compresion') else "")
+        with tempfile.TemporaryDirectory() as directorio:
+            mb, t_w, t_r = medir(tablas, formato, opciones, directorio)
+        print(f"   {etiqueta:22s} {mb:12.1f} {t_w:14.2f} {t_r:12.2f}")
+
+    with tempfile.TemporaryDirectory() as directorio:
+        t_total, mayor, t_mayor = medir_exportacion(tablas, args.workers, directorio)
+    print(f"\n   exportar_tablas (CSV, {args.workers or os.cpu_count()} hilos): {t_total:.2f} s"
+          f" — {mayor} sola: {t_mayor:.2f} s")
@@ -0,0 +1,117 @@
+"""
+=============================================================================
+ BENCHMARK — Lectura del archivo crudo: pd.read_csv vs lector mmap
+=============================================================================
+ Genera un crudo sintético de N filas (o usa --archivo) y mide la lectura
+ completa, la lectura por bloques (modo streaming) y la tokenización de las
+ particiones por rango de bytes (modo paralelo) con el tokenizador genérico
+ de pandas y con el lector mmap de etl_pipeline/lector.py. Verifica que
+ ambos lectores devuelvan los mismos datos.
+
+   python3 benchmarks/bench_lector.py --filas 10000000
+   python3 benchmarks/bench_lector.py --archivo data/raw/german_credit_sintetico.data --chunksize 500000
+=============================================================================
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from etl_pipeline import pipeline as etl  # noqa: E402
+from etl_pipeline.lector import leer_bloques  # noqa: E402
+
+
+def leer_pandas(ruta):
+    return pd.read_csv(ruta, sep=' ', header=None, names=etl.COLUMN_NAMES, dtype=etl.DTYPES_CRUDOS)
+
+
+def bloques_pandas(ruta, chunksize):
+    return sum(len(chunk) for chunk in pd.read_csv(ruta, sep=' ', header=None, names=etl.COLUMN_NAMES,
+                                                   dtype=etl.DTYPES_CRUDOS, chunksize=chunksize))
+
+
+def bloques_mmap(ruta, chunksize):
+    return sum(len(chunk) for chunk in etl.leer_en_chunks(ruta, chunksize))
+
+
+def particiones_mmap(ruta, chunksize, n):
+    """Tokeniza cada partición de `particionar` por separado (lo que hace cada worker)."""
+    filas = 0
+    for inicio, fin in etl.particionar(ruta, n):
+        filas += sum(len(columnas['Riesgo']) for _, _, columnas in leer_bloques(ruta, chunksize, inicio, fin))
+    return filas
+
+
+def mismos_datos(a, b):
+    """Mismas columnas y valores (códigos y categorías en las categóricas; los enteros pueden ser más angostos)."""
+    if list(a.columns) != list(b.columns) or len(a) != len(b):
+        return False
+    for columna in a.columns:
+        if isinstance(a[columna].dtype, pd.CategoricalDtype):
+            if not (a[columna].cat.categories.equals(b[columna].cat.categories)
+                    and np.array_equal(a[columna].cat.codes, b[columna].cat.codes)):
+                return False
+        elif not np.array_equal(a[columna], b[columna]):
+            return False
+    return True
+
+
+def mejor_tiempo(funcion, repeticiones):
+    """(mejor tiempo en s, resultado de la última corrida)."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=1_000_000)
+    parser.add_argument('--archivo', default=None, help="Crudo existente (no genera uno sintético)")
+    parser.add_argument('--chunksize', type=int, default=etl.CHUNKSIZE_DEFECTO)
+    parser.add_argument('--particiones', type=int, default=8)
+    parser.add_argument('--repeticiones', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = args.archivo
+        if ruta is None:
+            ruta = os.path.join(directorio, "german_credit.data")
+            with contextlib.redirect_stdout(io.StringIO()):
+                etl.generar_archivo_sintetico(args.filas, ruta)
+        mb = os.path.getsize(ruta) / 1024 ** 2
+        print(f"⏱️  {ruta}: {mb:,.1f} MB")
+
+        t_pandas, df_pandas = mejor_tiempo(lambda: leer_pandas(ruta), args.repeticiones)
+        t_mmap, df_mmap = mejor_tiempo(lambda: etl.leer_crudo(ruta), args.repeticiones)
+        assert mismos_datos(df_pandas, df_mmap), "el lector mmap no devuelve lo mismo que pd.read_csv"
+        filas = len(df_mmap)
+        memoria = [df.memory_usage(deep=True).sum() / 1024 ** 2 for df in (df_pandas, df_mmap)]
+        del df_pandas, df_mmap
+
+        resultados = [
+            ('Completo', t_pandas, t_mmap),
+            (f'Bloques de {args.chunksize:,}',
+             *(mejor_tiempo(lambda f=f: f(ruta, args.chunksize), args.repeticiones)[0]
+               for f in (bloques_pandas, bloques_mmap))),
+        ]
+        t_particiones, filas_particiones = mejor_tiempo(
+            lambda: particiones_mmap(ruta, args.chunksize, args.particiones), args.repeticiones)
+        assert filas_particiones == filas
+
+    print(f"   {filas:,} filas; DataFrame: {memoria[0]:,.1f} MB (pandas) vs {memoria[1]:,.1f} MB (mmap)\n")
+    print(f"   {'Lectura':24s} {'pandas (s)':>11s} {'mmap (s)':>10s} {'MB/s mmap':>10s} {'Aceleración':>12s}")
+    for nombre, t_a, t_b in resultados:
+        print(f"   {nombre:24s} {t_a:11.2f} {t_b:10.2f} {mb / t_b:10,.0f} {t_a / t_b:11.1f}x")
+    print(f"   {f'{args.particiones} particiones (tokens)':24s} {'':>11s} {t_particiones:10.2f} "
+          f"{mb / t_particiones:10,.0f}")
@@ -0,0 +1,100 @@
+"""
+=============================================================================
+ BENCHMARK — Costo de la validación de calidad en el modo streaming
+=============================================================================
+ Genera un crudo sintético de N filas (o usa --archivo), marca una fracción
+ de filas como inválidas (Riesgo = 3, va a cuarentena) y corre el modo
+ streaming completo. Informa el tiempo de cada regla (etapas `validar.*` del
+ registro de la corrida) y cuánto agregan validar_crudo + validar_fact al
+ resto del ETL. Sale con código 1 si ese agregado supera --umbral por ciento.
+
+   python3 benchmarks/bench_validacion.py --filas 10000000
+   python3 benchmarks/bench_validacion.py --filas 1000000 --corruptas 0.01 --chunksize 200000
+=============================================================================
+"""
+
+import argparse
+import contextlib
+import io
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from etl_pipeline import pipeline as etl  # noqa: E402
+
+ETAPAS_VALIDACION = ('validar_crudo', 'validar_fact')
+
+
+def corromper(ruta, fraccion, semilla=0):
+    """Pone Riesgo = 3 (último campo) en ~`fraccion` de las filas, en el lugar; devuelve cuántas."""
+    if fraccion <= 0:
+        return 0
+    tamano = os.path.getsize(ruta)
+    filas = etl.contar_filas(ruta, 0, tamano)
+    offsets = np.random.default_rng(semilla).integers(0, tamano, max(1, int(filas * fraccion)))
+    corruptas = set()
+    with open(ruta, 'r+b') as archivo, mmap.mmap(archivo.fileno(), 0) as mapa:
+        for offset in np.sort(offsets).tolist():
+            salto = mapa.find(b'\n', offset)
+            if salto > 0 and salto not in corruptas:
+                mapa[salto - 1:salto] = b'3'
+                corruptas.add(salto)
+    return len(corruptas)
+
+
+def correr_streaming(ruta, chunksize):
+    """Modo streaming completo con salidas en el directorio del crudo: (etapas, resumen)."""
+    etl.RAW_DIR = etl.PROCESSED_DIR = os.path.dirname(ruta)
+    with etl.REGISTRO.corrida(ruta_log=None), contextlib.redirect_stdout(io.StringIO()):
+        resumen = etl.ejecutar_streaming(ruta, chunksize, rng=np.random.default_rng(etl.SEMILLA))
+    return etl.REGISTRO.etapas, resumen
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=1_000_000)
+    parser.add_argument('--archivo', default=None, help="Crudo existente (se copia: no se modifica)")
+    parser.add_argument('--chunksize', type=int, default=etl.CHUNKSIZE_DEFECTO)
+    parser.add_argument('--corruptas', type=float, default=0.001,
+                        help="Fracción de filas que se marcan como inválidas")
+    parser.add_argument('--umbral', type=float, default=10.0,
+                        help="Porcentaje máximo que la validación puede agregar al resto del ETL")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_validacion.') as directorio:
+        ruta = os.path.join(directorio, "german_credit.data")
+        with contextlib.redirect_stdout(io.StringIO()):
+            if args.archivo:
+                shutil.copyfile(args.archivo, ruta)
+            else:
+                etl.generar_archivo_sintetico(args.filas, ruta)
+        corruptas = corromper(ruta, args.corruptas)
+        print(f"⏱️  {ruta}: {os.path.getsize(ruta) / 1024 ** 2:,.1f} MB, {corruptas:,} filas inválidas")
+        etapas, resumen = correr_streaming(ruta, args.chunksize)
+
+    validacion = resumen['validacion']
+    total = etapas['ejecutar_streaming']['segundos']
+    validar = sum(etapas[nombre]['segundos'] for nombre in ETAPAS_VALIDACION if nombre in etapas)
+    agregado = 100 * validar / (total - validar)
+
+    print(f"   {validacion.filas:,} filas, {validacion.cuarentena:,} en cuarentena, bloques de {args.chunksize:,}\n")
+    print(f"   {'Regla':36s} {'Tiempo (s)':>11s} {'Mfilas/s':>9s} {'Fallas':>9s}")
+    reglas = sorted(((nombre, medida) for nombre, medida in etapas.items() if nombre.startswith('validar.')),
+                    key=lambda item: -item[1]['segundos'])
+    for nombre, medida in reglas:
+        regla = nombre.removeprefix('validar.')
+        print(f"   {regla:36s} {medida['segundos']:11.3f} "
+              f"{medida['filas_entrada'] / max(medida['segundos'], 1e-9) / 1e6:9.1f} "
+              f"{validacion.fallas.get(regla, 0):9,}")
+    print(f"\n   {'validar_crudo + validar_fact':36s} {validar:11.3f}")
+    print(f"   {'ETL streaming completo':36s} {total:11.3f}")
+    print(f"   {'Agregado por la validación':36s} {agregado:10.1f}%  (umbral {args.umbral:g}%)")
+    if agregado > args.umbral:
+        print("   🔴 La validación supera el umbral")
+        sys.exit(1)
+    print("   ✅ Dentro del umbral")
@@ -0,0 +1,135 @@
+"""
+=============================================================================
+ PRUEBA DE CARGA — Servicio de scoring online (etl_pipeline/servicio.py)
+=============================================================================
+ Levanta el servicio en un proceso aparte (o usa --url) y lo bombardea con
+ --conexiones clientes concurrentes, cada uno con keep-alive y una solicitud
+ individual por pedido tomada del dataset crudo. Informa throughput y
+ latencias p50/p95/p99/máx; con --lote cada pedido lleva N solicitudes.
+ También mide la API en proceso (EvaluadorSolicitudes) sin HTTP.
+
+   python3 benchmarks/carga_scoring.py --pedidos 20000 --conexiones 32
+   python3 benchmarks/carga_scoring.py --url http://127.0.0.1:8080 --lote 16
+=============================================================================
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+from etl_pipeline import config, servicio  # noqa: E402
+
+
+def solicitudes_crudas():
+    """Líneas del dataset crudo sin la columna Riesgo."""
+    with open(os.path.join(config.RAW_DIR, "german_credit.data"), encoding='utf-8') as f:
+        return [' '.join(linea.split()[:-1]) for linea in f if linea.strip()]
+
+
+def percentiles(latencias):
+    ms = np.array(latencias) * 1000
+    return {p: np.percentile(ms, q) for p, q in (('p50', 50), ('p95', 95), ('p99', 99))} | {'máx': ms.max()}
+
+
+async def cliente(host, puerto, cuerpos, latencias):
+    """Una conexión keep-alive que envía sus pedidos de a uno y mide cada respuesta."""
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    for cuerpo in cuerpos:
+        pedido = (f"POST /score HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(cuerpo)}\r\n\r\n").encode('ascii') + cuerpo
+        inicio = time.perf_counter()
+        escritor.write(pedido)
+        estado = await lector.readline()
+        largo = 0
+        while (cabecera := await lector.readline()) != b'\r\n':
+            if cabecera.lower().startswith(b'content-length:'):
+                largo = int(cabecera.split(b':')[1])
+        await lector.readexactly(largo)
+        latencias.append(time.perf_counter() - inicio)
+        if b' 200 ' not in estado:
+            raise RuntimeError(f"Respuesta inesperada: {estado!r}")
+    escritor.close()
+
+
+async def cargar(url, pedidos, conexiones, lote):
+    destino = urlparse(url)
+    crudas = solicitudes_crudas()
+    cuerpos = [json.dumps(crudas[i % len(crudas)] if lote == 1 else
+                          [crudas[(i * lote + j) % len(crudas)] for j in range(lote)]).encode('utf-8')
+               for i in range(pedidos)]
+    latencias = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(destino.hostname, destino.port, cuerpos[k::conexiones], latencias)
+                           for k in range(conexiones)))
+    return latencias, time.perf_counter() - inicio
+
+
+def esperar_servicio(url, segundos=30):
+    import requests
+    limite = time.time() + segundos
+    while time.time() < limite:
+        try:
+            if requests.get(f"{url}/salud", timeout=1).ok:
+                return
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    raise RuntimeError(f"El servicio no respondió en {url}")
+
+
+def medir_en_proceso(repeticiones=2000):
+    """Latencia de la API en proceso para una solicitud y por solicitud en lotes de 256."""
+    evaluador = servicio.EvaluadorSolicitudes()
+    crudas = [evaluador.normalizar(s) for s in solicitudes_crudas()]
+    individuales = []
+    for i in range(repeticiones):
+        inicio = time.perf_counter()
+        evaluador.evaluar([crudas[i % len(crudas)]])
+        individuales.append(time.perf_counter() - inicio)
+    inicio = time.perf_counter()
+    for i in range(0, repeticiones, 256):
+        evaluador.evaluar(crudas[i % 744:i % 744 + 256])
+    por_solicitud = (time.perf_counter() - inicio) / repeticiones
+    return percentiles(individuales), por_solicitud
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default=None, help="Servicio ya levantado (por defecto se levanta uno)")
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--pedidos', type=int, default=10_000)
+    parser.add_argument('--conexiones', type=int, default=8)
+    parser.add_argument('--lote', type=int, default=1, help="Solicitudes por pedido")
+    args = parser.parse_args()
+
+    pcts, por_solicitud = medir_en_proceso()
+    print("⏱️  API en proceso (EvaluadorSolicitudes)")
+    print("   1 solicitud: " + "  ".join(f"{p} {v:.3f} ms" for p, v in pcts.items()))
+    print(f"   lotes de 256: {por_solicitud * 1e6:.1f} µs por solicitud")
+
+    servidor = None
+    url = args.url
+    if url is None:
+        url = f"http://127.0.0.1:{args.puerto}"
+        servidor = subprocess.Popen([sys.executable, '-m', 'etl_pipeline', 'serve', '--puerto', str(args.puerto)],
+                                    cwd=RAIZ, stdout=subprocess.DEVNULL)
+    try:
+        esperar_servicio(url)
+        asyncio.run(cargar(url, min(args.pedidos, 200), args.conexiones, args.lote))  # calentamiento
+        latencias, segundos = asyncio.run(cargar(url, args.pedidos, args.conexiones, args.lote))
+    finally:
+        if servidor is not None:
+            servidor.terminate()
+            servidor.wait()
+
+    print(f"\n⏱️  HTTP {url}: {args.pedidos:,} pedidos × {args.lote} solicitud(es), {args.conexiones} conexiones")
+    print(f"   {args.pedidos * args.lote / segundos:,.0f} solicitudes/s")
+    print("   " + "  ".join(f"{p} {v:.2f} ms" for p, v in percentiles(latencias).items()))
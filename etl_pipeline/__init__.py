@@ -0,0 +1,39 @@
+"""
+ETL de riesgo crediticio (German Credit Data) para el dashboard de Power BI.
+
+   python3 -m etl_pipeline --help
+
+Importar el paquete no carga pandas, numpy ni requests, no crea directorios
+y no toca el estado global de `random`/`np.random`: cada nombre se busca en
+sus módulos la primera vez que se pide, empezando por los livianos
+(`etl_pipeline.COLUMN_NAMES` solo importa `catalogo`;
+`etl_pipeline.crear_star_schema` importa `pipeline`).
+
+   config     rutas, semilla y tamaños por defecto        (stdlib)
+   catalogo   columnas del crudo y decodificaciones       (stdlib)
+   reglas     scorecard y tramos                          (numpy)
+   lector     lector mmap del archivo crudo               (numpy)
+   calendario Dim_Tiempo precalculada y su caché          (numpy)
+   validacion reglas de calidad vectorizadas              (numpy)
+   pipeline   ETL completo                                (pandas)
+   reportes   analisis_riesgo.sql sobre la base cargada   (pandas)
+   servicio   scoring online                              (numpy, asyncio)
+   cli        python3 -m etl_pipeline <subcomando>
+"""
+
+import importlib
+
+# Orden de búsqueda de los nombres: de los módulos más livianos al pipeline
+_MODULOS = ('config', 'catalogo', 'reglas', 'lector', 'calendario', 'validacion', 'pipeline')
+_SUBMODULOS = _MODULOS + ('reportes', 'servicio', 'cli')
+
+
+def __getattr__(nombre):
+    if nombre in _SUBMODULOS:
+        return importlib.import_module(f'{__name__}.{nombre}')
+    if not nombre.startswith('__'):
+        for modulo in _MODULOS:
+            modulo = importlib.import_module(f'{__name__}.{modulo}')
+            if hasattr(modulo, nombre):
+                return getattr(modulo, nombre)
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
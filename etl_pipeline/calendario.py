@@ -0,0 +1,147 @@
+"""
+Dimensión calendario (Dim_Tiempo): un día por fila sobre un rango fijo y
+configurable, con clave inteligente YYYYMMDD, feriados y período fiscal.
+
+La tabla se construye vectorizada una sola vez por rango y se guarda en disco;
+las corridas siguientes la leen de la caché. Como la clave es la fecha misma,
+`ID_Tiempo` de los hechos es aritmética sobre la fecha (`clave_fecha`), sin
+índice ni lookup, y no cambia entre corridas. Solo requiere numpy; pandas se
+importa al armar el DataFrame.
+"""
+
+import os
+
+import numpy as np
+
+from .config import CALENDARIO_DESDE, CALENDARIO_HASTA, MES_INICIO_FISCAL, PROCESSED_DIR
+
+# Tablas indexadas por mes (0-11) y día de semana (lunes=0)
+NOMBRES_MES = np.array(['January', 'February', 'March', 'April', 'May', 'June', 'July',
+                        'August', 'September', 'October', 'November', 'December'])
+NOMBRES_DIA = np.array(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday',
+                        'Saturday', 'Sunday'])
+
+# Feriados nacionales de Alemania (el German Credit Data es de un banco alemán):
+# fijos por (mes, día) y móviles por días desde el domingo de Pascua
+FERIADOS_FIJOS = {
+    (1, 1): 'Año Nuevo',
+    (5, 1): 'Día del Trabajo',
+    (10, 3): 'Día de la Unidad Alemana',
+    (12, 25): 'Navidad',
+    (12, 26): 'San Esteban',
+}
+FERIADOS_PASCUA = {
+    -2: 'Viernes Santo',
+    1: 'Lunes de Pascua',
+    39: 'Ascensión',
+    50: 'Lunes de Pentecostés',
+}
+NOMBRES_FERIADO = list(FERIADOS_FIJOS.values()) + list(FERIADOS_PASCUA.values())
+
+# Cambia cuando cambian las columnas o los feriados: invalida la caché en disco
+VERSION_CALENDARIO = 1
+
+
+def partes_fecha(fechas):
+    """(año, mes, día) enteros de un array datetime64, sin pasar por objetos fecha."""
+    dias = np.asarray(fechas).astype('datetime64[D]')
+    meses = dias.astype('datetime64[M]')
+    return (meses.astype('datetime64[Y]').astype(np.int64) + 1970,
+            meses.astype(np.int64) % 12 + 1,
+            (dias - meses).astype(np.int64) + 1)
+
+
+def clave_fecha(fechas):
+    """Clave YYYYMMDD (int32) de cada fecha: el ID_Tiempo de Dim_Tiempo."""
+    anio, mes, dia = partes_fecha(fechas)
+    return (anio * 10000 + mes * 100 + dia).astype(np.int32)
+
+
+def domingo_de_pascua(anios):
+    """Domingo de Pascua (datetime64[D]) de cada año gregoriano (algoritmo anónimo de Meeus)."""
+    y = np.asarray(anios, dtype=np.int64)
+    a, b, c = y % 19, y // 100, y % 100
+    d, e = b // 4, b % 4
+    g = (b - (b + 8) // 25 + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    l = (32 + 2 * e + 2 * (c // 4) - h - c % 4) % 7
+    n = h + l - 7 * ((a + 11 * h + 22 * l) // 451) + 114
+    primero_de_mes = ((y - 1970) * 12 + n // 31 - 1).astype('datetime64[M]')
+    return primero_de_mes.astype('datetime64[D]') + n % 31
+
+
+def codigos_feriado(fechas, mes, dia):
+    """Posición en `NOMBRES_FERIADO` del feriado de cada fecha (-1 si es día común)."""
+    codigos = np.full(len(fechas), -1, dtype=np.int8)
+    for k, (mes_feriado, dia_feriado) in enumerate(FERIADOS_FIJOS):
+        codigos[(mes == mes_feriado) & (dia == dia_feriado)] = k
+    if len(fechas):
+        anio, _, _ = partes_fecha(fechas[[0, -1]])
+        pascuas = domingo_de_pascua(np.arange(anio[0], anio[1] + 1))
+        for k, desplazamiento in enumerate(FERIADOS_PASCUA, start=len(FERIADOS_FIJOS)):
+            posiciones = (pascuas + desplazamiento - fechas[0]).astype(np.int64)
+            codigos[posiciones[(posiciones >= 0) & (posiciones < len(fechas))]] = k
+    return codigos
+
+
+def construir_calendario(desde=CALENDARIO_DESDE, hasta=CALENDARIO_HASTA, mes_inicio_fiscal=MES_INICIO_FISCAL):
+    """Dim_Tiempo de [desde, hasta]: un día por fila, todas las columnas vectorizadas.
+
+    El año fiscal empieza en `mes_inicio_fiscal` y se nombra por el año
+    calendario en que termina (con 1, coincide con el año calendario).
+    """
+    import pandas as pd
+
+    if not 1 <= mes_inicio_fiscal <= 12:
+        raise ValueError(f"mes_inicio_fiscal debe estar entre 1 y 12 (llegó {mes_inicio_fiscal})")
+    fechas = np.arange(np.datetime64(desde, 'D'), np.datetime64(hasta, 'D') + 1)
+    anio, mes, dia = partes_fecha(fechas)
+    dia_semana = (fechas.astype(np.int64) + 3) % 7          # 1970-01-01 fue jueves
+    feriado = codigos_feriado(fechas, mes, dia)
+    fin_de_semana = dia_semana >= 5
+    mes_fiscal = (mes - mes_inicio_fiscal) % 12 + 1
+
+    return pd.DataFrame({
+        'ID_Tiempo': (anio * 10000 + mes * 100 + dia).astype(np.int32),
+        'Fecha': fechas.astype('datetime64[ns]'),
+        'Anio': anio.astype(np.int16),
+        'Mes': mes.astype(np.uint8),
+        'Nombre_Mes': pd.Categorical.from_codes(mes - 1, categories=NOMBRES_MES),
+        'Trimestre': pd.Categorical.from_codes((mes - 1) // 3, categories=['Q1', 'Q2', 'Q3', 'Q4']),
+        'Dia_Semana': pd.Categorical.from_codes(dia_semana, categories=NOMBRES_DIA),
+        'Es_FinDeSemana': fin_de_semana.astype(np.uint8),
+        'Dia': dia.astype(np.uint8),
+        'Es_Feriado': (feriado >= 0).astype(np.uint8),
+        'Feriado': pd.Categorical.from_codes(feriado, categories=NOMBRES_FERIADO),
+        'Es_Dia_Habil': (~fin_de_semana & (feriado < 0)).astype(np.uint8),
+        'Anio_Fiscal': (anio + ((mes >= mes_inicio_fiscal) & (mes_inicio_fiscal > 1))).astype(np.int16),
+        'Trimestre_Fiscal': pd.Categorical.from_codes((mes_fiscal - 1) // 3,
+                                                      categories=['FQ1', 'FQ2', 'FQ3', 'FQ4']),
+        'Mes_Fiscal': mes_fiscal.astype(np.uint8),
+    })
+
+
+def ruta_cache(desde=CALENDARIO_DESDE, hasta=CALENDARIO_HASTA, mes_inicio_fiscal=MES_INICIO_FISCAL,
+               directorio=None):
+    """Archivo de caché del calendario: depende del rango, del año fiscal y de la versión."""
+    rango = '_'.join(str(np.datetime64(f, 'D')).replace('-', '') for f in (desde, hasta))
+    return os.path.join(directorio or PROCESSED_DIR,
+                        f"calendario_{rango}_fy{mes_inicio_fiscal:02d}_v{VERSION_CALENDARIO}.pkl")
+
+
+def calendario(desde=CALENDARIO_DESDE, hasta=CALENDARIO_HASTA, mes_inicio_fiscal=MES_INICIO_FISCAL,
+               directorio=None):
+    """Dim_Tiempo de [desde, hasta] desde la caché en disco; la construye y guarda la primera vez."""
+    import pandas as pd
+
+    ruta = ruta_cache(desde, hasta, mes_inicio_fiscal, directorio)
+    if os.path.exists(ruta):
+        try:
+            return pd.read_pickle(ruta)
+        except Exception:
+            pass                # caché ilegible (p. ej. de otra versión de pandas): se reconstruye
+    tabla = construir_calendario(desde, hasta, mes_inicio_fiscal)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    tabla.to_pickle(f"{ruta}.tmp")
+    os.replace(f"{ruta}.tmp", ruta)
+    return tabla
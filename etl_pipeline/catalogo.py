@@ -0,0 +1,195 @@
+"""
+Catálogo del German Credit Data: columnas del archivo crudo, tablas de
+decodificación de los códigos A y derivados (género, estado civil,
+categoría de propósito). Solo biblioteca estándar: lo importan el CLI
+(`decode`) y el servicio de scoring sin cargar pandas.
+"""
+
+# Nombres originales de las 20 columnas del dataset
+COLUMN_NAMES = [
+    'Status_Cuenta',        # A1
+    'Duracion_Meses',       # A2
+    'Historial_Crediticio',  # A3
+    'Proposito',             # A4
+    'Monto_Credito',        # A5
+    'Cuenta_Ahorro',        # A6
+    'Empleo_Desde',         # A7
+    'Tasa_Cuota',           # A8
+    'Estado_Personal_Sexo', # A9
+    'Otros_Deudores',       # A10
+    'Residencia_Desde',     # A11
+    'Propiedad',            # A12
+    'Edad',                 # A13
+    'Otros_Planes_Cuota',   # A14
+    'Vivienda',             # A15
+    'Creditos_Existentes',  # A16
+    'Trabajo',              # A17
+    'Personas_Dependientes', # A18
+    'Telefono',             # A19
+    'Extranjero',           # A20
+    'Riesgo'                # Target: 1=Good, 2=Bad
+]
+
+# ── DICCIONARIOS DE DECODIFICACIÓN COMPLETOS ──────────────────────────────
+
+DECODE_STATUS_CUENTA = {
+    'A11': '< 0 DM (Sobregiro)',
+    'A12': '0 - 200 DM (Bajo balance)',
+    'A13': '>= 200 DM (Buen balance)',
+    'A14': 'Sin cuenta corriente'
+}
+
+DECODE_HISTORIAL = {
+    'A30': 'Sin créditos / todos pagados',
+    'A31': 'Todos créditos pagados en este banco',
+    'A32': 'Créditos existentes pagados puntualmente',
+    'A33': 'Retraso en pagos pasados',
+    'A34': 'Cuenta crítica / créditos en otros bancos'
+}
+
+DECODE_PROPOSITO = {
+    'A40': 'Auto (Nuevo)',
+    'A41': 'Auto (Usado)',
+    'A42': 'Muebles/Equipamiento',
+    'A43': 'Radio/Televisión',
+    'A44': 'Electrodomésticos',
+    'A45': 'Reparaciones',
+    'A46': 'Educación',
+    'A47': 'Vacaciones',
+    'A48': 'Recapacitación',
+    'A49': 'Negocio',
+    'A410': 'Otros'
+}
+
+DECODE_AHORRO = {
+    'A61': '< 100 DM',
+    'A62': '100 - 500 DM',
+    'A63': '500 - 1000 DM',
+    'A64': '>= 1000 DM',
+    'A65': 'Sin cuenta de ahorro'
+}
+
+DECODE_EMPLEO = {
+    'A71': 'Desempleado',
+    'A72': '< 1 año',
+    'A73': '1 - 4 años',
+    'A74': '4 - 7 años',
+    'A75': '>= 7 años'
+}
+
+DECODE_ESTADO_SEXO = {
+    'A91': 'Hombre - Divorciado/Separado',
+    'A92': 'Mujer - Divorciada/Separada/Casada',
+    'A93': 'Hombre - Soltero',
+    'A94': 'Hombre - Casado/Viudo',
+    'A95': 'Mujer - Soltera'
+}
+
+DECODE_OTROS_DEUDORES = {
+    'A101': 'Ninguno',
+    'A102': 'Co-solicitante',
+    'A103': 'Garante'
+}
+
+DECODE_PROPIEDAD = {
+    'A121': 'Bienes raíces',
+    'A122': 'Seguro de vida / Ahorro',
+    'A123': 'Auto u otros bienes',
+    'A124': 'Sin propiedad conocida'
+}
+
+DECODE_OTROS_PLANES = {
+    'A141': 'Banco',
+    'A142': 'Tiendas',
+    'A143': 'Ninguno'
+}
+
+DECODE_VIVIENDA = {
+    'A151': 'Alquiler',
+    'A152': 'Propia',
+    'A153': 'Gratuita'
+}
+
+DECODE_TRABAJO = {
+    'A171': 'Desempleado / No calificado - No residente',
+    'A172': 'No calificado - Residente',
+    'A173': 'Empleado calificado',
+    'A174': 'Alta gerencia / Autónomo'
+}
+
+DECODE_TELEFONO = {
+    'A191': 'No',
+    'A192': 'Sí'
+}
+
+DECODE_EXTRANJERO = {
+    'A201': 'Sí',
+    'A202': 'No'
+}
+
+DECODIFICACIONES = {
+    'Status_Cuenta': DECODE_STATUS_CUENTA,
+    'Historial_Crediticio': DECODE_HISTORIAL,
+    'Proposito': DECODE_PROPOSITO,
+    'Cuenta_Ahorro': DECODE_AHORRO,
+    'Empleo_Desde': DECODE_EMPLEO,
+    'Estado_Personal_Sexo': DECODE_ESTADO_SEXO,
+    'Otros_Deudores': DECODE_OTROS_DEUDORES,
+    'Propiedad': DECODE_PROPIEDAD,
+    'Otros_Planes_Cuota': DECODE_OTROS_PLANES,
+    'Vivienda': DECODE_VIVIENDA,
+    'Trabajo': DECODE_TRABAJO,
+    'Telefono': DECODE_TELEFONO,
+    'Extranjero': DECODE_EXTRANJERO
+}
+
+
+DECODE_RIESGO = {1: 'Good', 2: 'Bad'}
+
+def extraer_estado_civil(texto):
+    """Extrae el estado civil del campo combinado."""
+    texto = str(texto)
+    if 'Soltero' in texto or 'Soltera' in texto:
+        return 'Soltero/a'
+    elif 'Casado' in texto or 'Casada' in texto:
+        return 'Casado/a'
+    elif 'Divorciado' in texto or 'Divorciada' in texto or 'Separado' in texto:
+        return 'Divorciado/a'
+    elif 'Viudo' in texto:
+        return 'Viudo/a'
+    return 'Desconocido'
+
+
+# Lookup precalculado por código A91–A95 (se evalúa una vez, no por fila)
+GENERO_POR_CODIGO = {
+    codigo: 'Masculino' if 'Hombre' in texto else 'Femenino'
+    for codigo, texto in DECODE_ESTADO_SEXO.items()
+}
+ESTADO_CIVIL_POR_CODIGO = {
+    codigo: extraer_estado_civil(texto)
+    for codigo, texto in DECODE_ESTADO_SEXO.items()
+}
+
+
+def categorizar_proposito(proposito):
+    """Agrupa propósitos en categorías más amplias."""
+    categorias = {
+        'Auto (Nuevo)': 'Vehículos',
+        'Auto (Usado)': 'Vehículos',
+        'Muebles/Equipamiento': 'Hogar',
+        'Radio/Televisión': 'Hogar',
+        'Electrodomésticos': 'Hogar',
+        'Reparaciones': 'Hogar',
+        'Educación': 'Personal',
+        'Vacaciones': 'Personal',
+        'Recapacitación': 'Personal',
+        'Negocio': 'Negocio',
+        'Otros': 'Otros'
+    }
+    return categorias.get(proposito, 'Otros')
+
+
+def numero_codigo(codigo):
+    """Número de un código A del dataset ('A34' → 34); 0 si no es un código A."""
+    codigo = str(codigo)
+    return int(codigo[1:]) if codigo[:1] == 'A' and codigo[1:].isdigit() else 0
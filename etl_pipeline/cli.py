@@ -0,0 +1,232 @@
+"""
+=============================================================================
+ CLI — python3 -m etl_pipeline <subcomando>
+=============================================================================
+   decode   Decodifica líneas del archivo crudo a CSV legible (solo stdlib)
+   score    Score_Cliente y Categoria_Score de cada línea (numpy)
+   export   Pipeline completo: Star Schema, cubo y exportación (pandas)
+   report   Consultas de analisis_riesgo.sql sobre la base cargada
+   serve    Servicio de scoring online (HTTP)
+
+ Cada subcomando importa solo los módulos que usa: `decode` y `--help` no
+ cargan numpy ni pandas. Sin subcomando se asume `export`, así que las
+ opciones de siempre siguen funcionando:
+
+   python3 -m etl_pipeline --streaming --chunksize 50000
+   python3 -m etl_pipeline decode data/raw/german_credit.data --limite 5
+   head -100 data/raw/german_credit.data | python3 -m etl_pipeline score -
+=============================================================================
+"""
+
+import argparse
+import contextlib
+import csv
+import itertools
+import os
+import sys
+
+from .config import CHUNKSIZE_DEFECTO, RAW_DIR, RUTA_BASE_DATOS, RUTA_CRUDO, RUTA_LOG_EJECUCIONES, SEMILLA
+
+SUBCOMANDOS = ('decode', 'score', 'export', 'report', 'serve')
+
+
+# ─── LECTURA DEL CRUDO ───────────────────────────────────────────────────────
+
+@contextlib.contextmanager
+def abrir_entrada(ruta):
+    """Archivo de texto de `ruta` ('-' = stdin)."""
+    if ruta == '-':
+        yield sys.stdin
+    else:
+        with open(ruta, encoding='utf-8') as f:
+            yield f
+
+
+@contextlib.contextmanager
+def abrir_salida(ruta):
+    """Archivo de texto de `ruta` (None = stdout)."""
+    if ruta is None:
+        yield sys.stdout
+    else:
+        with open(ruta, 'w', encoding='utf-8', newline='') as f:
+            yield f
+
+
+def filas_crudas(entrada, limite=None):
+    """Campos de cada línea no vacía del crudo; 20 (sin Riesgo) o 21 campos."""
+    from .catalogo import COLUMN_NAMES
+
+    filas = (linea.split() for linea in entrada if linea.strip())
+    for numero, campos in enumerate(itertools.islice(filas, limite), start=1):
+        if len(campos) not in (len(COLUMN_NAMES) - 1, len(COLUMN_NAMES)):
+            raise SystemExit(f"❌ Línea {numero}: se esperaban {len(COLUMN_NAMES)} campos, llegaron {len(campos)}")
+        yield campos
+
+
+# ─── SUBCOMANDOS ─────────────────────────────────────────────────────────────
+
+def decode(args):
+    """Una fila CSV por línea del crudo con los códigos A traducidos, Genero y Estado_Civil."""
+    from .catalogo import (COLUMN_NAMES, DECODE_RIESGO, DECODIFICACIONES, ESTADO_CIVIL_POR_CODIGO,
+                           GENERO_POR_CODIGO)
+
+    with abrir_entrada(args.archivo) as entrada, abrir_salida(args.salida) as salida:
+        escritor = csv.writer(salida, lineterminator='\n')
+        escritor.writerow(COLUMN_NAMES + ['Genero', 'Estado_Civil'])
+        for campos in filas_crudas(entrada, args.limite):
+            registro = dict(zip(COLUMN_NAMES, campos))
+            sexo = registro['Estado_Personal_Sexo']
+            for columna, mapeo in DECODIFICACIONES.items():
+                registro[columna] = mapeo.get(registro[columna], registro[columna])
+            if 'Riesgo' in registro:
+                registro['Riesgo'] = DECODE_RIESGO.get(int(registro['Riesgo']), registro['Riesgo'])
+            escritor.writerow([registro.get(columna, '') for columna in COLUMN_NAMES]
+                              + [GENERO_POR_CODIGO.get(sexo, 'Femenino'),
+                                 ESTADO_CIVIL_POR_CODIGO.get(sexo, 'Desconocido')])
+
+
+def score(args):
+    """Score_Cliente (scorecard sin ruido, como `reglas.score`) y Categoria_Score por línea."""
+    import numpy as np
+
+    from .catalogo import COLUMN_NAMES, numero_codigo
+    from .reglas import BORDES_SCORE, ETIQUETAS_SCORE, codigos_tramo, tarjeta_score
+
+    tarjeta = tarjeta_score()
+    posicion = {columna: i for i, columna in enumerate(COLUMN_NAMES)}
+    categorias = np.array(ETIQUETAS_SCORE + [''], dtype=object)
+
+    with abrir_entrada(args.archivo) as entrada, abrir_salida(args.salida) as salida:
+        escritor = csv.writer(salida, lineterminator='\n')
+        escritor.writerow(['ID_Prestamo', 'Score_Cliente', 'Categoria_Score'])
+        filas = filas_crudas(entrada, args.limite)
+        id_prestamo = 1
+        while bloque := list(itertools.islice(filas, args.chunksize)):
+            # En el crudo no hay nulos: lo que no es un código A es desconocido
+            numeros = {columna: np.array([numero_codigo(c[posicion[columna]]) or tarjeta.DESCONOCIDO
+                                          for c in bloque])
+                       for columna in tarjeta.tablas}
+            for columna, valores in numeros.items():
+                for fila in tarjeta.desconocidos(columna, valores)[:1]:
+                    raise SystemExit(f"❌ Línea {id_prestamo + fila}: '{bloque[fila][posicion[columna]]}' "
+                                     f"no es un código de {columna}")
+            monto = np.array([float(c[posicion['Monto_Credito']]) for c in bloque])
+            duracion = np.array([float(c[posicion['Duracion_Meses']]) for c in bloque])
+            puntaje = np.clip(tarjeta.puntos_codigos(numeros, monto, duracion), tarjeta.minimo, tarjeta.maximo)
+            escritor.writerows(zip(range(id_prestamo, id_prestamo + len(bloque)), puntaje.tolist(),
+                                   categorias[codigos_tramo(puntaje, BORDES_SCORE)]))
+            id_prestamo += len(bloque)
+
+
+def export(args):
+    """Pipeline completo (ver etl_pipeline/pipeline.py)."""
+    from . import pipeline
+    pipeline.ejecutar(args)
+
+
+def report(args):
+    from . import reportes
+
+    desconocidas = set(args.secciones or ()) - set(reportes.REPORTES)
+    if desconocidas:
+        raise SystemExit(f"❌ Secciones desconocidas: {', '.join(sorted(desconocidas))} "
+                         f"(opciones: {', '.join(reportes.REPORTES)})")
+    reportes.imprimir_reportes(args.base_datos, args.secciones or tuple(reportes.REPORTES))
+
+
+def serve(args):
+    import asyncio
+
+    from .servicio import servir
+    try:
+        asyncio.run(servir(args.host, args.puerto, args.lote_maximo, args.espera_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+
+
+# ─── ARGUMENTOS ──────────────────────────────────────────────────────────────
+
+def opciones_export(parser):
+    parser.add_argument('--streaming', action='store_true',
+                        help="Procesa el archivo crudo por bloques (memoria acotada)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Procesa solo las filas nuevas del archivo crudo (CSV, append-only)")
+    parser.add_argument('--paralelo', action='store_true',
+                        help="Reparte particiones del archivo crudo entre varios procesos")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Procesos del modo paralelo (por defecto, todos los núcleos)")
+    parser.add_argument('--chunksize', type=int, default=CHUNKSIZE_DEFECTO,
+                        help="Filas por bloque en modo streaming/incremental")
+    parser.add_argument('--formato', choices=['csv', 'parquet', 'feather'], default='csv',
+                        help="Formato de exportación (parquet/feather requieren pyarrow)")
+    parser.add_argument('--compresion', default=None,
+                        help="Compresión para parquet/feather (snappy, zstd, lz4, ...)")
+    parser.add_argument('--row-group-size', type=int, default=None,
+                        help="Filas por row group (parquet) o por batch (feather)")
+    parser.add_argument('--generar', type=int, default=None, metavar='FILAS',
+                        help="Solo genera un dataset sintético de FILAS registros (pruebas de carga)")
+    parser.add_argument('--salida', default=os.path.join(RAW_DIR, "german_credit_sintetico.data"),
+                        help="Archivo del dataset sintético (.parquet o crudo)")
+    parser.add_argument('--correlacionar', action='store_true',
+                        help="Genera los atributos correlacionados con Riesgo")
+    parser.add_argument('--semilla', type=int, default=SEMILLA,
+                        help="Semilla del dataset sintético")
+    parser.add_argument('--descargar', nargs='+', default=None, metavar='URL',
+                        help="Solo descarga estas fuentes a data/raw/ (en paralelo, reanudable, con manifiesto)")
+    parser.add_argument('--revalidar', action='store_true',
+                        help="Consulta si el dataset de UCI cambió (ETag) aunque ya esté descargado")
+    parser.add_argument('--base-datos', default=None, metavar='RUTA',
+                        help="Carga además el Star Schema en SQLite (.db) o DuckDB (.duckdb)")
+    parser.add_argument('--log-metricas', default=RUTA_LOG_EJECUCIONES,
+                        help="JSON-lines donde se anexan las métricas por etapa de cada corrida ('' = no guardar)")
+    parser.add_argument('--prometheus', default=None, metavar='RUTA',
+                        help="Textfile de Prometheus con las métricas de la última corrida")
+
+
+def opciones_crudo(parser):
+    parser.add_argument('archivo', nargs='?', default=RUTA_CRUDO,
+                        help="Archivo crudo en el formato de german_credit.data ('-' = stdin)")
+    parser.add_argument('--limite', type=int, default=None, metavar='N', help="Solo las primeras N líneas")
+    parser.add_argument('--salida', default=None, metavar='RUTA', help="CSV de salida (por defecto, stdout)")
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog='python3 -m etl_pipeline', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(metavar='SUBCOMANDO')
+
+    p_decode = subparsers.add_parser('decode', help="Decodifica el crudo a CSV legible")
+    opciones_crudo(p_decode)
+    p_decode.set_defaults(funcion=decode)
+    p_score = subparsers.add_parser('score', help="Puntúa cada línea del crudo con el scorecard")
+    opciones_crudo(p_score)
+    p_score.add_argument('--chunksize', type=int, default=CHUNKSIZE_DEFECTO, help="Líneas por lote vectorizado")
+    p_score.set_defaults(funcion=score)
+    p_export = subparsers.add_parser('export', help="Corre el ETL completo y exporta las tablas")
+    opciones_export(p_export)
+    p_export.set_defaults(funcion=export)
+
+    p_report = subparsers.add_parser('report', help="Reportes 3.1–3.5 de analisis_riesgo.sql")
+    p_report.add_argument('--base-datos', default=RUTA_BASE_DATOS, metavar='RUTA',
+                          help="Base SQLite (.db) o DuckDB (.duckdb) cargada por el ETL")
+    p_report.add_argument('--secciones', nargs='+', default=None, metavar='SECCION',
+                          help="Secciones a imprimir (3.1 ... 3.5; por defecto, todas)")
+    p_report.set_defaults(funcion=report)
+
+    p_serve = subparsers.add_parser('serve', help="Servicio de scoring online (POST /score)")
+    p_serve.add_argument('--host', default='127.0.0.1')
+    p_serve.add_argument('--puerto', type=int, default=8080)
+    p_serve.add_argument('--lote-maximo', type=int, default=256, help="Solicitudes por lote vectorizado")
+    p_serve.add_argument('--espera-ms', type=float, default=0.0,
+                         help="Espera para juntar solicitudes concurrentes (0 = una vuelta del event loop)")
+    p_serve.set_defaults(funcion=serve)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Compatibilidad: las opciones del pipeline sin subcomando equivalen a `export`
+    if not argv or (argv[0] not in SUBCOMANDOS and argv[0] not in ('-h', '--help')):
+        argv = ['export'] + argv
+    args = crear_parser().parse_args(argv)
+    args.funcion(args)
@@ -0,0 +1,37 @@
+"""
+Configuración compartida del paquete: rutas de datos, semilla y tamaños por
+defecto. No crea directorios al importarse: los crea quien escribe en ellos.
+"""
+
+import os
+from datetime import date
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RAW_DIR = os.path.join(BASE_DIR, "data", "raw")
+PROCESSED_DIR = os.path.join(BASE_DIR, "data", "processed")
+
+# Dataset crudo descargado (o copiado) en RAW_DIR
+RUTA_CRUDO = os.path.join(RAW_DIR, "german_credit.data")
+
+# Semilla para reproducibilidad
+SEMILLA = 42
+
+# Filas por bloque en modo streaming
+CHUNKSIZE_DEFECTO = 100_000
+
+# Dimensión calendario (Dim_Tiempo): rango de días y mes de inicio del año fiscal.
+# Debe cubrir todas las fechas de los hechos (las simuladas van de 2023 a 2025).
+CALENDARIO_DESDE = date(2023, 1, 1)
+CALENDARIO_HASTA = date(2025, 12, 31)
+MES_INICIO_FISCAL = 1
+
+# Clave natural de un cliente (Dim_Cliente): columnas que identifican al prestatario;
+# los préstamos con los mismos valores son del mismo cliente y sus atributos se
+# versionan en orden de carga (SCD tipo 2). El German Credit Data no trae un
+# identificador de prestatario y ninguna combinación de sus atributos lo es, así
+# que por defecto la clave queda vacía: cada préstamo es un cliente distinto. Con
+# una fuente que lo traiga, poner aquí su columna (p. ej. ('ID_Prestatario',)).
+CLAVE_CLIENTE = ()
+
+RUTA_LOG_EJECUCIONES = os.path.join(PROCESSED_DIR, "ejecuciones.jsonl")
+RUTA_BASE_DATOS = os.path.join(PROCESSED_DIR, "riesgo.db")
@@ -0,0 +1,172 @@
+"""
+Lector del archivo crudo (formato de german_credit.data) sobre un mmap.
+
+Cada ventana de líneas completas se tokeniza con numpy directamente sobre los
+bytes del archivo mapeado, sin crear un str por campo: los códigos A quedan
+como su número entero (A34 → 34, como `catalogo.numero_codigo`) y las
+columnas numéricas como int16/int32. Las ventanas se piden por rango de bytes
+alineado a líneas, así que la misma función sirve al modo streaming, al
+incremental (solo los bytes nuevos) y a las particiones del modo paralelo.
+Solo requiere numpy; pandas se importa al armar el DataFrame.
+"""
+
+import mmap
+import os
+
+import numpy as np
+
+from .catalogo import COLUMN_NAMES, DECODIFICACIONES
+
+ESPACIO, SALTO, LETRA_A, CERO = b' \nA0'
+
+# Tipo de cada columna numérica del crudo (los códigos A se guardan como int16).
+# Si un valor no entra en su tipo, la columna queda en int64.
+TIPOS_NUMERICOS = {
+    'Duracion_Meses': np.int16, 'Monto_Credito': np.int32, 'Tasa_Cuota': np.int16,
+    'Residencia_Desde': np.int16, 'Edad': np.int16, 'Creditos_Existentes': np.int16,
+    'Personas_Dependientes': np.int16, 'Riesgo': np.int16
+}
+ES_CODIGO = np.array([columna in DECODIFICACIONES for columna in COLUMN_NAMES])
+
+# Dígitos máximos de un campo: más que esto no es el formato del crudo
+MAX_DIGITOS = 9
+BYTES_POR_FILA_INICIAL = 128
+# Líneas por llamada a `tokenizar`: con tramos chicos los arrays de posiciones
+# quedan en caché (con 200.000 líneas por tramo tokenizar es ~3x más lento)
+FILAS_TOKENIZAR = 1 << 13
+
+
+def tokenizar(datos):
+    """Columnas enteras de las líneas de `datos` (uint8); None si no respetan el formato.
+
+    El formato es el de german_credit.data: 21 campos separados por un solo
+    espacio, códigos A sin ceros a la izquierda y enteros sin signo. Líneas
+    vacías, '\\r', tabulaciones, signos o filas de otro largo devuelven None
+    y el llamador lee esa ventana con el tokenizador genérico de pandas.
+    """
+    n_campos = len(COLUMN_NAMES)
+    sin_salto_final = len(datos) > 0 and datos[-1] != SALTO
+    separadores = np.flatnonzero(datos <= ESPACIO)
+    if sin_salto_final:
+        separadores = np.append(separadores, len(datos))
+    if len(separadores) % n_campos:
+        return None
+
+    # fines[j, i]: byte donde termina el campo j de la fila i (su separador).
+    # Entre campos va un espacio y cada fila termina en salto de línea: contando
+    # ambos se descartan '\\r', tabulaciones y espacios dobles.
+    fines = np.ascontiguousarray(separadores.reshape(-1, n_campos).T)
+    n = fines.shape[1]
+    if n == 0:
+        return {columna: np.empty(0, TIPOS_NUMERICOS.get(columna, np.int16)) for columna in COLUMN_NAMES}
+    saltos = n - sin_salto_final
+    if (np.count_nonzero(datos == ESPACIO) != n * (n_campos - 1) or np.count_nonzero(datos == SALTO) != saltos
+            or not (datos[fines[-1, :saltos]] == SALTO).all()):
+        return None
+    # Lo que no es separador ni la 'A' inicial de un código (verificada abajo) es un dígito
+    if np.count_nonzero(datos - CERO > 9) != n * n_campos - sin_salto_final + n * np.count_nonzero(ES_CODIGO):
+        return None
+
+    columnas = {}
+    fin_anterior = np.concatenate(([-1], fines[-1, :-1]))
+    for j, columna in enumerate(COLUMN_NAMES):
+        fin = fines[j]
+        inicio = (fines[j - 1] if j else fin_anterior) + 1
+        if ES_CODIGO[j]:
+            if not (datos[inicio] == LETRA_A).all() or (datos[inicio + 1] == CERO).any():
+                return None
+            inicio += 1
+        largo = fin - inicio
+        largo_minimo, largo_maximo = int(largo.min()), int(largo.max())
+        if largo_minimo < 1 or largo_maximo > MAX_DIGITOS:
+            return None
+
+        # Dígito k desde el final: los campos más cortos que k+1 no suman (máscara)
+        valor = np.zeros(n, dtype=np.int32)
+        for k in range(largo_maximo):
+            digito = (datos[fin - (k + 1)] - CERO).astype(np.int32)
+            if k >= largo_minimo:
+                digito *= largo > k
+            valor += digito * 10 ** k
+
+        tipo = np.int16 if ES_CODIGO[j] else TIPOS_NUMERICOS[columna]
+        if valor.max() > np.iinfo(tipo).max:
+            if ES_CODIGO[j]:
+                return None
+            tipo = np.int64
+        columnas[columna] = valor.astype(tipo)
+    return columnas
+
+
+def tokenizar_por_tramos(datos, saltos, filas=FILAS_TOKENIZAR):
+    """`tokenizar` de `datos` en tramos de `filas` líneas; `saltos` son sus posiciones de salto."""
+    cortes = [0] + [int(salto) + 1 for salto in saltos[filas - 1::filas]]
+    if cortes[-1] < len(datos):
+        cortes.append(len(datos))
+    tramos = []
+    for desde, hasta in zip(cortes, cortes[1:]):
+        columnas = tokenizar(datos[desde:hasta])
+        if columnas is None:
+            return None
+        tramos.append(columnas)
+    if len(tramos) == 1:
+        return tramos[0]
+    return {columna: np.concatenate([tramo[columna] for tramo in tramos]) for columna in COLUMN_NAMES}
+
+
+def a_dataframe(columnas):
+    """DataFrame crudo desde `tokenizar`: los códigos A como Categorical (igual que `pd.read_csv`).
+
+    Las categorías son los códigos presentes ordenados como texto, como las
+    infiere pandas; solo se crea un str por categoría, no por fila.
+    """
+    import pandas as pd
+
+    datos = {}
+    for columna, valores in columnas.items():
+        if columna not in DECODIFICACIONES:
+            datos[columna] = valores
+            continue
+        presentes = np.flatnonzero(np.bincount(valores))
+        etiquetas = np.array([f'A{numero}' for numero in presentes.tolist()], dtype=object)
+        orden = np.argsort(etiquetas, kind='stable')
+        posicion = np.zeros(len(presentes) and presentes[-1] + 1, dtype=np.int16)
+        posicion[presentes[orden]] = np.arange(len(presentes))
+        datos[columna] = pd.Categorical.from_codes(posicion[valores], categories=list(etiquetas[orden]),
+                                                   validate=False)
+    return pd.DataFrame(datos, columns=COLUMN_NAMES)
+
+
+def leer_bloques(ruta, filas, inicio=0, fin=None):
+    """Genera (desde, hasta, columnas) por cada ventana de hasta `filas` líneas de [inicio, fin).
+
+    El archivo se mapea en memoria y cada ventana es una vista de sus bytes
+    (sin copia). `inicio`/`fin` deben estar alineados a líneas (como los
+    cortes de `particionar` o el offset del modo incremental). `columnas` es
+    None si la ventana no respeta el formato: el llamador decide cómo leerla.
+    """
+    fin = os.path.getsize(ruta) if fin is None else fin
+    if fin <= inicio:
+        return
+    with open(ruta, 'rb') as archivo, mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        datos = np.frombuffer(mapa, dtype=np.uint8)
+        try:
+            bytes_por_fila = BYTES_POR_FILA_INICIAL
+            desde = inicio
+            while desde < fin:
+                hasta = min(fin, desde + filas * bytes_por_fila)
+                saltos = np.flatnonzero(datos[desde:hasta] == SALTO)
+                if len(saltos) < filas and hasta < fin:
+                    # Ventana corta para `filas` líneas: se agranda con el largo observado
+                    bytes_por_fila = max(2 * bytes_por_fila if len(saltos) == 0 else
+                                         (hasta - desde) // len(saltos) + 1 + bytes_por_fila // 8,
+                                         bytes_por_fila + 1)
+                    continue
+                if len(saltos) >= filas:
+                    hasta = desde + int(saltos[filas - 1]) + 1
+                    bytes_por_fila = (hasta - desde) // filas + 1 + bytes_por_fila // 16
+                yield desde, hasta, tokenizar_por_tramos(datos[desde:hasta], saltos[:filas])
+                desde = hasta
+        finally:
+            # El mmap no se puede cerrar mientras haya vistas de numpy sobre él
+            del datos
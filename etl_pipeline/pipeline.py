@@ -0,0 +1,3118 @@
+"""
+=============================================================================
+ ETL PIPELINE — Dashboard Estratégico de Riesgo Crediticio
+ Dataset: German Credit Data (UCI / Kaggle)
+ Autor: Data Analyst | Ingeniería de Datos
+ Fecha: 2026-02-09
+=============================================================================
+ Este módulo realiza:
+   1. Descarga del dataset crudo desde UCI ML Repository
+   2. Decodificación de TODOS los atributos codificados → texto legible
+      (antes, validación de calidad: las filas que fallan van a cuarentena)
+   3. Feature Engineering (Rango_Edad, Score_Cliente simulado)
+   4. Modelado en Star Schema → Fact_Prestamos + 4 Dimensiones
+      (Dim_Cliente deduplicada, con versiones SCD tipo 2)
+   5. Exportación a CSV listos para Power BI
+
+ Modo streaming (--streaming): procesa el archivo crudo por bloques de
+ tamaño fijo para que la memoria no dependa del tamaño del dataset.
+ Modo paralelo (--paralelo): reparte particiones del archivo crudo entre
+ varios procesos; la salida es idéntica a la del modo secuencial.
+
+ Se ejecuta con el subcomando `export` del CLI (python3 -m etl_pipeline).
+=============================================================================
+"""
+
+import pandas as pd
+import numpy as np
+import csv
+import functools
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+from .calendario import NOMBRES_DIA, NOMBRES_MES, calendario, clave_fecha, ruta_cache
+from .catalogo import (COLUMN_NAMES, DECODIFICACIONES, DECODE_RIESGO, ESTADO_CIVIL_POR_CODIGO,
+                       GENERO_POR_CODIGO, categorizar_proposito)
+from .config import (CALENDARIO_DESDE, CALENDARIO_HASTA, CHUNKSIZE_DEFECTO, CLAVE_CLIENTE, PROCESSED_DIR,
+                     RAW_DIR, RUTA_BASE_DATOS, RUTA_LOG_EJECUCIONES, SEMILLA)
+from .lector import a_dataframe, leer_bloques
+from .reglas import (BORDES_EDAD, BORDES_MONTO, BORDES_SCORE, ETIQUETAS_EDAD, ETIQUETAS_MONTO,
+                     ETIQUETAS_SCORE, tarjeta_score, tramos)
+from .validacion import REGLAS_CRUDO, ValidacionCalidad, evaluar
+
+# ─── CONFIGURACIÓN ─────────────────────────────────────────────────────────
+# Rutas, semilla y chunksize por defecto: etl_pipeline/config.py
+
+# Generador único para el ruido del score y las fechas simuladas
+RNG = np.random.default_rng(SEMILLA)
+
+# Rango de fechas simuladas (Fecha_Solicitud)
+FECHA_INICIO = datetime(2023, 1, 1)
+FECHA_FIN = datetime(2025, 12, 31)
+
+# ─── INSTRUMENTACIÓN ───────────────────────────────────────────────────────
+def rss_actual():
+    """RSS del proceso en bytes (/proc en Linux; si no, el máximo de `resource`; 0 si no hay)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return 0
+
+
+def filas_de(objeto):
+    """Filas de un resultado de etapa (DataFrame, Star Schema o resumen streaming); None si no aplica."""
+    if isinstance(objeto, (pd.DataFrame, pd.Series)):
+        return len(objeto)
+    if isinstance(objeto, TablasEstrella):
+        return len(objeto.base)
+    if isinstance(objeto, MetricasRiesgo):
+        return objeto.total
+    if isinstance(objeto, dict) and isinstance(objeto.get('metricas'), MetricasRiesgo):
+        return objeto['metricas'].total
+    return None
+
+
+class RegistroEtapas:
+    """Métricas por etapa de una corrida: duración, filas de entrada/salida y memoria.
+
+    Las llamadas repetidas a una etapa (p. ej. una por bloque en streaming) se
+    acumulan bajo el mismo nombre. Al cerrar la corrida se escribe una línea
+    JSON por etapa más una de la corrida y, opcionalmente, un textfile de
+    Prometheus (para el textfile collector de node_exporter).
+    """
+
+    def __init__(self):
+        self.etapas = {}
+
+    @contextmanager
+    def etapa(self, nombre, filas_entrada=None):
+        """Mide el bloque `with`; la etapa puede informar `medicion['filas_salida']`."""
+        medicion = {'filas_entrada': filas_entrada, 'filas_salida': None}
+        rss_inicial = rss_actual()
+        inicio = time.perf_counter()
+        error = False
+        try:
+            yield medicion
+        except BaseException:
+            error = True
+            raise
+        finally:
+            segundos = time.perf_counter() - inicio
+            rss = rss_actual()
+            self._acumular(nombre, {
+                'llamadas': 1,
+                'errores': int(error),
+                'segundos': segundos,
+                'filas_entrada': medicion['filas_entrada'] or 0,
+                'filas_salida': medicion['filas_salida'] or 0,
+                'memoria_delta_mb': (rss - rss_inicial) / 1024 ** 2,
+                'rss_max_mb': rss / 1024 ** 2
+            })
+
+    def _acumular(self, nombre, medida):
+        total = self.etapas.setdefault(nombre, dict.fromkeys(medida, 0))
+        for campo, valor in medida.items():
+            total[campo] = max(total[campo], valor) if campo == 'rss_max_mb' else total[campo] + valor
+
+    def extraer(self):
+        """Devuelve las etapas acumuladas y vacía el registro (workers del modo paralelo)."""
+        etapas, self.etapas = self.etapas, {}
+        return etapas
+
+    def combinar(self, etapas):
+        """Suma etapas medidas en otro proceso (sus segundos son de CPU de ese proceso)."""
+        for nombre, medida in etapas.items():
+            self._acumular(nombre, medida)
+
+    def filas_por_segundo(self, medida):
+        filas = medida['filas_salida'] or medida['filas_entrada']
+        return filas / medida['segundos'] if filas and medida['segundos'] > 0 else None
+
+    @contextmanager
+    def corrida(self, ruta_log=RUTA_LOG_EJECUCIONES, ruta_prometheus=None, **contexto):
+        """Delimita una corrida del pipeline y guarda sus métricas al terminar (también si falla)."""
+        self.etapas = {}
+        id_corrida = datetime.now().strftime('%Y%m%dT%H%M%S') + f"-{os.getpid()}"
+        inicio = time.perf_counter()
+        estado = 'error'
+        try:
+            yield self
+            estado = 'ok'
+        finally:
+            corrida = {'tipo': 'corrida', 'corrida': id_corrida, 'fin': datetime.now().isoformat(timespec='seconds'),
+                       'estado': estado, 'segundos': time.perf_counter() - inicio,
+                       'rss_max_mb': max([m['rss_max_mb'] for m in self.etapas.values()], default=0),
+                       **contexto}
+            if ruta_log:
+                self.escribir_log(ruta_log, corrida)
+            if ruta_prometheus:
+                self.escribir_prometheus(ruta_prometheus, corrida)
+
+    def escribir_log(self, ruta, corrida):
+        """Anexa al JSON-lines una línea por etapa y una de la corrida."""
+        with open(ruta, 'a', encoding='utf-8') as f:
+            for nombre, medida in self.etapas.items():
+                linea = {'tipo': 'etapa', 'corrida': corrida['corrida'], 'etapa': nombre, **medida,
+                         'filas_por_segundo': self.filas_por_segundo(medida)}
+                f.write(json.dumps(linea, ensure_ascii=False) + '\n')
+            f.write(json.dumps(corrida, ensure_ascii=False) + '\n')
+
+    def escribir_prometheus(self, ruta, corrida):
+        """Reemplaza (atómicamente) el textfile de Prometheus con la última corrida."""
+        series = {
+            'etl_etapa_duracion_segundos': ('Duración acumulada de la etapa', 'segundos'),
+            'etl_etapa_filas': ('Filas procesadas por la etapa', 'filas_salida'),
+            'etl_etapa_filas_por_segundo': ('Throughput de la etapa', None),
+            'etl_etapa_memoria_delta_bytes': ('Variación de RSS durante la etapa', 'memoria_delta_mb'),
+        }
+        lineas = []
+        for metrica, (ayuda, campo) in series.items():
+            lineas += [f"# HELP {metrica} {ayuda}", f"# TYPE {metrica} gauge"]
+            for nombre, medida in self.etapas.items():
+                if campo is None:
+                    valor = self.filas_por_segundo(medida) or 0
+                elif campo == 'filas_salida':
+                    valor = medida['filas_salida'] or medida['filas_entrada']
+                else:
+                    valor = medida[campo] * (1024 ** 2 if campo.endswith('_mb') else 1)
+                lineas.append(f'{metrica}{{etapa="{nombre}"}} {valor:.6g}')
+        lineas += [
+            "# HELP etl_corrida_duracion_segundos Duración total de la última corrida",
+            "# TYPE etl_corrida_duracion_segundos gauge",
+            f"etl_corrida_duracion_segundos {corrida['segundos']:.6g}",
+            "# HELP etl_corrida_exito 1 si la última corrida terminó sin errores",
+            "# TYPE etl_corrida_exito gauge",
+            f"etl_corrida_exito {int(corrida['estado'] == 'ok')}",
+            "# HELP etl_corrida_fin_timestamp_segundos Fin de la última corrida (epoch)",
+            "# TYPE etl_corrida_fin_timestamp_segundos gauge",
+            f"etl_corrida_fin_timestamp_segundos {time.time():.0f}",
+        ]
+        with open(ruta + '.tmp', 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lineas) + '\n')
+        os.replace(ruta + '.tmp', ruta)
+
+
+# Registro global de la corrida en curso (las etapas instrumentadas escriben aquí)
+REGISTRO = RegistroEtapas()
+
+
+def instrumentar(nombre=None):
+    """Decorador: mide la función como etapa (filas de su primer argumento → filas del resultado)."""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with REGISTRO.etapa(nombre or funcion.__name__, filas_de(args[0]) if args else None) as medicion:
+                resultado = funcion(*args, **kwargs)
+                medicion['filas_salida'] = filas_de(resultado)
+            return resultado
+        return envoltura
+    return decorador
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PASO 1: DESCARGA DEL DATASET CRUDO
+# ═══════════════════════════════════════════════════════════════════════════
+URL_DATASET = "https://archive.ics.uci.edu/ml/machine-learning-databases/statlog/german/german.data"
+NOMBRE_MANIFIESTO = "manifiesto_descargas.json"
+BLOQUE_DESCARGA = 1 << 20       # bytes por escritura al disco
+REINTENTOS_DESCARGA = 3         # cortes a mitad de descarga que se retoman con Range
+TIMEOUT_DESCARGA = 30
+
+
+def sesion_http(conexiones=4):
+    """`requests.Session` con un pool de `conexiones` y reintentos ante errores 5xx."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    sesion = requests.Session()
+    adaptador = HTTPAdapter(pool_connections=conexiones, pool_maxsize=conexiones,
+                            max_retries=Retry(total=3, backoff_factor=0.5,
+                                              status_forcelist=(500, 502, 503, 504)))
+    sesion.mount('http://', adaptador)
+    sesion.mount('https://', adaptador)
+    return sesion
+
+
+def sha256_archivo(ruta, bloque=BLOQUE_DESCARGA):
+    """Hash SHA-256 (hex) de un archivo, leído por bloques."""
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        while datos := f.read(bloque):
+            h.update(datos)
+    return h.hexdigest()
+
+
+def descargar_archivo(url, destino, sesion, entrada=None):
+    """Descarga `url` a `destino` por bloques y devuelve su entrada del manifiesto.
+
+    - Con `entrada` (la descarga anterior) se pide con If-None-Match /
+      If-Modified-Since: un 304 con el archivo local intacto no descarga nada.
+    - Los bytes van a `destino.parcial`; un corte se retoma con Range +
+      If-Range (si la fuente cambió, el servidor responde 200 y se empieza
+      de nuevo). Solo un archivo completo se renombra a `destino`.
+    """
+    import requests
+
+    parcial = f"{destino}.parcial"
+    validadores = f"{parcial}.json"
+    encabezados = {}
+    if entrada and os.path.exists(destino):
+        if entrada.get('etag'):
+            encabezados['If-None-Match'] = entrada['etag']
+        if entrada.get('last_modified'):
+            encabezados['If-Modified-Since'] = entrada['last_modified']
+
+    for intento in range(REINTENTOS_DESCARGA + 1):
+        pedido = dict(encabezados)
+        previo = cargar_estado(validadores) if os.path.exists(parcial) else None
+        if previo and (previo['etag'] or previo['last_modified']):
+            pedido['Range'] = f"bytes={os.path.getsize(parcial)}-"
+            pedido['If-Range'] = previo['etag'] or previo['last_modified']
+        try:
+            with sesion.get(url, headers=pedido, stream=True, timeout=TIMEOUT_DESCARGA) as respuesta:
+                if respuesta.status_code == 304:
+                    if entrada['bytes'] == os.path.getsize(destino) and entrada['sha256'] == sha256_archivo(destino):
+                        return {**entrada, 'estado': 'sin cambios'}
+                    # El archivo local no coincide con el manifiesto: se descarga de nuevo
+                    encabezados = {}
+                    continue
+                respuesta.raise_for_status()
+                actual = {'etag': respuesta.headers.get('ETag'),
+                          'last_modified': respuesta.headers.get('Last-Modified')}
+                retoma = respuesta.status_code == 206
+                if not retoma:
+                    guardar_estado(actual, validadores)
+                total = respuesta.headers.get('Content-Range', '').rpartition('/')[2] if retoma \
+                    else respuesta.headers.get('Content-Length')
+                with open(parcial, 'ab' if retoma else 'wb') as f:
+                    for datos in respuesta.iter_content(BLOQUE_DESCARGA):
+                        f.write(datos)
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            if intento == REINTENTOS_DESCARGA:
+                raise
+            print(f"   ↻ {os.path.basename(destino)}: {e.__class__.__name__}, se retoma ({intento + 1})")
+            continue
+
+        descargados = os.path.getsize(parcial)
+        if total and total.isdigit() and descargados != int(total):
+            if intento == REINTENTOS_DESCARGA:
+                raise IOError(f"{url}: {descargados:,} de {int(total):,} bytes")
+            continue
+        os.replace(parcial, destino)
+        os.remove(validadores)
+        return {'url': url, **actual, 'bytes': descargados, 'sha256': sha256_archivo(destino),
+                'fecha': datetime.now().isoformat(timespec='seconds'), 'estado': 'descargado'}
+    raise IOError(f"{url}: no se pudo completar la descarga")
+
+
+def descargar_fuentes(fuentes, directorio=None, workers=4):
+    """Descarga varias fuentes a la vez ({nombre de archivo: URL}) sobre una sesión compartida.
+
+    El manifiesto (`manifiesto_descargas.json` en `directorio`) guarda ETag,
+    Last-Modified, bytes y SHA-256 de cada archivo; se actualiza con las
+    descargas exitosas aunque otras fallen. Devuelve {nombre: ruta}.
+    """
+    directorio = directorio or RAW_DIR
+    os.makedirs(directorio, exist_ok=True)
+    ruta_manifiesto = os.path.join(directorio, NOMBRE_MANIFIESTO)
+    manifiesto = cargar_estado(ruta_manifiesto) or {}
+
+    with sesion_http(workers) as sesion, ThreadPoolExecutor(workers) as pool:
+        futuros = {
+            nombre: pool.submit(descargar_archivo, url, os.path.join(directorio, nombre), sesion,
+                                manifiesto.get(nombre) if manifiesto.get(nombre, {}).get('url') == url else None)
+            for nombre, url in fuentes.items()
+        }
+        errores = {}
+        for nombre, futuro in futuros.items():
+            try:
+                entrada = futuro.result()
+            except Exception as e:
+                errores[nombre] = e
+                print(f"   ✗ {nombre}: {e}")
+                continue
+            print(f"   ✓ {nombre}: {entrada.pop('estado')} ({entrada['bytes'] / 1024:,.1f} KB)")
+            manifiesto[nombre] = entrada
+
+    guardar_estado(manifiesto, ruta_manifiesto)
+    if errores:
+        raise IOError(f"Fallaron {len(errores)} de {len(fuentes)} descargas: {', '.join(errores)}")
+    return {nombre: os.path.join(directorio, nombre) for nombre in fuentes}
+
+
+@instrumentar()
+def descargar_dataset(url=URL_DATASET, revalidar=False):
+    """Descarga el German Credit Data desde UCI ML Repository.
+
+    Un archivo ya descargado se usa sin tocar la red, salvo con `revalidar`
+    (pedido condicional con el ETag del manifiesto). Las descargas son
+    atómicas: en `RAW_DIR` nunca queda un archivo a medias.
+    """
+    nombre = "german_credit.data"
+    filepath = os.path.join(RAW_DIR, nombre)
+
+    if os.path.exists(filepath) and not revalidar:
+        print("✅ Dataset crudo ya existe. Saltando descarga.")
+        return filepath
+
+    print("📥 Descargando German Credit Data desde UCI...")
+    try:
+        descargar_fuentes({nombre: url}, workers=1)
+        print(f"✅ Dataset descargado: {filepath}")
+    except Exception as e:
+        print(f"⚠️  Error descargando: {e}")
+        if os.path.exists(filepath):
+            print("📋 Se usa la copia local existente.")
+            return filepath
+        print("📋 Generando dataset sintético basado en distribución original...")
+        return None
+
+    return filepath
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PASO 2: CARGA Y DECODIFICACIÓN COMPLETA
+# ═══════════════════════════════════════════════════════════════════════════
+# Columnas del crudo y diccionarios de decodificación: etl_pipeline/catalogo.py
+
+# Las columnas codificadas se leen directamente como Categorical: cada código A
+# se guarda una sola vez y las filas solo llevan un código entero.
+DTYPES_CRUDOS = {col: 'category' for col in DECODIFICACIONES}
+
+# Líneas por ventana del lector mmap al cargar el archivo completo
+FILAS_VENTANA = 1 << 18
+
+
+@instrumentar()
+def cargar_y_decodificar(filepath, cuarentena=None, validacion=None):
+    """Carga el dataset crudo, lo valida (ver `validar_crudo`) y aplica TODAS las decodificaciones.
+
+    El índice del resultado es la posición de cada fila en el crudo.
+    """
+
+    if filepath and os.path.exists(filepath):
+        print("📂 Cargando dataset crudo...")
+        df = leer_crudo(filepath)
+    else:
+        print("🔧 Generando dataset sintético...")
+        df = generar_dataset_sintetico()
+
+    print(f"   → {len(df)} registros cargados, {len(df.columns)} columnas")
+
+    validas = validar_crudo(df, 0, cuarentena, validacion)
+    if len(validas) < len(df):
+        print(f"   ⚠️  {len(df) - len(validas)} registros no pasan la validación (→ Cuarentena.csv)")
+    return decodificar(validas)
+
+
+class LectorAcotado:
+    """Vista de solo lectura sobre los bytes [inicio, fin) de un archivo binario."""
+
+    def __init__(self, archivo, inicio, fin):
+        archivo.seek(inicio)
+        self._archivo = archivo
+        self._restantes = fin - inicio
+
+    def read(self, n=-1):
+        if n is None or n < 0 or n > self._restantes:
+            n = self._restantes
+        datos = self._archivo.read(n)
+        self._restantes -= len(datos)
+        return datos
+
+    def __iter__(self):
+        return iter(lambda: self.read(1 << 16), b'')
+
+
+def leer_crudo(filepath, inicio=0, fin=None):
+    """Dataset crudo de los bytes [inicio, fin) con el lector mmap (etl_pipeline/lector.py).
+
+    Las ventanas se tokenizan a arrays enteros y se concatenan antes de armar
+    las categóricas; si alguna no respeta el formato fijo, el rango completo
+    se lee con `pd.read_csv` como siempre.
+    """
+    ventanas = []
+    for _, _, columnas in leer_bloques(filepath, FILAS_VENTANA, inicio, fin):
+        if columnas is None:
+            break
+        ventanas.append(columnas)
+    else:
+        if ventanas:
+            return a_dataframe({col: np.concatenate([v[col] for v in ventanas]) for col in COLUMN_NAMES})
+
+    fin = os.path.getsize(filepath) if fin is None else fin
+    with open(filepath, 'rb') as archivo:
+        return pd.read_csv(LectorAcotado(archivo, inicio, fin), sep=' ', header=None, names=COLUMN_NAMES,
+                           dtype=DTYPES_CRUDOS)
+
+
+def leer_en_chunks(filepath, chunksize=CHUNKSIZE_DEFECTO, inicio=0, fin=None):
+    """Lee el dataset crudo en bloques de `chunksize` filas (modo streaming).
+
+    `inicio`/`fin` limitan la lectura a un rango de bytes alineado a líneas
+    (modo incremental: solo las filas nuevas). Cada bloque lo tokeniza el
+    lector mmap de etl_pipeline/lector.py.
+    """
+    if filepath and os.path.exists(filepath):
+        with open(filepath, 'rb') as archivo:
+            for desde, hasta, columnas in leer_bloques(filepath, chunksize, inicio, fin):
+                if columnas is not None:
+                    yield a_dataframe(columnas)
+                    continue
+                # Ventana fuera del formato fijo (líneas vacías, '\r', otro separador): pandas
+                try:
+                    lector = pd.read_csv(LectorAcotado(archivo, desde, hasta), sep=' ', header=None,
+                                         names=COLUMN_NAMES, dtype=DTYPES_CRUDOS, chunksize=chunksize)
+                except pd.errors.EmptyDataError:
+                    continue                # solo líneas vacías
+                yield from lector
+    else:
+        df = generar_dataset_sintetico()
+        for inicio in range(0, len(df), chunksize):
+            yield df.iloc[inicio:inicio + chunksize].copy()
+
+
+def recodificar(serie, traducir, categorias):
+    """Traduce una columna categórica con un único lookup sobre sus códigos.
+
+    `traducir` se aplica a cada categoría (no a cada fila); las filas solo se
+    reindexan con una tabla entera. Las etiquetas que no estén en `categorias`
+    se agregan al final, de modo que los valores desconocidos no se pierden;
+    si `traducir` devuelve None, la fila queda como nula.
+    """
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype('category')
+    destino = [traducir(c) for c in serie.cat.categories]
+    extras = [e for e in dict.fromkeys(destino) if e is not None and e not in categorias]
+    etiquetas = pd.Index(list(categorias) + extras)
+    # El -1 final hace que los nulos (código -1) sigan siendo nulos
+    lookup = np.append(etiquetas.get_indexer(destino), -1)
+    codigos = lookup[serie.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codigos, categories=etiquetas),
+                     index=serie.index, name=serie.name)
+
+
+@instrumentar()
+def decodificar(df, verbose=True):
+    """Aplica TODAS las decodificaciones sobre un DataFrame crudo (completo o bloque)."""
+    # ── Decodificar target: 1=Good, 2=Bad ──
+    df['Riesgo'] = recodificar(df['Riesgo'], DECODE_RIESGO.get, DECODE_RIESGO.values())
+
+    # ── Aplicar TODAS las decodificaciones ──
+    if verbose:
+        print("🔄 Decodificando atributos...")
+
+    # ── Género y Estado Civil: tablas precalculadas sobre los códigos A9x ──
+    crudo_sexo = df['Estado_Personal_Sexo']
+    df['Genero'] = recodificar(crudo_sexo, lambda c: GENERO_POR_CODIGO.get(c, 'Femenino'),
+                               ['Masculino', 'Femenino'])
+    df['Estado_Civil'] = recodificar(crudo_sexo, lambda c: ESTADO_CIVIL_POR_CODIGO.get(c, 'Desconocido'),
+                                     dict.fromkeys(ESTADO_CIVIL_POR_CODIGO.values()))
+
+    for col, mapping in DECODIFICACIONES.items():
+        with REGISTRO.etapa(f"decodificar.{col}", len(df)):
+            df[col] = recodificar(df[col], lambda c: mapping.get(c, c), mapping.values())
+        if verbose:
+            codigos = df[col].cat.codes.to_numpy()
+            decoded_count = np.count_nonzero((codigos >= 0) & (codigos < len(mapping)))
+            print(f"   ✓ {col}: {decoded_count}/{len(df)} valores decodificados")
+    
+    return df
+
+
+# Distribución marginal de cada columna del crudo: (valores, probabilidades).
+# None = equiprobable. Monto_Credito y Edad se generan con NORMALES_SINTETICAS.
+DISTRIBUCION_SINTETICA = {
+    'Status_Cuenta': (['A11', 'A12', 'A13', 'A14'], [0.27, 0.27, 0.06, 0.40]),
+    'Duracion_Meses': ([6, 12, 18, 24, 36, 48, 60], None),
+    'Historial_Crediticio': (['A30', 'A31', 'A32', 'A33', 'A34'], [0.04, 0.05, 0.53, 0.09, 0.29]),
+    'Proposito': (['A40', 'A41', 'A42', 'A43', 'A46', 'A49'], [0.23, 0.10, 0.18, 0.28, 0.05, 0.16]),
+    'Cuenta_Ahorro': (['A61', 'A62', 'A63', 'A64', 'A65'], [0.60, 0.10, 0.06, 0.05, 0.19]),
+    'Empleo_Desde': (['A71', 'A72', 'A73', 'A74', 'A75'], [0.06, 0.17, 0.34, 0.17, 0.26]),
+    'Tasa_Cuota': ([1, 2, 3, 4], [0.20, 0.23, 0.25, 0.32]),
+    'Estado_Personal_Sexo': (['A91', 'A92', 'A93', 'A94'], [0.05, 0.31, 0.55, 0.09]),
+    'Otros_Deudores': (['A101', 'A102', 'A103'], [0.91, 0.04, 0.05]),
+    'Residencia_Desde': ([1, 2, 3, 4], [0.13, 0.31, 0.15, 0.41]),
+    'Propiedad': (['A121', 'A122', 'A123', 'A124'], [0.28, 0.23, 0.33, 0.16]),
+    'Otros_Planes_Cuota': (['A141', 'A142', 'A143'], [0.14, 0.05, 0.81]),
+    'Vivienda': (['A151', 'A152', 'A153'], [0.18, 0.71, 0.11]),
+    'Creditos_Existentes': ([1, 2, 3, 4], [0.63, 0.33, 0.03, 0.01]),
+    'Trabajo': (['A171', 'A172', 'A173', 'A174'], [0.02, 0.20, 0.63, 0.15]),
+    'Personas_Dependientes': ([1, 2], [0.85, 0.15]),
+    'Telefono': (['A191', 'A192'], [0.60, 0.40]),
+    'Extranjero': (['A201', 'A202'], [0.04, 0.96]),
+}
+
+# (media, desvío, diferencia de medias Bad − Good). Monto_Credito es lognormal:
+# los parámetros son los de log(Monto).
+NORMALES_SINTETICAS = {
+    'Monto_Credito': (7.8, 0.7, 0.19),
+    'Edad': (35, 11, -2.3),
+}
+
+PROBABILIDAD_BAD = 0.30
+
+# Tasa de Bad por valor en el German Credit original (Duracion_Meses redondeada
+# al valor más cercano); solo se usa al generar con correlación.
+TASA_BAD_SINTETICA = {
+    'Status_Cuenta': [0.49, 0.39, 0.22, 0.12],
+    'Duracion_Meses': [0.17, 0.23, 0.35, 0.31, 0.42, 0.59, 0.50],
+    'Historial_Crediticio': [0.62, 0.57, 0.32, 0.32, 0.17],
+    'Proposito': [0.38, 0.17, 0.32, 0.22, 0.44, 0.35],
+    'Cuenta_Ahorro': [0.36, 0.33, 0.17, 0.12, 0.17],
+    'Empleo_Desde': [0.37, 0.41, 0.31, 0.22, 0.25],
+    'Tasa_Cuota': [0.25, 0.27, 0.29, 0.33],
+    'Estado_Personal_Sexo': [0.40, 0.35, 0.27, 0.27],
+    'Otros_Deudores': [0.30, 0.44, 0.19],
+    'Residencia_Desde': [0.28, 0.31, 0.29, 0.30],
+    'Propiedad': [0.21, 0.31, 0.31, 0.44],
+    'Otros_Planes_Cuota': [0.41, 0.40, 0.28],
+    'Vivienda': [0.39, 0.26, 0.41],
+    'Creditos_Existentes': [0.32, 0.28, 0.21, 0.33],
+    'Trabajo': [0.32, 0.28, 0.30, 0.34],
+    'Personas_Dependientes': [0.30, 0.30],
+    'Telefono': [0.31, 0.28],
+    'Extranjero': [0.31, 0.11],
+}
+
+
+def probabilidades_condicionales(probabilidades, tasa_bad, p_bad=PROBABILIDAD_BAD):
+    """P(valor | Good) y P(valor | Bad) que respetan exactamente la marginal `probabilidades`.
+
+    P(valor | Bad) es proporcional a P(valor) · tasa_bad(valor); P(valor | Good)
+    se despeja de P(valor) = (1 − p_bad) · P(valor | Good) + p_bad · P(valor | Bad).
+    """
+    p = np.asarray(probabilidades, dtype=float)
+    p_si_bad = p * np.asarray(tasa_bad) / np.dot(p, tasa_bad)
+    p_si_good = (p - p_bad * p_si_bad) / (1 - p_bad)
+    if (p_si_good < 0).any():
+        raise ValueError("La tasa de Bad por valor es incompatible con la marginal")
+    return p_si_good, p_si_bad
+
+
+def _sortear(rng, probabilidades, n):
+    """Índices en [0, len(probabilidades)) con esas probabilidades (una uniforme por fila)."""
+    acumuladas = np.cumsum(probabilidades)
+    acumuladas[-1] = 1.0
+    return np.searchsorted(acumuladas, rng.random(n), side='right')
+
+
+def generar_dataset_sintetico(n=1000, rng=None, correlacionar=False):
+    """Genera un dataset sintético con la misma distribución que el German Credit Data.
+
+    Devuelve el formato crudo: códigos A como Categorical y enteros. Con
+    `correlacionar`, cada atributo se sortea condicionado a Riesgo (tasas de
+    Bad del dataset original) sin cambiar su distribución marginal.
+    """
+    rng = np.random.default_rng(SEMILLA) if rng is None else rng
+    es_bad = rng.random(n) < PROBABILIDAD_BAD
+
+    data = {}
+    for col, (valores, probabilidades) in DISTRIBUCION_SINTETICA.items():
+        if probabilidades is None:
+            probabilidades = np.full(len(valores), 1 / len(valores))
+        if correlacionar:
+            p_good, p_bad = probabilidades_condicionales(probabilidades, TASA_BAD_SINTETICA[col])
+            indices = np.where(es_bad, _sortear(rng, p_bad, n), _sortear(rng, p_good, n))
+        else:
+            indices = _sortear(rng, probabilidades, n)
+        if isinstance(valores[0], str):
+            data[col] = pd.Categorical.from_codes(indices, categories=valores)
+        else:
+            data[col] = np.asarray(valores)[indices]
+
+    for col, (media, desvio, diferencia) in NORMALES_SINTETICAS.items():
+        if correlacionar:
+            # Medias desplazadas por clase con la misma media y varianza totales
+            media = media + diferencia * (es_bad - PROBABILIDAD_BAD)
+            desvio = np.sqrt(desvio ** 2 - PROBABILIDAD_BAD * (1 - PROBABILIDAD_BAD) * diferencia ** 2)
+        valores = media + desvio * rng.standard_normal(n)
+        data[col] = np.exp(valores).astype(int) if col == 'Monto_Credito' else valores.clip(19, 75).astype(int)
+
+    data['Riesgo'] = np.where(es_bad, 2, 1)
+    return pd.DataFrame(data)[COLUMN_NAMES]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PASO 2B: VALIDACIÓN DE CALIDAD Y CUARENTENA
+# ═══════════════════════════════════════════════════════════════════════════
+# Reglas declarativas y su evaluación vectorizada: etl_pipeline/validacion.py
+
+# Cuarentena.csv: fila del crudo (desde 1), reglas incumplidas y los valores crudos
+COLUMNAS_CUARENTENA = ['Fila', 'Reglas'] + COLUMN_NAMES
+
+# Etiqueta decodificada → código del crudo (filas rechazadas después de decodificar)
+CODIFICACIONES = {col: {etiqueta: codigo for codigo, etiqueta in mapping.items()}
+                  for col, mapping in {**DECODIFICACIONES, 'Riesgo': DECODE_RIESGO}.items()}
+
+
+class Cuarentena:
+    """Filas rechazadas por la validación, en `Cuarentena.csv` (siempre CSV, con los valores crudos).
+
+    Los rechazos de cada etapa se acumulan y `volcar` los escribe ordenados por
+    fila: el archivo queda en el orden del crudo en todos los modos.
+    """
+
+    def __init__(self, directorio=None, anexar=False):
+        self.escritor = abrir_escritor('Cuarentena', 'csv', directorio, anexar=anexar)
+        self.escritor.escribir(pd.DataFrame(columns=COLUMNAS_CUARENTENA))     # encabezado aunque no haya rechazos
+        self._pendientes = []
+
+    @property
+    def ruta(self):
+        return self.escritor.ruta
+
+    def agregar(self, crudo, filas, reglas):
+        """Encola las filas de `crudo` con su número de fila en el archivo y las reglas que incumplen."""
+        rechazadas = crudo[COLUMN_NAMES].set_axis(pd.RangeIndex(len(crudo)))
+        rechazadas.insert(0, 'Reglas', reglas)
+        rechazadas.insert(0, 'Fila', np.asarray(filas, dtype=np.int64))
+        self._pendientes.append(rechazadas)
+
+    def volcar(self):
+        """Escribe los rechazos encolados (se llama al terminar cada bloque)."""
+        if self._pendientes:
+            rechazadas = pd.concat(self._pendientes, ignore_index=True)
+            self.escritor.escribir(rechazadas.sort_values('Fila', kind='stable'))
+            self._pendientes = []
+
+    def copiar(self, ruta):
+        """Anexa la cuarentena de una partición (modo paralelo)."""
+        self.volcar()
+        self.escritor.copiar(ruta)
+
+    def cerrar(self):
+        self.volcar()
+        self.escritor.cerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def abrir_salida(nombre, formato='csv', directorio=None, **opciones):
+    """`abrir_escritor`, salvo la cuarentena, que es siempre `Cuarentena` (CSV)."""
+    if nombre == 'Cuarentena':
+        return Cuarentena(directorio, anexar=opciones.get('anexar', False))
+    return abrir_escritor(nombre, formato, directorio, **opciones)
+
+
+def etapa_regla(regla, filas):
+    """Cada regla se mide como etapa propia (`validar.<tipo>.<columna>`) en el registro de la corrida."""
+    return REGISTRO.etapa(f"validar.{regla}", filas)
+
+
+@instrumentar()
+def validar_crudo(crudo, fila_inicial=0, cuarentena=None, validacion=None):
+    """Aplica `REGLAS_CRUDO` a un bloque crudo y devuelve solo sus filas válidas.
+
+    Las rechazadas van a `cuarentena` (su fila en el archivo es `fila_inicial`
+    + posición en el bloque + 1) y los conteos por regla a `validacion`. El
+    índice del resultado es la posición de cada fila en el bloque: con él, el
+    ruido aleatorio y los IDs de una fila no dependen de cuántas se descartaron.
+    """
+    indice = crudo.index
+    if not (isinstance(indice, pd.RangeIndex) and indice.start == 0 and indice.step == 1):
+        crudo = crudo.set_axis(pd.RangeIndex(len(crudo)))
+    validas, fallas, reglas = evaluar(crudo, REGLAS_CRUDO, etapa_regla)
+    if validacion is not None:
+        validacion.registrar(fallas, len(reglas), filas=len(crudo))
+    if not len(reglas):
+        return crudo
+    if cuarentena is not None:
+        cuarentena.agregar(crudo[~validas], fila_inicial + np.flatnonzero(~validas) + 1, reglas)
+    crudo = crudo[validas]
+    # Columnas que pandas leyó como texto por un valor no numérico: lo que queda son números
+    texto = [col for col, serie in crudo.items() if col not in DECODIFICACIONES and serie.dtype.kind not in 'iuf']
+    return crudo.assign(**{col: pd.to_numeric(crudo[col]) for col in texto}) if texto else crudo
+
+
+def a_crudo(df):
+    """Columnas del crudo de filas ya decodificadas: cada etiqueta vuelve a su código."""
+    return df[COLUMN_NAMES].assign(**{
+        col: recodificar(df[col], codigos.get, codigos.values()) for col, codigos in CODIFICACIONES.items()
+    })
+
+
+def claves_dimensiones(indice_proposito):
+    """Claves de cada dimensión que puede referenciar un bloque de hechos (`range` o array ordenado).
+
+    El calendario es el rango de config. Dim_Cliente no está: ID_Cliente se
+    asigna después de validar (`asignar_clientes`) y siempre tiene su versión.
+    """
+    dias = np.arange(np.datetime64(CALENDARIO_DESDE, 'D'), np.datetime64(CALENDARIO_HASTA, 'D') + 1)
+    return {
+        'Dim_Proposito': range(1, len(indice_proposito) + 1),
+        'Dim_Tiempo': clave_fecha(dias),
+        'Dim_Riesgo': range(1, len(INDICE_RIESGO) + 1),
+    }
+
+
+@instrumentar()
+def validar_fact(df, claves, fila_inicial=0, cuarentena=None, validacion=None):
+    """Integridad referencial de los IDs de un bloque: devuelve las filas cuyas claves existen.
+
+    Una regla 'referencia' por clave foránea de Fact_Prestamos (`CLAVES_FORANEAS`)
+    con dimensión en `claves` (ver `claves_dimensiones`). Las filas rechazadas
+    vuelven al formato crudo para la cuarentena; el índice de `df` es su
+    posición en el bloque.
+    """
+    reglas = {'referencia': {columna: claves[dimension]
+                             for columna, dimension in CLAVES_FORANEAS['Fact_Prestamos'].items()
+                             if dimension in claves}}
+    validas, fallas, motivos = evaluar(df, reglas, etapa_regla)
+    if validacion is not None:
+        validacion.registrar(fallas, len(motivos))
+    if not len(motivos):
+        return df
+    if cuarentena is not None:
+        cuarentena.agregar(a_crudo(df[~validas]), fila_inicial + df.index.to_numpy()[~validas] + 1, motivos)
+    return df[validas]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PASO 3: FEATURE ENGINEERING
+# ═══════════════════════════════════════════════════════════════════════════
+# Scorecard (tarjeta_score.json) y tramos de edad/score/monto: etl_pipeline/reglas.py
+
+def uniformes(rng, posiciones, n_filas):
+    """Tres uniformes por fila del crudo (`n_filas`), de las que se toman las de `posiciones`.
+
+    Las filas descartadas por la validación también consumen sus tres
+    uniformes: cada fila recibe siempre las mismas, en memoria, por bloques o
+    en particiones.
+    """
+    aleatorios = rng.random((n_filas, 3))
+    if len(posiciones) == n_filas:
+        return aleatorios
+    return aleatorios[np.asarray(posiciones)]
+
+
+@instrumentar()
+def feature_engineering(df, rng=None, verbose=True, tarjeta=None, n_filas=None):
+    """Crea columnas derivadas para análisis más profundo.
+
+    Todo lo aleatorio sale de `rng` (por defecto el generador global `RNG`),
+    con tres uniformes por fila: procesar el dataset completo o por bloques
+    consume la misma secuencia y produce el mismo resultado. `tarjeta` es el
+    scorecard de Score_Cliente (por defecto el de `tarjeta_score.json`).
+    `n_filas` son las filas del crudo del que sale `df` (antes de la
+    validación); el índice de `df` es la posición de cada fila en ese crudo.
+    """
+    rng = RNG if rng is None else rng
+    aleatorios = uniformes(rng, df.index, len(df) if n_filas is None else n_filas)
+
+    if verbose:
+        print("\n⚙️  Feature Engineering...")
+    
+    # ── 1. Rango de Edad ──
+    df['Rango_Edad'] = tramos(df['Edad'], BORDES_EDAD, ETIQUETAS_EDAD)
+    if verbose:
+        print(f"   ✓ Rango_Edad creado: {df['Rango_Edad'].value_counts().to_dict()}")
+    
+    # ── 2. Score de Cliente Simulado (300-850, como FICO) ──
+    # Scorecard (historial + status cuenta + empleo + vivienda + ratio
+    # Monto/Duración) más ruido aleatorio ~ N(0, 30) (Box-Muller sobre dos uniformes)
+    tarjeta = tarjeta or tarjeta_score()
+    u1, u2 = aleatorios[:, 0], aleatorios[:, 1]
+    noise = 30 * np.sqrt(-2 * np.log1p(-u1)) * np.cos(2 * np.pi * u2)
+    puntaje = tarjeta.puntos(df) + noise
+    df['Score_Cliente'] = np.clip(puntaje, tarjeta.minimo, tarjeta.maximo).astype(np.int64)
+    
+    if verbose:
+        print(f"   ✓ Score_Cliente: min={df['Score_Cliente'].min()}, "
+              f"max={df['Score_Cliente'].max()}, mean={df['Score_Cliente'].mean():.0f}")
+    
+    # ── 3. Categoría de Score ──
+    df['Categoria_Score'] = tramos(df['Score_Cliente'], BORDES_SCORE, ETIQUETAS_SCORE)
+    
+    # ── 4. Cuota Mensual Estimada ──
+    df['Cuota_Mensual'] = (df['Monto_Credito'] / df['Duracion_Meses']).round(2)
+    if verbose:
+        print(f"   ✓ Cuota_Mensual calculada")
+    
+    # ── 5. Rango de Monto ──
+    df['Rango_Monto'] = tramos(df['Monto_Credito'], BORDES_MONTO, ETIQUETAS_MONTO)
+    
+    # ── 6. Generar Fechas Simuladas (para Dim_Tiempo) ──
+    dias_rango = (FECHA_FIN - FECHA_INICIO).days
+    offsets = (aleatorios[:, 2] * (dias_rango + 1)).astype(np.int64)
+    fechas = np.datetime64(FECHA_INICIO.date(), 'D') + offsets
+    mes = fechas.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    dia_semana = (fechas.astype(np.int64) + 3) % 7    # 1970-01-01 fue jueves
+    df['Fecha_Solicitud'] = fechas.astype('datetime64[ns]')
+    df['Anio'] = fechas.astype('datetime64[Y]').astype(np.int64) + 1970
+    df['Mes'] = mes
+    df['Nombre_Mes'] = pd.Categorical.from_codes(mes - 1, categories=NOMBRES_MES)
+    df['Trimestre'] = (mes - 1) // 3 + 1
+    df['Dia_Semana'] = pd.Categorical.from_codes(dia_semana, categories=NOMBRES_DIA)
+    
+    if verbose:
+        print(f"   ✓ Fechas simuladas: {df['Anio'].value_counts().to_dict()}")
+    
+    return df
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PASO 4: MODELADO STAR SCHEMA
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Esquema declarado de cada tabla del modelo: columnas en orden y el tipo más
+# angosto que admite su dominio (lo hace cumplir `aplicar_esquema`)
+TEXTO = 'category'
+
+ESQUEMA_FACT = {
+    'ID_Prestamo': 'int32', 'ID_Cliente': 'int32', 'ID_Proposito': 'uint8',
+    'ID_Tiempo': 'int32', 'ID_Riesgo': 'uint8',
+    'Monto': 'int32', 'Duracion': 'uint8', 'Tasa': 'uint8',
+    'Cuota_Mensual': 'float32', 'Creditos_Existentes': 'uint8', 'Score_Cliente': 'int16',
+    'Categoria_Score': TEXTO, 'Rango_Monto': TEXTO,
+    # Situación del cliente al pedir el préstamo (cambia de un préstamo a otro)
+    'Edad': 'uint8', 'Rango_Edad': TEXTO, 'Status_Cuenta': TEXTO, 'Cuenta_Ahorro': TEXTO,
+    'Historial_Crediticio': TEXTO, 'Otros_Deudores': TEXTO, 'Otros_Planes_Cuota': TEXTO
+}
+
+# Una fila por versión de cliente (SCD tipo 2): ID_Cliente es la versión,
+# Codigo_Cliente el cliente; la versión rige desde el préstamo Prestamo_Desde
+ESQUEMA_DIM_CLIENTE = {
+    'ID_Cliente': 'int32', 'Codigo_Cliente': 'int32', 'Version': 'uint32', 'Prestamo_Desde': 'int32',
+    'Genero': TEXTO, 'Estado_Civil': TEXTO, 'Trabajo': TEXTO, 'Empleo_Desde': TEXTO,
+    'Vivienda': TEXTO, 'Propiedad': TEXTO, 'Telefono': TEXTO, 'Extranjero': TEXTO,
+    'Personas_Dependientes': 'uint8'
+}
+
+ESQUEMA_TABLA_COMPLETA = {
+    'ID_Prestamo': 'int32', 'Edad': 'uint8', 'Rango_Edad': TEXTO, 'Genero': TEXTO, 'Estado_Civil': TEXTO,
+    'Trabajo': TEXTO, 'Empleo_Desde': TEXTO, 'Vivienda': TEXTO, 'Propiedad': TEXTO,
+    'Status_Cuenta': TEXTO, 'Cuenta_Ahorro': TEXTO, 'Historial_Crediticio': TEXTO,
+    'Proposito': TEXTO, 'Monto_Credito': 'int32', 'Duracion_Meses': 'uint8', 'Tasa_Cuota': 'uint8',
+    'Cuota_Mensual': 'float32', 'Score_Cliente': 'int16', 'Categoria_Score': TEXTO,
+    'Rango_Monto': TEXTO, 'Creditos_Existentes': 'uint8', 'Personas_Dependientes': 'uint8',
+    'Otros_Deudores': TEXTO, 'Otros_Planes_Cuota': TEXTO, 'Telefono': TEXTO, 'Extranjero': TEXTO,
+    'Riesgo': TEXTO, 'Fecha_Solicitud': 'datetime64[ns]', 'Anio': 'int16', 'Mes': 'uint8', 'Nombre_Mes': TEXTO,
+    'Trimestre': 'uint8', 'Dia_Semana': TEXTO
+}
+
+ESQUEMAS = {
+    'Fact_Prestamos': ESQUEMA_FACT,
+    'Dim_Cliente': ESQUEMA_DIM_CLIENTE,
+    'Dim_Proposito': {'ID_Proposito': 'uint8', 'Proposito': TEXTO, 'Categoria_Proposito': TEXTO},
+    'Dim_Tiempo': {
+        'ID_Tiempo': 'int32', 'Fecha': 'datetime64[ns]', 'Anio': 'int16', 'Mes': 'uint8',
+        'Nombre_Mes': TEXTO, 'Trimestre': TEXTO, 'Dia_Semana': TEXTO, 'Es_FinDeSemana': 'uint8',
+        'Dia': 'uint8', 'Es_Feriado': 'uint8', 'Feriado': TEXTO, 'Es_Dia_Habil': 'uint8',
+        'Anio_Fiscal': 'int16', 'Trimestre_Fiscal': TEXTO, 'Mes_Fiscal': 'uint8'
+    },
+    'Dim_Riesgo': {
+        'ID_Riesgo': 'uint8', 'Estado_Riesgo': TEXTO, 'Descripcion': TEXTO,
+        'Etiqueta_ES': TEXTO, 'Color_HEX': TEXTO
+    },
+    'Tabla_Completa': ESQUEMA_TABLA_COMPLETA
+}
+
+# Columnas de origen de cada tabla (compartidas por el modo en memoria y streaming)
+RENOMBRE_FACT = {
+    'Monto_Credito': 'Monto',
+    'Duracion_Meses': 'Duracion',
+    'Tasa_Cuota': 'Tasa'
+}
+COLUMNAS_FACT = [{v: k for k, v in RENOMBRE_FACT.items()}.get(c, c) for c in ESQUEMA_FACT]
+COLUMNAS_DIM_CLIENTE = list(ESQUEMA_DIM_CLIENTE)
+# Clave de cliente efectiva: sin `CLAVE_CLIENTE` (config) cada préstamo es su propio cliente
+COLUMNAS_CLAVE_CLIENTE = tuple(CLAVE_CLIENTE) or ('ID_Prestamo',)
+# Atributos versionados de un cliente: los de Dim_Cliente que no son clave ni IDs
+COLUMNAS_SCD = ('ID_Cliente', 'Codigo_Cliente', 'Version', 'Prestamo_Desde')
+ATRIBUTOS_CLIENTE = [c for c in ESQUEMA_DIM_CLIENTE if c not in COLUMNAS_SCD + COLUMNAS_CLAVE_CLIENTE]
+COLUMNAS_TABLA_COMPLETA = list(ESQUEMA_TABLA_COMPLETA)
+
+# Tipos del DataFrame base (nombres de origen): las tablas son proyecciones de
+# él, así que cada columna se castea una sola vez y todas comparten el buffer
+ESQUEMA_BASE = {**ESQUEMA_TABLA_COMPLETA, **ESQUEMA_DIM_CLIENTE,
+                **dict(zip(COLUMNAS_FACT, ESQUEMA_FACT.values()))}
+
+
+def aplicar_esquema(df, nombre):
+    """Castea una tabla a su esquema declarado, validando columnas y rangos.
+
+    Lanza ValueError si las columnas no coinciden (nombre u orden) o si una
+    columna entera tiene nulos o valores fuera del rango de su tipo: el dato
+    que no entra en el esquema se detecta al construir la tabla, no después.
+    """
+    esquema = ESQUEMAS[nombre]
+    if list(df.columns) != list(esquema):
+        raise ValueError(f"{nombre}: columnas {list(df.columns)} no coinciden con el esquema {list(esquema)}")
+    return castear(df, esquema, nombre)
+
+
+def castear(df, tipos, nombre='DataFrame'):
+    """Castea las columnas de `tipos` presentes en `df`, validando enteros (nulos y rango).
+
+    Las columnas que ya tienen su tipo no se tocan: con copy-on-write el
+    resultado comparte sus buffers con `df`.
+    """
+    cambios = {c: t for c, t in tipos.items() if c in df.columns and df[c].dtype != t}
+    for columna, tipo in cambios.items():
+        if tipo == TEXTO or np.dtype(tipo).kind not in 'iu':
+            continue
+        valores = df[columna]
+        if valores.isna().any():
+            raise ValueError(f"{nombre}.{columna}: tiene nulos y su tipo es {tipo}")
+        rango = np.iinfo(tipo)
+        if len(valores) and (valores.min() < rango.min or valores.max() > rango.max):
+            raise ValueError(f"{nombre}.{columna}: valores [{valores.min()}, {valores.max()}] "
+                             f"fuera del rango de {tipo}")
+    return df.astype(cambios) if cambios else df
+
+
+def bytes_por_fila(df):
+    """Memoria real (incluye texto) por fila de una tabla."""
+    return df.memory_usage(deep=True, index=False).sum() / max(len(df), 1)
+
+
+class IndiceClaves:
+    """Índice clave natural → clave sustituta (1, 2, 3, ...) reutilizable y persistente.
+
+    Las claves se guardan en orden de inserción (ID = posición + 1), así los IDs
+    ya asignados nunca cambian. La búsqueda es por lotes sobre una tabla hash
+    (`pd.Index.get_indexer`); las columnas categóricas se resuelven sobre sus
+    categorías y luego se reindexan por código.
+    """
+
+    def __init__(self, claves=()):
+        self._claves = np.asarray(claves)
+        self._hash = None
+
+    def __len__(self):
+        return len(self._claves)
+
+    @property
+    def claves(self):
+        return self._claves
+
+    def _indice(self):
+        if self._hash is None:
+            self._hash = pd.Index(self._claves)
+        return self._hash
+
+    def buscar(self, valores):
+        """IDs de un lote de valores (0 para los que no están en el índice)."""
+        if isinstance(getattr(valores, 'dtype', None), pd.CategoricalDtype):
+            ids_categoria = np.append(self.buscar(np.asarray(valores.cat.categories)), 0)
+            return ids_categoria[valores.cat.codes.to_numpy()]
+        if len(self._claves) == 0:
+            return np.zeros(len(valores), dtype=np.int64)
+        return self._indice().get_indexer(np.asarray(valores)).astype(np.int64) + 1
+
+    def agregar(self, valores, ordenar=False):
+        """Inserta los valores no vistos y devuelve cuántos se agregaron.
+
+        Los nuevos reciben IDs consecutivos en orden de primera aparición (o
+        ascendente con `ordenar=True`). El índice se actualiza de una sola vez:
+        si algo falla antes, queda como estaba.
+        """
+        if isinstance(getattr(valores, 'dtype', None), pd.CategoricalDtype):
+            valores = valores.dropna().unique()
+        unicos = pd.unique(np.asarray(valores))
+        if unicos.dtype == object:
+            unicos = unicos.astype(str)     # texto como unicode de NumPy: se guarda sin pickle
+        nuevos = unicos[self.buscar(unicos) == 0]
+        if ordenar:
+            nuevos = np.sort(nuevos)
+        if len(nuevos):
+            self._claves = np.concatenate([self._claves, nuevos]) if len(self._claves) else nuevos
+            self._hash = None
+        return len(nuevos)
+
+    def guardar(self, ruta):
+        """Persiste las claves en `.npy` de forma atómica (temporal + rename)."""
+        tmp = f"{ruta}.tmp.npy"
+        np.save(tmp, self._claves, allow_pickle=False)
+        os.replace(tmp, ruta)
+
+    @classmethod
+    def cargar(cls, ruta, n=None):
+        """Carga un índice guardado; `n` lo recorta a las primeras n claves confirmadas."""
+        claves = np.load(ruta, allow_pickle=False)
+        return cls(claves if n is None else claves[:n])
+
+
+# Dim_Riesgo es un catálogo fijo: ID_Riesgo 1 = Good, 2 = Bad
+INDICE_RIESGO = IndiceClaves(list(DECODE_RIESGO.values()))
+
+
+def ids_riesgo(riesgo):
+    """ID_Riesgo (FK a Dim_Riesgo) por fila; 0 si el estado no está en el catálogo."""
+    return INDICE_RIESGO.buscar(riesgo)
+
+
+def ids_tiempo(fechas):
+    """ID_Tiempo (FK a Dim_Tiempo, clave YYYYMMDD) por fila.
+
+    Las fechas fuera del calendario de config no tienen fila en Dim_Tiempo: las
+    detecta la regla 'referencia.ID_Tiempo' de `validar_fact`.
+    """
+    return clave_fecha(fechas)
+
+
+def asignar_ids(df, fila_inicial, indice_proposito):
+    """Agrega las claves del Star Schema (salvo ID_Cliente) a un bloque decodificado con features.
+
+    ID_Prestamo sale de la fila del crudo (`fila_inicial` + el índice de `df`),
+    así que no cambia si se descartan filas anteriores. ID_Cliente se asigna
+    después de validar las claves (`asignar_clientes`).
+    """
+    fila = fila_inicial + df.index.to_numpy()
+    return df.assign(
+        ID_Prestamo=fila + 1,
+        ID_Proposito=indice_proposito.buscar(df['Proposito']),
+        ID_Tiempo=ids_tiempo(df['Fecha_Solicitud']),
+        ID_Riesgo=ids_riesgo(df['Riesgo'])
+    )
+
+
+# Los ID_Cliente (versiones) arrancan en ID_CLIENTE_BASE + 1
+ID_CLIENTE_BASE = 1000
+
+
+def hash_filas(df, columnas):
+    """Hash de 64 bits de los valores de `columnas` en cada fila (uint64).
+
+    Las columnas se llevan antes a su tipo de `ESQUEMA_BASE`: el mismo valor da
+    el mismo hash venga del crudo o de una tabla ya exportada.
+    """
+    return pd.util.hash_pandas_object(castear(df[list(columnas)], ESQUEMA_BASE), index=False).to_numpy()
+
+
+class IndiceClientes:
+    """Clientes deduplicados por su clave natural, con versiones SCD tipo 2 de sus atributos.
+
+    Cada cliente (Codigo_Cliente) es la posición + 1 del hash de su clave en un
+    `IndiceClaves`; por cliente se guarda la versión vigente: hash de sus
+    atributos, ID_Cliente, número de versión y préstamo desde el que rige. Una
+    fila abre una versión nueva si su cliente no existía o si sus atributos
+    difieren de los de la versión vigente (la de la fila anterior del mismo
+    cliente). Los IDs de las versiones nuevas siguen el orden de las filas, así
+    que procesar el crudo entero, por bloques o incrementalmente da los mismos.
+    Con `registrar=True` guarda las versiones abiertas (`aperturas`), que el
+    modo paralelo re-asigna con las claves globales.
+    """
+
+    def __init__(self, claves=(), atributos=(), ids=(), versiones=(), desde=(), registrar=False):
+        self.codigos = IndiceClaves(np.asarray(claves, dtype=np.uint64))
+        self.atributos = np.asarray(atributos, dtype=np.uint64)
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.versiones = np.asarray(versiones, dtype=np.int64)
+        self.desde = np.asarray(desde, dtype=np.int64)
+        self._aperturas = [] if registrar else None
+
+    def __len__(self):
+        return len(self.codigos)
+
+    @property
+    def total_versiones(self):
+        """Versiones abiertas en total: el último ID_Cliente asignado es ID_CLIENTE_BASE + este número."""
+        return int(self.versiones.sum())
+
+    def asignar(self, claves, atributos, prestamos):
+        """Resuelve un lote de filas en orden: {columna: array} con ID_Cliente, Codigo_Cliente, Version y Prestamo_Desde.
+
+        `claves` y `atributos` son hashes por fila (`hash_filas`), `prestamos`
+        el ID_Prestamo de cada una. Las filas de un mismo cliente se agrupan con
+        un ordenamiento estable, así que cada una se compara con la anterior del
+        grupo (o con la versión vigente, la primera) sin recorrerlas en Python.
+        """
+        claves, atributos, prestamos = (np.asarray(a) for a in (claves, atributos, prestamos))
+        n_previos, n = len(self), len(claves)
+        self.codigos.agregar(claves)
+        codigo = self.codigos.buscar(claves)
+        nuevos = len(self) - n_previos
+        if nuevos:
+            self.atributos, self.ids, self.versiones, self.desde = (
+                np.append(a, np.zeros(nuevos, a.dtype)) for a in (self.atributos, self.ids, self.versiones, self.desde))
+        if n == 0:
+            vacio = np.zeros(0, dtype=np.int64)
+            return {'ID_Cliente': vacio, 'Codigo_Cliente': vacio, 'Version': vacio, 'Prestamo_Desde': vacio}
+
+        orden = np.argsort(codigo, kind='stable')
+        posicion = codigo[orden] - 1
+        atributo = atributos[orden]
+        primera = np.ones(n, dtype=bool)                # primera fila de cada cliente en el lote
+        primera[1:] = posicion[1:] != posicion[:-1]
+        anterior = np.empty_like(atributo)
+        anterior[1:] = atributo[:-1]
+        anterior[primera] = self.atributos[posicion[primera]]
+        abre = (atributo != anterior) | (primera & (self.versiones[posicion] == 0))
+
+        # Versión: la vigente más las abiertas en el lote hasta la fila, por cliente
+        abiertas = np.cumsum(abre)
+        version = self.versiones[posicion] + abiertas - (abiertas - abre)[np.flatnonzero(primera)][np.cumsum(primera) - 1]
+        # IDs nuevos en orden de fila; cada fila hereda los de la última versión abierta de su cliente
+        abre_fila = np.empty_like(abre)
+        abre_fila[orden] = abre
+        id_nuevo = (ID_CLIENTE_BASE + self.total_versiones + np.cumsum(abre_fila))[orden]
+        fuente = np.maximum.accumulate(np.where(abre | primera, np.arange(n), 0))
+        ids = np.where(abre, id_nuevo, self.ids[posicion])[fuente]
+        desde = np.where(abre, prestamos[orden], self.desde[posicion])[fuente]
+
+        ultima = np.append(primera[1:], True)
+        vigentes = posicion[ultima]
+        self.atributos[vigentes] = atributo[ultima]
+        self.ids[vigentes] = ids[ultima]
+        self.versiones[vigentes] = version[ultima]
+        self.desde[vigentes] = desde[ultima]
+        if self._aperturas is not None:
+            self._aperturas.append((claves[abre_fila], atributos[abre_fila], prestamos[abre_fila]))
+
+        resultado = {}
+        for columna, valores in (('ID_Cliente', ids), ('Codigo_Cliente', posicion + 1),
+                                 ('Version', version), ('Prestamo_Desde', desde)):
+            resultado[columna] = np.empty(n, dtype=np.int64)
+            resultado[columna][orden] = valores
+        return resultado
+
+    def aperturas(self):
+        """(claves, atributos, prestamos) de las versiones abiertas, en orden de ID_Cliente."""
+        partes = self._aperturas or [(np.zeros(0, np.uint64), np.zeros(0, np.uint64), np.zeros(0, np.int64))]
+        return tuple(np.concatenate(columna) for columna in zip(*partes))
+
+    def guardar(self, ruta):
+        """Persiste el índice en un `.npz` de forma atómica (temporal + rename)."""
+        tmp = f"{ruta}.tmp.npz"
+        np.savez(tmp, claves=self.codigos.claves, atributos=self.atributos, ids=self.ids,
+                 versiones=self.versiones, desde=self.desde)
+        os.replace(tmp, ruta)
+
+    @classmethod
+    def cargar(cls, ruta):
+        with np.load(ruta, allow_pickle=False) as datos:
+            return cls(**{nombre: datos[nombre] for nombre in datos.files})
+
+
+class ClientesPorPrestamo(IndiceClientes):
+    """Índice de clientes sin `CLAVE_CLIENTE`: cada préstamo es un cliente con una sola versión.
+
+    Da los mismos IDs que un `IndiceClientes` con la clave ID_Prestamo, pero
+    sin guardar nada por cliente: solo cuántos van.
+    """
+
+    def __init__(self, total=0, registrar=False):
+        self.total = int(total)
+        self._aperturas = [] if registrar else None
+
+    def __len__(self):
+        return self.total
+
+    @property
+    def total_versiones(self):
+        return self.total
+
+    def asignar(self, claves, atributos, prestamos):
+        prestamos = np.asarray(prestamos, dtype=np.int64)
+        codigo = self.total + np.arange(1, len(prestamos) + 1)
+        self.total += len(prestamos)
+        if self._aperturas is not None:
+            self._aperturas.append((np.asarray(claves), np.asarray(atributos), prestamos))
+        return {'ID_Cliente': ID_CLIENTE_BASE + codigo, 'Codigo_Cliente': codigo,
+                'Version': np.ones_like(codigo), 'Prestamo_Desde': prestamos}
+
+    def guardar(self, ruta):
+        tmp = f"{ruta}.tmp.npz"
+        np.savez(tmp, total=self.total)
+        os.replace(tmp, ruta)
+
+
+# Índice que usan los modos según haya o no clave de cliente configurada
+INDICE_CLIENTES = IndiceClientes if CLAVE_CLIENTE else ClientesPorPrestamo
+
+
+@instrumentar()
+def asignar_clientes(df, indice_clientes):
+    """Agrega ID_Cliente (versión vigente del cliente en cada fila), Codigo_Cliente, Version y Prestamo_Desde.
+
+    El cliente se identifica por `COLUMNAS_CLAVE_CLIENTE` y sus versiones por
+    `ATRIBUTOS_CLIENTE`. Las filas con Prestamo_Desde == ID_Prestamo abren una
+    versión: son las de Dim_Cliente (`construir_dim_cliente`).
+    """
+    return df.assign(**indice_clientes.asignar(hash_filas(df, COLUMNAS_CLAVE_CLIENTE),
+                                               hash_filas(df, ATRIBUTOS_CLIENTE), df['ID_Prestamo'].to_numpy()))
+
+
+class TablasEstrella(Mapping):
+    """Tablas del Star Schema como proyecciones perezosas de un único DataFrame base.
+
+    Fact_Prestamos, Dim_Cliente y Tabla_Completa no se guardan: cada acceso
+    proyecta sus columnas de `base` (vistas copy-on-write sobre los mismos
+    buffers) y la tabla solo existe mientras se la usa, p. ej. al exportarla.
+    Las tablas pequeñas o agregadas se guardan ya construidas.
+    """
+
+    def __init__(self, base, tablas):
+        self.base = base
+        self._tablas = dict(tablas)      # nombre → DataFrame o función(base) → DataFrame
+
+    def __getitem__(self, nombre):
+        tabla = self._tablas[nombre]
+        return tabla(self.base) if callable(tabla) else tabla
+
+    def __setitem__(self, nombre, tabla):
+        self._tablas[nombre] = tabla
+
+    def __iter__(self):
+        return iter(self._tablas)
+
+    def __len__(self):
+        return len(self._tablas)
+
+
+@instrumentar()
+def crear_star_schema(df, cuarentena=None, validacion=None):
+    """Divide el DataFrame limpio en esquema de estrella para Power BI.
+
+    No modifica `df`: los IDs se agregan a un DataFrame base que comparte las
+    columnas de `df`, tipado una sola vez según `ESQUEMA_BASE`. Las filas con
+    claves sin dimensión van a `cuarentena` (`validar_fact`); los clientes se
+    deduplican con un `IndiceClientes`. Devuelve `TablasEstrella` (las
+    tablas grandes son proyecciones de esa base).
+    """
+    print("\n⭐ Creando Star Schema...")
+    
+    # ── Asignar IDs ──
+    # Generar ID_Proposito basado en el propósito único
+    indice_proposito = IndiceClaves()
+    indice_proposito.agregar(df['Proposito'])
+    
+    base = asignar_ids(df, 0, indice_proposito)
+    base = validar_fact(base, claves_dimensiones(indice_proposito), 0, cuarentena, validacion)
+    # Clientes: uno por clave natural, una versión por cambio de atributos
+    indice_clientes = INDICE_CLIENTES()
+    base = castear(asignar_clientes(base, indice_clientes), ESQUEMA_BASE, 'Star Schema')
+    
+    tablas = TablasEstrella(base, {
+        # TABLA DE HECHOS
+        'Fact_Prestamos': construir_fact_prestamos,
+        # DIMENSIONES
+        'Dim_Cliente': construir_dim_cliente,
+        'Dim_Proposito': construir_dim_proposito(indice_proposito),
+        'Dim_Tiempo': construir_dim_tiempo(),   # Calendario completo (clave YYYYMMDD)
+        'Dim_Riesgo': construir_dim_riesgo(),   # Extra — para segmentación
+        # TABLA PLANA (Alternativa completa para análisis exploratorio)
+        'Tabla_Completa': construir_tabla_completa
+    })
+    
+    for nombre in ('Fact_Prestamos', 'Dim_Cliente'):
+        tabla = tablas[nombre]
+        print(f"   ✓ {nombre}: {tabla.shape[0]} filas, {tabla.shape[1]} columnas"
+              f" ({bytes_por_fila(tabla):.0f} B/fila)")
+    print(f"   ✓ Clientes únicos: {len(indice_clientes)} ({indice_clientes.total_versiones} versiones)")
+    print(f"   ✓ Dim_Proposito: {len(tablas['Dim_Proposito'])} propósitos únicos")
+    print(f"   ✓ Dim_Tiempo: {len(tablas['Dim_Tiempo'])} días de calendario")
+    print(f"   ✓ Dim_Riesgo: {len(tablas['Dim_Riesgo'])} categorías")
+    tabla = tablas['Tabla_Completa']
+    print(f"   ✓ Tabla_Completa: {tabla.shape[0]} filas, {tabla.shape[1]} columnas"
+          f" ({bytes_por_fila(tabla):.0f} B/fila)")
+    
+    return tablas
+
+
+def construir_fact_prestamos(df):
+    """Proyecta la tabla de hechos desde el DataFrame con IDs asignados."""
+    return aplicar_esquema(df[COLUMNAS_FACT].rename(columns=RENOMBRE_FACT), 'Fact_Prestamos')
+
+
+def construir_dim_cliente(df):
+    """Proyecta Dim_Cliente desde el DataFrame con IDs asignados: las filas que abren una versión."""
+    return aplicar_esquema(df.loc[df['Prestamo_Desde'] == df['ID_Prestamo'], COLUMNAS_DIM_CLIENTE], 'Dim_Cliente')
+
+
+def construir_tabla_completa(df):
+    """Proyecta la tabla plana desde el DataFrame con IDs asignados."""
+    return aplicar_esquema(df[COLUMNAS_TABLA_COMPLETA], 'Tabla_Completa')
+
+
+def construir_dim_proposito(indice, desde=0):
+    """Construye Dim_Proposito con las claves del índice a partir de la posición `desde`."""
+    propositos = [str(p) for p in indice.claves[desde:]]
+    return aplicar_esquema(pd.DataFrame({
+        'ID_Proposito': range(desde + 1, len(indice) + 1),
+        'Proposito': propositos,
+        'Categoria_Proposito': [categorizar_proposito(p) for p in propositos]
+    }), 'Dim_Proposito')
+
+
+def construir_dim_tiempo():
+    """Dim_Tiempo: el calendario completo de config (caché de etl_pipeline/calendario.py)."""
+    return aplicar_esquema(calendario(), 'Dim_Tiempo')
+
+
+def construir_dim_riesgo():
+    """Construye el catálogo fijo Good/Bad."""
+    return aplicar_esquema(pd.DataFrame({
+        'ID_Riesgo': range(1, len(INDICE_RIESGO) + 1),
+        'Estado_Riesgo': INDICE_RIESGO.claves,
+        'Descripcion': ['Crédito pagado correctamente', 'Crédito en mora / impago'],
+        'Etiqueta_ES': ['Bueno', 'Malo'],
+        'Color_HEX': ['#2ECC71', '#E74C3C']
+    }), 'Dim_Riesgo')
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PASO 4B: CUBO DE AGREGADOS (OLAP) PARA EL DASHBOARD
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Grano del cubo: una fila por combinación presente de estas claves
+CLAVES_CUBO = ['ID_Proposito', 'Anio', 'Trimestre', 'Mes', 'Rango_Edad', 'Categoria_Score', 'Estado_Riesgo']
+
+# Medidas: por cada columna de hechos se guarda la suma y la suma de cuadrados
+MEDIDAS_CUBO = {'Monto': 'Monto_Credito', 'Duracion': 'Duracion_Meses', 'Score': 'Score_Cliente'}
+
+ESQUEMAS['Cubo_Riesgo'] = {
+    'ID_Proposito': 'uint8', 'Anio': 'int16', 'Trimestre': 'uint8', 'Mes': 'uint8',
+    'Rango_Edad': TEXTO, 'Categoria_Score': TEXTO, 'Estado_Riesgo': TEXTO,
+    'Creditos': 'int64', 'Creditos_Malos': 'int64',
+    **{f'{medida}_{suma}': 'int64' for medida in MEDIDAS_CUBO for suma in ('Total', 'Cuadrados')}
+}
+
+ORDEN_CATEGORIAS_CUBO = {
+    'Rango_Edad': ETIQUETAS_EDAD,
+    'Categoria_Score': ETIQUETAS_SCORE,
+    'Estado_Riesgo': list(DECODE_RIESGO.values())
+}
+
+
+@instrumentar()
+def crear_cubo(df):
+    """Agrega el DataFrame con IDs asignados al grano del cubo (tabla Cubo_Riesgo)."""
+    print("\n🧊 Creando cubo de agregados...")
+    cubo = construir_cubo(df)
+    print(f"   ✓ Cubo_Riesgo: {len(cubo):,} celdas para {len(df):,} préstamos")
+    return cubo
+
+
+@instrumentar()
+def construir_cubo(df):
+    """Conteos, sumas y sumas de cuadrados por celda del cubo.
+
+    Todas las medidas son enteras y aditivas: dos cubos se combinan sumando
+    celda a celda (`combinar_cubos`), y de ellas salen promedios, tasas y
+    desvíos en Power BI. Las filas con claves nulas se conservan.
+    """
+    base = pd.DataFrame({
+        'ID_Proposito': df['ID_Proposito'],
+        'Anio': df['Anio'],
+        'Trimestre': df['Trimestre'],
+        'Mes': df['Mes'],
+        'Rango_Edad': df['Rango_Edad'],
+        'Categoria_Score': df['Categoria_Score'],
+        'Estado_Riesgo': df['Riesgo'],
+        'Creditos': np.ones(len(df), dtype=np.int64),
+        'Creditos_Malos': (df['Riesgo'] == 'Bad').to_numpy(np.int64)
+    })
+    for medida, columna in MEDIDAS_CUBO.items():
+        valores = df[columna].to_numpy(np.int64)
+        base[f'{medida}_Total'] = valores
+        base[f'{medida}_Cuadrados'] = valores * valores
+    return _agrupar_cubo(base)
+
+
+def combinar_cubos(*cubos):
+    """Suma celda a celda varios cubos (los None se ignoran)."""
+    cubos = [c for c in cubos if c is not None]
+    if not cubos:
+        return None
+    return _agrupar_cubo(pd.concat([_tipar_cubo(c) for c in cubos], ignore_index=True))
+
+
+def leer_cubo(ruta):
+    """Carga un Cubo_Riesgo exportado en CSV con sus categorías en orden."""
+    return _tipar_cubo(pd.read_csv(ruta, encoding='utf-8-sig'))
+
+
+def _tipar_cubo(cubo):
+    """Fija el orden de las categorías de las claves de texto (los valores extra van al final)."""
+    columnas = {}
+    for columna, orden in ORDEN_CATEGORIAS_CUBO.items():
+        serie = cubo[columna].astype('category')
+        extras = [c for c in serie.cat.categories if c not in orden]
+        columnas[columna] = serie.cat.set_categories(list(orden) + extras)
+    return cubo.assign(**columnas)
+
+
+def _agrupar_cubo(base):
+    cubo = (_tipar_cubo(base)
+            .groupby(CLAVES_CUBO, observed=True, dropna=False, sort=True)
+            .sum()
+            .reset_index())
+    return aplicar_esquema(cubo, 'Cubo_Riesgo')
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PASO 5: EXPORTACIÓN
+# ═══════════════════════════════════════════════════════════════════════════
+
+BOM_UTF8 = b'\xef\xbb\xbf'
+
+
+@functools.lru_cache(maxsize=None)
+def hay_pyarrow():
+    import importlib.util
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def linea_csv(valores):
+    """Una línea CSV (utf-8) con el mismo quoting que `to_csv`: el del módulo csv."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerow(valores)
+    return buffer.getvalue().encode('utf-8')
+
+
+def tabla_csv_arrow(df):
+    """pyarrow.Table que `pyarrow.csv` escribe byte a byte igual que `df.to_csv`; None si no hay garantía.
+
+    pandas solo pone comillas en los valores con coma, comillas o saltos de
+    línea y escribe los float enteros como '193.0'. Si ningún texto necesita
+    comillas, Arrow sin quoting más ese sufijo da la misma salida, formateada
+    en C++ y sin el GIL. Lo que pandas formatea distinto (bool, object, fechas
+    con hora, float no finitos o extremos) vuelve None y lo escribe pandas.
+    """
+    if df.shape[1] < 2:             # el csv de pandas cita el campo vacío de una fila de una columna
+        return None
+    for _, serie in df.items():
+        if serie.dtype.name == 'category':
+            categorias = serie.cat.categories
+            if categorias.dtype.kind in 'iu':
+                continue
+            if categorias.dtype.kind not in 'OU' and categorias.dtype.name not in ('str', 'string'):
+                return None
+            if categorias.astype(str).str.contains('[,"\r\n]').any():
+                return None
+        elif serie.dtype.kind == 'f':
+            valores = np.abs(serie.to_numpy()[~serie.isna().to_numpy()])
+            if len(valores) and (not np.isfinite(valores).all() or valores.max() >= 1e16
+                                 or ((valores > 0) & (valores < 1e-4)).any()):
+                return None
+        elif serie.dtype.kind == 'M':
+            if serie.dt.tz is not None or (serie.dropna() != serie.dropna().dt.normalize()).any():
+                return None
+        elif serie.dtype.kind not in 'iu':
+            return None
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    columnas = []
+    for columna in tabla.columns:
+        if pa.types.is_timestamp(columna.type):
+            columna = columna.cast(pa.date32())
+        elif pa.types.is_floating(columna.type):
+            texto = pc.cast(columna, pa.string())
+            columna = pc.if_else(pc.match_substring_regex(texto, r'^-?\d+$'),
+                                 pc.binary_join_element_wise(texto, '.0', ''), texto)
+        columnas.append(columna)
+    return pa.table(columnas, names=tabla.column_names)
+
+
+class EscritorCSV:
+    """Escritor incremental de CSV (utf-8-sig, encabezado solo en el primer bloque).
+
+    Con `anexar=True` agrega filas al final de un archivo existente (sin repetir
+    el encabezado ni el BOM). Con pyarrow instalado, los bloques que admite
+    `tabla_csv_arrow` se formatean con `pyarrow.csv` (misma salida que pandas).
+    """
+    extension = 'csv'
+
+    def __init__(self, ruta, anexar=False, **opciones):
+        self.ruta = ruta
+        if not anexar:
+            open(ruta, 'wb').close()
+        # O_APPEND: pandas (por este handle) y Arrow (handle nativo) escriben siempre al final
+        self._archivo = open(ruta, 'ab')
+        self._encabezado = os.path.getsize(ruta) == 0
+
+    def _escribir_encabezado(self, linea):
+        if self._encabezado:
+            self._archivo.write(BOM_UTF8 + linea.removeprefix(BOM_UTF8))
+            self._encabezado = False
+
+    def escribir(self, df):
+        tabla = tabla_csv_arrow(df) if hay_pyarrow() else None
+        self._escribir_encabezado(linea_csv(df.columns))
+        if tabla is None:
+            df.to_csv(self._archivo, index=False, header=False, encoding='utf-8')
+            return
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        self._archivo.flush()
+        with pa.OSFile(self.ruta, 'a') as destino:
+            pa_csv.write_csv(tabla, destino, pa_csv.WriteOptions(include_header=False, quoting_style='none'))
+
+    def copiar(self, ruta):
+        """Anexa una parte escrita por otro escritor del mismo formato (modo paralelo)."""
+        if not os.path.exists(ruta):
+            return
+        with open(ruta, 'rb') as parte:
+            encabezado = parte.readline()
+            if encabezado:
+                self._escribir_encabezado(encabezado)
+            shutil.copyfileobj(parte, self._archivo, 1 << 20)
+
+    def cerrar(self):
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def a_tabla_arrow(df, schema=None):
+    """Convierte un DataFrame a pyarrow.Table con tipos listos para Power BI.
+
+    Las columnas categóricas quedan dictionary-encoded y las fechas como date32.
+    Si se pasa `schema` (bloques siguientes de un mismo archivo), se fuerza ese.
+    """
+    import pyarrow as pa
+
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    if schema is None:
+        schema = pa.schema(
+            [pa.field(f.name, pa.date32()) if pa.types.is_timestamp(f.type) else f
+             for f in tabla.schema],
+            metadata=tabla.schema.metadata
+        )
+    return tabla.cast(schema)
+
+
+# Claves crecientes (1, 2, 3, ...; con huecos si hubo filas en cuarentena): en Parquet van
+# con delta encoding, no con diccionario. En los hechos ID_Cliente se repite, pero
+# los clientes nuevos llegan con IDs crecientes y los deltas siguen siendo chicos.
+CLAVES_SECUENCIALES = ('ID_Prestamo', 'ID_Cliente', 'Prestamo_Desde')
+
+
+class EscritorParquet(EscritorCSV):
+    """Escritor incremental de Parquet (pyarrow) con compresión y row groups configurables."""
+    extension = 'parquet'
+
+    def __init__(self, ruta, compresion=None, row_group_size=None, **opciones):
+        import pyarrow  # noqa: F401 — falla temprano si falta pyarrow
+        self.ruta = ruta
+        self._compresion = compresion
+        self._row_group_size = row_group_size
+        self._schema = None
+        self._writer = None
+
+    def escribir(self, df):
+        self._agregar(a_tabla_arrow(df, self._schema))
+
+    def copiar(self, ruta):
+        """Anexa una parte escrita por otro escritor del mismo formato (modo paralelo)."""
+        if not os.path.exists(ruta):
+            return
+        for tabla in self._leer_parte(ruta):
+            self._agregar(tabla if self._schema is None else tabla.cast(self._schema))
+
+    def _agregar(self, tabla):
+        if self._writer is None:
+            self._schema = tabla.schema
+            self._writer = self._abrir(tabla.schema)
+        self._escribir_tabla(tabla)
+
+    def _abrir(self, schema):
+        import pyarrow.parquet as pq
+        secuenciales = [c for c in schema.names if c in CLAVES_SECUENCIALES]
+        return pq.ParquetWriter(self.ruta, schema, compression=self._compresion or 'snappy',
+                                use_dictionary=[c for c in schema.names if c not in secuenciales],
+                                column_encoding={c: 'DELTA_BINARY_PACKED' for c in secuenciales} or None)
+
+    def _leer_parte(self, ruta):
+        import pyarrow.parquet as pq
+        parte = pq.ParquetFile(ruta)
+        for i in range(parte.num_row_groups):
+            yield parte.read_row_group(i)
+
+    def _escribir_tabla(self, tabla):
+        self._writer.write_table(tabla, row_group_size=self._row_group_size)
+
+    def cerrar(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class EscritorFeather(EscritorParquet):
+    """Escritor incremental de Arrow IPC / Feather v2.
+
+    El formato de archivo IPC no admite reemplazar diccionarios entre bloques:
+    las categóricas deben tener las mismas categorías en todos los bloques
+    (lo garantizan `recodificar` y los `pd.cut` con etiquetas fijas).
+    """
+    extension = 'feather'
+
+    def _abrir(self, schema):
+        import pyarrow as pa
+        opciones = pa.ipc.IpcWriteOptions(compression=self._compresion)
+        return pa.ipc.new_file(self.ruta, schema, options=opciones)
+
+    def _escribir_tabla(self, tabla):
+        self._writer.write_table(tabla, max_chunksize=self._row_group_size)
+
+    def _leer_parte(self, ruta):
+        import pyarrow as pa
+        with pa.memory_map(ruta) as origen:
+            parte = pa.ipc.open_file(origen)
+            for i in range(parte.num_record_batches):
+                yield pa.Table.from_batches([parte.get_batch(i)])
+
+
+ESCRITORES = {
+    'csv': EscritorCSV,
+    'parquet': EscritorParquet,
+    'feather': EscritorFeather
+}
+
+
+def abrir_escritor(nombre, formato='csv', directorio=None, **opciones):
+    """Abre el escritor incremental de la tabla `nombre` en el formato pedido."""
+    if formato not in ESCRITORES:
+        raise ValueError(f"Formato no soportado: {formato} (opciones: {', '.join(ESCRITORES)})")
+    clase = ESCRITORES[formato]
+    directorio = directorio or PROCESSED_DIR
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, f"{nombre}.{clase.extension}")
+    if os.path.exists(ruta) and os.stat(ruta).st_nlink > 1:
+        # Hard link a una versión publicada: se escribe sobre un inodo propio, la versión no se toca
+        if opciones.get('anexar'):
+            shutil.copyfile(ruta, f"{ruta}.tmp")
+            os.replace(f"{ruta}.tmp", ruta)
+        else:
+            os.remove(ruta)
+    return clase(ruta, **opciones)
+
+
+# Publicación atómica de las salidas de todos los modos: versiones/<versión>/ + puntero `actual`
+DIR_VERSIONES = "versiones"
+PUNTERO_ACTUAL = "actual"
+NOMBRE_MANIFIESTO_EXPORTACION = "manifiesto.json"
+VERSIONES_CONSERVADAS = 3
+
+
+def _exportar_tabla(nombre, df, formato, directorio, opciones):
+    """Escribe una tabla en `directorio` y devuelve su entrada del manifiesto (un hilo del pool)."""
+    with REGISTRO.etapa(f"exportar.{nombre}", len(df)), \
+            abrir_escritor(nombre, formato, directorio, **opciones) as escritor:
+        escritor.escribir(df)
+    with open(escritor.ruta, 'rb') as f:
+        os.fsync(f.fileno())
+    return {'archivo': os.path.basename(escritor.ruta), 'filas': len(df), 'columnas': df.shape[1],
+            'bytes': os.path.getsize(escritor.ruta), 'sha256': sha256_archivo(escritor.ruta)}
+
+
+def entrada_manifiesto(ruta):
+    """Entrada del manifiesto de un archivo ya escrito por bloques: filas y columnas se leen del archivo."""
+    with open(ruta, 'rb') as f:
+        os.fsync(f.fileno())
+        if ruta.endswith('.csv'):
+            encabezado = f.readline()
+            columnas = len(next(csv.reader([encabezado.decode('utf-8-sig')]), []))
+            filas = sum(bloque.count(b'\n') for bloque in iter(lambda: f.read(BLOQUE_DESCARGA), b''))
+        elif ruta.endswith('.parquet'):
+            import pyarrow.parquet as pq
+            metadatos = pq.read_metadata(f)
+            filas, columnas = metadatos.num_rows, metadatos.num_columns
+        else:
+            import pyarrow as pa
+            lector = pa.ipc.open_file(f)
+            filas = sum(lector.get_batch(i).num_rows for i in range(lector.num_record_batches))
+            columnas = len(lector.schema)
+    return {'archivo': os.path.basename(ruta), 'filas': filas, 'columnas': columnas,
+            'bytes': os.path.getsize(ruta), 'sha256': sha256_archivo(ruta)}
+
+
+def reemplazar_archivo(origen, destino, enlazar=False):
+    """Reemplaza `destino` con rename: nunca queda a medio escribir. Con `enlazar`, `origen` se conserva."""
+    if not enlazar:
+        os.replace(origen, destino)
+        return
+    temporal = f"{destino}.tmp"
+    if os.path.exists(temporal):
+        os.remove(temporal)
+    try:
+        os.link(origen, temporal)
+    except OSError:                 # sistemas de archivos sin hard links
+        shutil.copyfile(origen, temporal)
+    os.replace(temporal, destino)
+
+
+def version_actual(directorio=None):
+    """Versión a la que apunta `actual` en `directorio` (None si nunca se publicó)."""
+    puntero = os.path.join(directorio or PROCESSED_DIR, PUNTERO_ACTUAL)
+    if os.path.islink(puntero):
+        return os.path.basename(os.readlink(puntero))
+    if os.path.exists(f"{puntero}.txt"):
+        with open(f"{puntero}.txt", encoding='utf-8') as f:
+            return f.read().strip()
+    return None
+
+
+def apuntar_version(directorio, version):
+    """Mueve el puntero `actual` a la versión con un rename (symlink; sin symlinks, actual.txt)."""
+    puntero = os.path.join(directorio, PUNTERO_ACTUAL)
+    temporal = f"{puntero}.tmp"
+    if os.path.lexists(temporal):
+        os.remove(temporal)
+    try:
+        os.symlink(os.path.join(DIR_VERSIONES, version), temporal, target_is_directory=True)
+        os.replace(temporal, puntero)
+    except (OSError, NotImplementedError):
+        with open(temporal, 'w', encoding='utf-8') as f:
+            f.write(version + '\n')
+        os.replace(temporal, f"{puntero}.txt")
+
+
+def podar_versiones(directorio, conservar=VERSIONES_CONSERVADAS):
+    """Borra las versiones publicadas más viejas (nunca la actual)."""
+    raiz = os.path.join(directorio, DIR_VERSIONES)
+    versiones = sorted(v for v in os.listdir(raiz) if not v.startswith('.'))
+    actual = version_actual(directorio)
+    for version in versiones[:-conservar]:
+        if version != actual:
+            shutil.rmtree(os.path.join(raiz, version), ignore_errors=True)
+
+
+def directorio_actual(directorio=None):
+    """Directorio de la versión publicada a la que apunta `actual` (None si nunca se publicó)."""
+    directorio = directorio or PROCESSED_DIR
+    version = version_actual(directorio)
+    return os.path.join(directorio, DIR_VERSIONES, version) if version else None
+
+
+class Publicacion:
+    """Un conjunto de tablas que se publica de una vez: todos los modos escriben sus salidas así.
+
+    Los escritores escriben en `self.directorio`, un temporal dentro de
+    `versiones/`. Al salir del `with` sin error el temporal se renombra a
+    `versiones/<versión>` con su `manifiesto.json` (filas, columnas, bytes y
+    SHA-256 por archivo) y `actual` pasa a apuntarlo: quien lea `actual/` ve
+    siempre un conjunto completo. Con un error, el temporal se borra y
+    `actual` no cambia. Con `base` (modo incremental) el temporal arranca con
+    hard links a los archivos de esa versión; `abrir_escritor` copia los que
+    se anexan antes de escribirlos, así la versión base no se toca.
+
+    Los archivos de `directorio` (rutas de siempre de Power BI) se reemplazan
+    después con rename por hard links a la versión: cada uno queda siempre
+    completo, pero se reemplazan uno a uno, así que un lector que los abra
+    durante la publicación puede mezclar tablas de dos corridas.
+    """
+
+    def __init__(self, directorio=None, base=None):
+        self.raiz = directorio or PROCESSED_DIR
+        self.base = base
+        self.version = datetime.now().strftime('%Y%m%dT%H%M%S.%f')
+        self.directorio = os.path.join(self.raiz, DIR_VERSIONES, f".{self.version}.tmp")
+        self.tablas = {}                # nombre → entrada del manifiesto (las que ya se conocen)
+        self.manifiesto = None
+
+    def __enter__(self):
+        os.makedirs(self.directorio)
+        if self.base:
+            for archivo in os.listdir(self.base):
+                if archivo != NOMBRE_MANIFIESTO_EXPORTACION:
+                    reemplazar_archivo(os.path.join(self.base, archivo), os.path.join(self.directorio, archivo),
+                                       enlazar=True)
+        return self
+
+    def __exit__(self, tipo, *exc):
+        try:
+            if tipo is None:
+                self.publicar()
+        finally:
+            shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def publicar(self):
+        """Arma el manifiesto, renombra el temporal a su versión y mueve `actual`."""
+        for archivo in sorted(os.listdir(self.directorio)):
+            nombre = os.path.splitext(archivo)[0]
+            if nombre not in self.tablas:
+                self.tablas[nombre] = entrada_manifiesto(os.path.join(self.directorio, archivo))
+        self.manifiesto = {'version': self.version, 'fecha': datetime.now().isoformat(timespec='seconds'),
+                           'tablas': dict(sorted(self.tablas.items()))}
+        guardar_estado(self.manifiesto, os.path.join(self.directorio, NOMBRE_MANIFIESTO_EXPORTACION))
+        origen = os.path.join(self.raiz, DIR_VERSIONES, self.version)
+        os.rename(self.directorio, origen)
+        for entrada in self.tablas.values():
+            reemplazar_archivo(os.path.join(origen, entrada['archivo']),
+                               os.path.join(self.raiz, entrada['archivo']), enlazar=True)
+        apuntar_version(self.raiz, self.version)
+        podar_versiones(self.raiz)
+        print(f"\n📁 Archivos exportados en: {self.raiz} (versión {self.version}, también en {PUNTERO_ACTUAL}/)")
+
+
+@instrumentar()
+def exportar_tablas(tablas, formato='csv', directorio=None, workers=None, publicacion=None, **opciones):
+    """Exporta todas las tablas para Power BI (CSV por defecto, Parquet o Feather).
+
+    Las tablas se escriben a la vez en un pool de hilos (pyarrow formatea sin
+    el GIL) en el directorio temporal de una `Publicacion`. Sin `publicacion`
+    se abre una propia y el conjunto se publica al terminar; con una (modos
+    por bloques), las tablas se suman a las que ya escribieron sus escritores
+    y se publican todas juntas al cerrarla.
+
+    `opciones` se pasa al escritor: `compresion` y `row_group_size` para los
+    formatos columnares. Devuelve el manifiesto (None si la publicación es
+    de quien llama y todavía no se cerró).
+    """
+    print(f"\n💾 Exportando tablas a {formato.upper()}...")
+    with ExitStack() as stack:
+        if publicacion is None:
+            publicacion = stack.enter_context(Publicacion(directorio))
+        with ThreadPoolExecutor(workers or min(len(tablas), os.cpu_count() or 1)) as pool:
+            futuros = {nombre: pool.submit(_exportar_tabla, nombre, df, formato, publicacion.directorio, opciones)
+                       for nombre, df in tablas.items()}
+            for nombre, futuro in futuros.items():
+                publicacion.tablas[nombre] = entrada = futuro.result()
+                print(f"   ✓ {entrada['archivo']} → {entrada['filas']} filas, {entrada['columnas']} cols "
+                      f"({entrada['bytes'] / 1024:.1f} KB)")
+    return publicacion.manifiesto
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PASO 5B: CARGA A BASE DE DATOS EMBEBIDA (SQLite / DuckDB)
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+# Orden de carga: dimensiones antes que las tablas que las referencian.
+# Tabla_Completa no se carga: en la base se obtiene con JOINs del Star Schema.
+TABLAS_BD = ('Dim_Proposito', 'Dim_Tiempo', 'Dim_Riesgo', 'Dim_Cliente', 'Fact_Prestamos', 'Cubo_Riesgo')
+
+CLAVES_PRIMARIAS = {
+    'Dim_Proposito': 'ID_Proposito',
+    'Dim_Tiempo': 'ID_Tiempo',
+    'Dim_Riesgo': 'ID_Riesgo',
+    'Dim_Cliente': 'ID_Cliente',
+    'Fact_Prestamos': 'ID_Prestamo'
+}
+CLAVES_FORANEAS = {
+    'Fact_Prestamos': {'ID_Cliente': 'Dim_Cliente', 'ID_Proposito': 'Dim_Proposito',
+                       'ID_Tiempo': 'Dim_Tiempo', 'ID_Riesgo': 'Dim_Riesgo'},
+    'Cubo_Riesgo': {'ID_Proposito': 'Dim_Proposito'}
+}
+# Índices secundarios (se crean después de la carga). Dim_Cliente(Codigo_Cliente)
+# resuelve las versiones de un cliente.
+INDICES_BD = {
+    'Fact_Prestamos': [('ID_Cliente',), ('ID_Proposito',), ('ID_Tiempo',), ('ID_Riesgo',)],
+    'Dim_Cliente': [('Codigo_Cliente',)],
+    'Dim_Riesgo': [('Estado_Riesgo',)],
+    'Cubo_Riesgo': [('ID_Proposito',), ('Estado_Riesgo',)]
+}
+# Los float32 se redondean al pasar a DOUBLE para no guardar 194.8300018...
+DECIMALES_BD = {'Cuota_Mensual': 2}
+
+# Una fila con la versión de los datos: cambia en cada carga (reconstrucción o
+# anexo) y es la clave con la que los reportes invalidan sus resúmenes y su caché
+TABLA_VERSION = 'Version_Datos'
+
+# Filas por lote: executemany arma tuplas de Python (lotes chicos); DuckDB
+# inserta bloques Arrow y rinde más con lotes grandes
+LOTES_BD = {'sqlite': 100_000, 'duckdb': 1_000_000}
+
+
+def tipo_sql(tipo):
+    """Tipo SQL (válido en SQLite y DuckDB) de un tipo de `ESQUEMAS`."""
+    if tipo == TEXTO:
+        return 'TEXT'
+    tipo = np.dtype(tipo)
+    if tipo.kind == 'M':
+        return 'DATE'
+    if tipo.kind == 'f':
+        return 'DOUBLE'
+    return 'BIGINT' if tipo.itemsize == 8 else 'INTEGER'
+
+
+def ddl_tabla(nombre, foraneas=True):
+    """CREATE TABLE de una tabla del Star Schema con su clave primaria (y sus claves foráneas)."""
+    columnas = [
+        f"{columna} {tipo_sql(tipo)}" + (" PRIMARY KEY" if columna == CLAVES_PRIMARIAS.get(nombre) else "")
+        for columna, tipo in ESQUEMAS[nombre].items()
+    ]
+    if foraneas:
+        columnas += [f"FOREIGN KEY ({columna}) REFERENCES {dimension}({columna})"
+                     for columna, dimension in CLAVES_FORANEAS.get(nombre, {}).items()]
+    return f"CREATE TABLE IF NOT EXISTS {nombre} (\n    " + ",\n    ".join(columnas) + "\n)"
+
+
+def ddl_indices(nombre):
+    """CREATE INDEX de los índices secundarios de una tabla."""
+    return [f"CREATE INDEX IF NOT EXISTS ix_{nombre}_{'_'.join(columnas)} ON {nombre} ({', '.join(columnas)})"
+            for columnas in INDICES_BD.get(nombre, [])]
+
+
+def offset_posterior(ruta, ultima, bloque=1 << 16):
+    """Offset de la primera fila de un CSV cuya primera columna (clave creciente) supera `ultima`.
+
+    Búsqueda binaria sobre los bytes del archivo: cada paso salta al inicio
+    de la línea siguiente y lee solo su clave. Los últimos `bloque` bytes
+    del intervalo se recorren línea por línea.
+    """
+    with open(ruta, 'rb') as f:
+        f.readline()                            # encabezado
+        bajo, alto = f.tell(), f.seek(0, os.SEEK_END)
+        # Las filas antes de `bajo` tienen clave <= ultima; la que empieza en `alto` (o el fin), mayor
+        while alto - bajo > bloque:
+            f.seek((bajo + alto) // 2 - 1)
+            f.readline()
+            inicio = f.tell()
+            if inicio >= alto:
+                break
+            if int(f.readline().split(b',', 1)[0]) > ultima:
+                alto = inicio
+            else:
+                bajo = f.tell()
+        f.seek(bajo)
+        while bajo < alto:
+            linea = f.readline()
+            if int(linea.split(b',', 1)[0]) > ultima:
+                break
+            bajo += len(linea)
+    return bajo
+
+
+def bloques_tabla(nombre, tablas=None, formato='csv', directorio=None, lote=LOTES_BD['sqlite'], posterior_a=0):
+    """Bloques de hasta `lote` filas de una tabla: de `tablas` (en memoria) o de su archivo exportado.
+
+    Con `posterior_a`, un CSV se lee desde la primera fila con clave primaria
+    mayor (las tablas con clave se exportan en orden creciente de clave):
+    anexar a la base cuesta lo que las filas nuevas, no lo que la tabla.
+    """
+    if tablas is not None:
+        df = tablas[nombre]
+        for inicio in range(0, len(df), lote):
+            yield df.iloc[inicio:inicio + lote]
+        return
+
+    ruta = os.path.join(directorio or PROCESSED_DIR, f"{nombre}.{ESCRITORES[formato].extension}")
+    if formato == 'csv':
+        esquema = ESQUEMAS[nombre]
+        fechas = [c for c, t in esquema.items() if t.startswith('datetime')]
+        tipos = {c: t for c, t in esquema.items() if c not in fechas}
+        if not (posterior_a and next(iter(esquema)) == CLAVES_PRIMARIAS.get(nombre)):
+            yield from pd.read_csv(ruta, encoding='utf-8-sig', dtype=tipos, parse_dates=fechas, chunksize=lote)
+            return
+        offset = offset_posterior(ruta, posterior_a)
+        if offset == os.path.getsize(ruta):
+            return
+        with open(ruta, 'rb') as f:
+            f.seek(offset)
+            yield from pd.read_csv(f, encoding='utf-8', header=None, names=list(esquema), dtype=tipos,
+                                   parse_dates=fechas, chunksize=lote)
+    elif formato == 'parquet':
+        import pyarrow.parquet as pq
+        for lote_arrow in pq.ParquetFile(ruta).iter_batches(lote):
+            yield lote_arrow.to_pandas()
+    else:
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+        lector = ipc.open_file(pa.memory_map(ruta))
+        for i in range(lector.num_record_batches):
+            yield lector.get_batch(i).to_pandas()
+
+
+def verificar_claves_foraneas(conexion):
+    """Falla si alguna clave foránea no existe en su dimensión (un anti-join por relación)."""
+    for tabla, foraneas in CLAVES_FORANEAS.items():
+        for columna, dimension in foraneas.items():
+            huerfanas, = conexion.execute(
+                f"SELECT COUNT(*) FROM {tabla} t LEFT JOIN {dimension} d ON t.{columna} = d.{columna} "
+                f"WHERE d.{columna} IS NULL AND t.{columna} IS NOT NULL").fetchone()
+            if huerfanas:
+                raise ValueError(f"{tabla}.{columna}: {huerfanas} filas sin {dimension}")
+
+
+def bloques_nuevos(conexion, nombre, leer):
+    """Bloques de `leer(posterior_a)` con clave primaria mayor a la máxima ya cargada.
+
+    Las tablas se anexan con IDs crecientes (modo incremental), así que una
+    carga interrumpida se retoma sin duplicar filas. El cubo no tiene clave:
+    se vacía y se carga entero.
+    """
+    clave = CLAVES_PRIMARIAS.get(nombre)
+    if clave is None:
+        conexion.execute(f"DELETE FROM {nombre}")
+        yield from leer()
+        return
+    ultima, = conexion.execute(f"SELECT COALESCE(MAX({clave}), 0) FROM {nombre}").fetchone()
+    for bloque in leer(posterior_a=ultima):
+        if ultima:
+            bloque = bloque[bloque[clave].to_numpy() > ultima]
+        if len(bloque):
+            yield bloque
+
+
+def registrar_version(conexion):
+    """Reemplaza la fila de `TABLA_VERSION` con una versión nueva (marca de tiempo en ns)."""
+    conexion.execute(f"CREATE TABLE IF NOT EXISTS {TABLA_VERSION} (Version BIGINT, Fecha TEXT)")
+    conexion.execute(f"DELETE FROM {TABLA_VERSION}")
+    conexion.execute(f"INSERT INTO {TABLA_VERSION} VALUES (?, ?)",
+                     (time.time_ns(), datetime.now().isoformat(timespec='seconds')))
+
+
+def redondear_decimales(df):
+    """Columnas de `DECIMALES_BD` como float64 redondeado (el resto sin copiar)."""
+    return df.assign(**{columna: df[columna].astype('float64').round(decimales)
+                        for columna, decimales in DECIMALES_BD.items() if columna in df.columns})
+
+
+def filas_sql(df):
+    """Filas de un bloque como tuplas de Python (categorías → texto, fechas → 'AAAA-MM-DD', nulos → None)."""
+    columnas = []
+    for columna in df.columns:
+        serie = df[columna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            # El None final atiende el código -1 (nulo)
+            valores = np.append(serie.cat.categories.to_numpy(dtype=object), None)[serie.cat.codes.to_numpy()]
+        elif serie.dtype.kind == 'M':
+            valores = np.datetime_as_string(serie.to_numpy(), unit='D').astype(object)
+            valores[serie.isna().to_numpy()] = None
+        elif serie.dtype.kind == 'f':
+            valores = serie.to_numpy()
+            valores = np.where(np.isnan(valores), None, valores)
+        else:
+            valores = serie.to_numpy()
+        columnas.append(valores.tolist())
+    return zip(*columnas)
+
+
+def _cargar_sqlite(ruta, bloques_por_tabla, anexar=False):
+    """Carga con `executemany` por lotes, una transacción por lote; índices al final.
+
+    SQLite no valida las FOREIGN KEY declaradas salvo con `PRAGMA foreign_keys`;
+    se verifican una sola vez al terminar la carga.
+    """
+    import sqlite3
+
+    conexion = sqlite3.connect(ruta)
+    try:
+        if not anexar:
+            # La base se arma desde cero en un archivo temporal: sin journal ni fsync por lote
+            conexion.execute("PRAGMA journal_mode = OFF")
+            conexion.execute("PRAGMA synchronous = OFF")
+        for nombre, leer in bloques_por_tabla:
+            conexion.execute(ddl_tabla(nombre))
+            bloques = bloques_nuevos(conexion, nombre, leer)
+            insertar = f"INSERT INTO {nombre} VALUES ({', '.join('?' * len(ESQUEMAS[nombre]))})"
+            filas = 0
+            with REGISTRO.etapa(f"cargar_bd.{nombre}") as medicion:
+                for bloque in bloques:
+                    with conexion:
+                        conexion.executemany(insertar, filas_sql(redondear_decimales(bloque)))
+                    filas += len(bloque)
+                medicion['filas_salida'] = filas
+            for ddl in ddl_indices(nombre):
+                conexion.execute(ddl)
+            print(f"   ✓ {nombre}: {filas:,} filas")
+        verificar_claves_foraneas(conexion)
+        registrar_version(conexion)
+        conexion.execute("ANALYZE")
+        conexion.commit()
+    finally:
+        conexion.close()
+
+
+def _cargar_duckdb(ruta, bloques_por_tabla, anexar=False):
+    """Carga vía Arrow (INSERT ... SELECT sobre cada bloque registrado); índices al final.
+
+    DuckDB valida cada FOREIGN KEY fila a fila al insertar (la carga de los
+    hechos es ~8x más lenta), así que las relaciones se verifican una sola vez
+    al final con `verificar_claves_foraneas` en lugar de declararse.
+    """
+    import duckdb
+
+    conexion = duckdb.connect(ruta)
+    try:
+        for nombre, leer in bloques_por_tabla:
+            conexion.execute(ddl_tabla(nombre, foraneas=False))
+            bloques = bloques_nuevos(conexion, nombre, leer)
+            filas = 0
+            with REGISTRO.etapa(f"cargar_bd.{nombre}") as medicion:
+                for bloque in bloques:
+                    conexion.register('bloque', a_tabla_arrow(redondear_decimales(bloque)))
+                    conexion.execute(f"INSERT INTO {nombre} SELECT * FROM bloque")
+                    conexion.unregister('bloque')
+                    filas += len(bloque)
+                medicion['filas_salida'] = filas
+            for ddl in ddl_indices(nombre):
+                conexion.execute(ddl)
+            print(f"   ✓ {nombre}: {filas:,} filas")
+        verificar_claves_foraneas(conexion)
+        registrar_version(conexion)
+        conexion.execute("CHECKPOINT")
+    finally:
+        conexion.close()
+
+
+@instrumentar()
+def cargar_base_datos(ruta=RUTA_BASE_DATOS, tablas=None, formato='csv', directorio=None, lote=None,
+                      anexar=False):
+    """Carga el Star Schema y el cubo en una base embebida: DuckDB si `ruta` termina en .duckdb, si no SQLite.
+
+    Las tablas salen de `tablas` (modo en memoria) o de los archivos ya
+    exportados en `formato` (streaming, paralelo, incremental). La base se
+    arma en un archivo temporal y reemplaza a la anterior al terminar; con
+    `anexar` (y la base ya creada) solo se insertan las filas nuevas sobre
+    la base existente.
+    """
+    motor = 'duckdb' if ruta.endswith('.duckdb') else 'sqlite'
+    lote = lote or LOTES_BD[motor]
+    anexar = anexar and os.path.exists(ruta)
+    print(f"\n🗄️  {'Anexando a' if anexar else 'Cargando'} base de datos {motor.upper()}: {ruta}")
+    destino = ruta if anexar else ruta + '.tmp'
+    if not anexar:
+        for resto in (destino, destino + '.wal'):
+            if os.path.exists(resto):
+                os.remove(resto)
+
+    bloques_por_tabla = ((nombre, functools.partial(bloques_tabla, nombre, tablas, formato, directorio, lote))
+                         for nombre in TABLAS_BD)
+    (_cargar_duckdb if motor == 'duckdb' else _cargar_sqlite)(destino, bloques_por_tabla, anexar)
+    if not anexar:
+        os.replace(destino, ruta)
+    print(f"   ✓ {ruta} ({os.path.getsize(ruta) / 1024 ** 2:,.1f} MB)")
+    return ruta
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PASO 6: REPORTE DE CALIDAD DE DATOS
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Dimensiones con tasa de morosidad desagregada en los reportes
+DIMENSIONES_METRICAS = ('Proposito', 'Rango_Edad')
+SIN_DATO = '(sin dato)'
+
+
+class MetricasRiesgo:
+    """KPIs de riesgo como sumas aditivas: se combinan entre bloques con `+`.
+
+    Guarda totales (préstamos, malos, monto, monto en riesgo, suma de score) y,
+    por cada dimensión, préstamos y malos por categoría. Las tasas y promedios
+    se derivan al consultarlas.
+    """
+
+    def __init__(self, total=0, bad=0, monto=0, monto_bad=0, score=0, dimensiones=None):
+        self.total = total
+        self.bad = bad
+        self.monto = monto
+        self.monto_bad = monto_bad
+        self.score = score
+        self.dimensiones = dimensiones or {}     # dimensión → DataFrame (Total, Bad) por categoría
+
+    @property
+    def good(self):
+        return self.total - self.bad
+
+    @property
+    def tasa_morosidad(self):
+        return self.bad / self.total if self.total else 0.0
+
+    @property
+    def monto_promedio(self):
+        return self.monto / self.total if self.total else 0.0
+
+    @property
+    def score_promedio(self):
+        return self.score / self.total if self.total else 0.0
+
+    def tasas(self, dimension):
+        """Préstamos, malos y tasa de morosidad (%) por categoría, de mayor a menor tasa."""
+        tabla = self.dimensiones[dimension]
+        return (tabla.assign(Tasa=(tabla['Bad'] / tabla['Total'] * 100).round(1))
+                .sort_values('Tasa', ascending=False, kind='stable'))
+
+    def __add__(self, otro):
+        dimensiones = dict(self.dimensiones)
+        for nombre, tabla in otro.dimensiones.items():
+            if nombre in dimensiones:
+                tabla = dimensiones[nombre].add(tabla, fill_value=0).astype(np.int64)
+            dimensiones[nombre] = tabla
+        return MetricasRiesgo(self.total + otro.total, self.bad + otro.bad, self.monto + otro.monto,
+                              self.monto_bad + otro.monto_bad, self.score + otro.score, dimensiones)
+
+    def a_dict(self):
+        return {
+            'total': self.total,
+            'good': self.good,
+            'bad': self.bad,
+            'tasa_morosidad': self.tasa_morosidad,
+            'monto_total': self.monto,
+            'monto_riesgo': self.monto_bad,
+            'monto_promedio': self.monto_promedio,
+            'score_promedio': self.score_promedio,
+            'por_dimension': {
+                nombre: [{'categoria': str(cat), 'total': int(fila.Total), 'bad': int(fila.Bad),
+                          'tasa': float(fila.Tasa)}
+                         for cat, fila in self.tasas(nombre).iterrows()]
+                for nombre in self.dimensiones
+            }
+        }
+
+    def a_json(self, ruta=None, **extras):
+        """Serializa las métricas (más las secciones `extras`) a JSON; si se pasa `ruta`, también lo escribe."""
+        texto = json.dumps({**self.a_dict(), **extras}, ensure_ascii=False, indent=2)
+        if ruta:
+            with open(ruta, 'w', encoding='utf-8') as f:
+                f.write(texto + "\n")
+        return texto
+
+
+@instrumentar()
+def calcular_metricas(df, dimensiones=DIMENSIONES_METRICAS):
+    """Calcula `MetricasRiesgo` en una sola pasada sobre el DataFrame.
+
+    Espera las columnas de Tabla_Completa (`Riesgo`, `Monto_Credito`,
+    `Score_Cliente` y las dimensiones). La máscara de mora se calcula una vez
+    (sobre los códigos si `Riesgo` es categórica) y todo lo demás son sumas
+    vectorizadas: producto punto para los montos y `bincount` por código para
+    cada dimensión.
+    """
+    es_bad = _mascara_bad(df['Riesgo'])
+    monto = df['Monto_Credito'].to_numpy(np.int64)
+    return MetricasRiesgo(
+        total=len(df),
+        bad=int(es_bad.sum()),
+        monto=int(monto.sum()),
+        monto_bad=int(monto @ es_bad),
+        score=int(df['Score_Cliente'].to_numpy(np.int64).sum()),
+        dimensiones={d: _conteo_por_categoria(df[d], es_bad) for d in dimensiones if d in df}
+    )
+
+
+def _mascara_bad(riesgo):
+    """1 donde el crédito es 'Bad', 0 en otro caso (int64, para bincount y producto punto)."""
+    if isinstance(riesgo.dtype, pd.CategoricalDtype):
+        categorias = riesgo.cat.categories
+        if 'Bad' not in categorias:
+            return np.zeros(len(riesgo), dtype=np.int64)
+        return (riesgo.cat.codes.to_numpy() == categorias.get_loc('Bad')).astype(np.int64)
+    return (riesgo.to_numpy() == 'Bad').astype(np.int64)
+
+
+def _conteo_por_categoria(serie, es_bad):
+    """DataFrame (Total, Bad) por categoría con dos `bincount` sobre los códigos."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos, categorias = serie.cat.codes.to_numpy(), serie.cat.categories
+    else:
+        codigos, categorias = pd.factorize(serie, sort=True)
+    etiquetas = [SIN_DATO] + [str(c) for c in categorias]
+    codigos = codigos.astype(np.int64) + 1          # el código -1 (nulo) pasa a la posición 0
+    tabla = pd.DataFrame({
+        'Total': np.bincount(codigos, minlength=len(etiquetas)),
+        'Bad': np.bincount(codigos, weights=es_bad, minlength=len(etiquetas)).astype(np.int64)
+    }, index=pd.Index(etiquetas, name=serie.name))
+    return tabla[tabla['Total'] > 0]
+
+
+def imprimir_kpis(metricas):
+    """KPIs principales y tasa de morosidad por dimensión (reporte de calidad y streaming)."""
+    total, good, bad = metricas.total, metricas.good, metricas.bad
+    print(f"\n   Total Préstamos:         {total:,}")
+    print(f"   Buenos (Good):           {good:,} ({good/total*100:.1f}%)")
+    print(f"   Malos  (Bad):            {bad:,} ({bad/total*100:.1f}%)")
+    print(f"   🔴 Tasa de Morosidad:    {metricas.tasa_morosidad*100:.1f}%")
+    print(f"   💰 Monto Total Prestado: {metricas.monto:,.0f} DM")
+    print(f"   💸 Monto en Riesgo:      {metricas.monto_bad:,.0f} DM")
+    print(f"   📈 Monto Promedio:       {metricas.monto_promedio:,.0f} DM")
+    print(f"   📊 Score Promedio:       {metricas.score_promedio:.0f}")
+
+
+def imprimir_tasas(metricas):
+    """Barras de tasa de morosidad por cada dimensión de las métricas."""
+    titulos = {'Proposito': 'Propósito', 'Rango_Edad': 'Rango de Edad'}
+    for dimension in metricas.dimensiones:
+        print(f"\n   📋 Tasa de Morosidad por {titulos.get(dimension, dimension)}:")
+        for categoria, row in metricas.tasas(dimension).iterrows():
+            bar = "█" * int(row['Tasa'] / 2)
+            print(f"      {categoria:30s} {row['Tasa']:5.1f}% {bar}")
+
+
+def imprimir_validacion(validacion):
+    """Filas validadas, en cuarentena y fallas por regla (reporte de calidad y streaming)."""
+    print(f"\n   🧪 Filas validadas:        {validacion.filas:,}")
+    print(f"   🚧 Filas en cuarentena:    {validacion.cuarentena:,}")
+    for regla, n in validacion.a_dict()['fallas'].items():
+        print(f"      {regla:30s} {n:,}")
+
+
+RUTA_METRICAS = os.path.join(PROCESSED_DIR, "metricas_calidad.json")
+
+
+@instrumentar()
+def reporte_calidad(tablas, validacion=None):
+    """Genera un reporte de calidad de datos (y lo exporta a `metricas_calidad.json`).
+
+    Con `validacion` (`ValidacionCalidad`) también informa la cuarentena.
+    """
+    print("\n" + "="*70)
+    print("📊 REPORTE DE CALIDAD DE DATOS")
+    print("="*70)
+    
+    fact = tablas['Fact_Prestamos']
+    cliente = tablas['Dim_Cliente']
+    
+    # Métricas clave: una sola pasada sobre la tabla plana
+    metricas = calcular_metricas(tablas['Tabla_Completa'])
+    imprimir_kpis(metricas)
+    
+    # Nulos
+    print(f"\n   Valores nulos en Fact:   {fact.isnull().sum().sum()}")
+    print(f"   Valores nulos en Dim_Cliente: {cliente.isnull().sum().sum()}")
+    validacion = validacion or ValidacionCalidad()
+    imprimir_validacion(validacion)
+    
+    # Distribución por propósito y por rango de edad
+    imprimir_tasas(metricas)
+    metricas.a_json(RUTA_METRICAS, validacion=validacion.a_dict())
+    
+    print("\n" + "="*70)
+    print("✅ ETL COMPLETADO EXITOSAMENTE")
+    print("="*70)
+    print(f"""
+📂 Archivos generados en: {PROCESSED_DIR}
+   
+   Para Power BI:
+   ┌──────────────────────────────────────────────────┐
+   │  1. Fact_Prestamos.csv    (Tabla de Hechos)      │
+   │  2. Dim_Cliente.csv       (Dimensión Clientes)   │
+   │  3. Dim_Proposito.csv     (Dimensión Propósito)  │
+   │  4. Dim_Tiempo.csv        (Dimensión Tiempo)     │
+   │  5. Dim_Riesgo.csv        (Dimensión Riesgo)     │
+   │  6. Tabla_Completa.csv    (Flat Table Backup)     │
+   │  7. Cubo_Riesgo.csv       (Cubo OLAP)            │
+   └──────────────────────────────────────────────────┘
+   Filas rechazadas por la validación: Cuarentena.csv
+   
+   Siguiente paso: Importar en Power BI Desktop
+   → Obtener Datos → Texto/CSV → Seleccionar archivos
+   → Crear relaciones entre IDs
+""")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PASO 7: MODO STREAMING (archivos más grandes que la memoria)
+# ═══════════════════════════════════════════════════════════════════════════
+
+@instrumentar()
+def ejecutar_streaming(filepath, chunksize=CHUNKSIZE_DEFECTO, formato='csv', rng=None, fin=None,
+                       **opciones):
+    """Ejecuta decodificación → features → star schema → exportación por bloques.
+
+    Solo se mantienen en memoria el bloque actual y los índices de propósitos
+    y de clientes, así que el consumo crece con los clientes distintos, no con
+    las filas (sin `CLAVE_CLIENTE`, el índice de clientes es un contador).
+    ID_Tiempo es la fecha (YYYYMMDD), así que cada bloque de hechos se escribe
+    ya definitivo. Todas las tablas se escriben en una `Publicacion` y se
+    publican juntas al final. La salida es idéntica byte a byte al modo en
+    memoria. El resumen devuelto incluye el `indice_proposito` y el
+    `indice_clientes` finales.
+    """
+    print(f"\n🌊 Modo streaming: bloques de {chunksize:,} filas...")
+
+    indice_proposito = IndiceClaves()
+    indice_clientes = INDICE_CLIENTES()
+    resumen = {'metricas': MetricasRiesgo(), 'validacion': ValidacionCalidad(), 'cubo': None}
+
+    with Publicacion() as publicacion:
+        with ExitStack() as stack:
+            salidas = {
+                nombre: stack.enter_context(abrir_salida(nombre, formato, publicacion.directorio, **opciones))
+                for nombre in ('Fact_Prestamos', 'Dim_Cliente', 'Tabla_Completa', 'Cuarentena')
+            }
+            procesar_bloques(leer_en_chunks(filepath, chunksize, fin=fin), rng, 0,
+                             salidas, None, indice_proposito, indice_clientes, resumen)
+
+        print(f"   ✓ Fact_Prestamos y Tabla_Completa: {resumen['metricas'].total:,} filas")
+        print(f"   ✓ Dim_Cliente: {len(indice_clientes):,} clientes, {indice_clientes.total_versiones:,} versiones")
+        exportar_dimensiones(indice_proposito, resumen['cubo'], publicacion, formato, **opciones)
+
+    resumen['indice_proposito'] = indice_proposito
+    resumen['indice_clientes'] = indice_clientes
+    return resumen
+
+
+def procesar_bloques(bloques, rng, fila_inicial, salidas, dir_local, indice_proposito, indice_clientes, resumen,
+                     verbose=True):
+    """Consumidor común del modo streaming y de cada partición del modo paralelo.
+
+    Valida, decodifica, calcula features y asigna IDs a cada bloque (los IDs de
+    préstamo arrancan en `fila_inicial`) y valida sus claves; escribe
+    Tabla_Completa y Cuarentena en `salidas`. Fact_Prestamos y Dim_Cliente van
+    a `salidas` o, con `dir_local`, a un pickle por bloque con IDs de propósito
+    y de cliente locales para `etiquetar_bloques`. Actualiza los índices y el
+    resumen; devuelve las rutas de los bloques guardados por tabla.
+    """
+    bloques_locales = {nombre: [] for nombre in TABLAS_LOCALES}
+    for i, chunk in enumerate(bloques):
+        df = preparar_bloque(chunk, rng, fila_inicial + resumen['validacion'].filas, indice_proposito,
+                             indice_clientes, salidas['Cuarentena'], resumen['validacion'])
+
+        for nombre, construir in (('Fact_Prestamos', construir_fact_prestamos),
+                                  ('Dim_Cliente', construir_dim_cliente)):
+            if dir_local is None:
+                salidas[nombre].escribir(construir(df))
+            else:
+                ruta_bloque = os.path.join(dir_local, f"{nombre}_{i:06d}.pkl")
+                construir(df).to_pickle(ruta_bloque)
+                bloques_locales[nombre].append(ruta_bloque)
+        salidas['Tabla_Completa'].escribir(construir_tabla_completa(df))
+
+        acumular_resumen(resumen, df)
+        if verbose:
+            print(f"   ✓ Bloque {i + 1}: {resumen['metricas'].total:,} filas procesadas")
+    return bloques_locales
+
+
+def preparar_bloque(chunk, rng, fila_inicial, indice_proposito, indice_clientes, cuarentena, validacion):
+    """Un bloque crudo listo para exportar: validado, decodificado, con features y con IDs.
+
+    `fila_inicial` es la fila del archivo donde empieza el bloque. Agrega sus
+    propósitos y clientes a los índices y deja los rechazos del bloque
+    escritos en `cuarentena`.
+    """
+    df = validar_crudo(chunk, fila_inicial, cuarentena, validacion)
+    df = feature_engineering(decodificar(df, verbose=False), rng, verbose=False, n_filas=len(chunk))
+    indice_proposito.agregar(df['Proposito'])
+    df = asignar_ids(df, fila_inicial, indice_proposito)
+    df = validar_fact(df, claves_dimensiones(indice_proposito), fila_inicial, cuarentena, validacion)
+    df = asignar_clientes(df, indice_clientes)
+    cuarentena.volcar()
+    return df
+
+
+@instrumentar()
+def etiquetar_bloques(bloques_locales, escritores, id_proposito, clientes):
+    """Segunda pasada del modo paralelo: IDs locales → globales, bloque a bloque.
+
+    `id_proposito` traduce ID_Proposito; `clientes` (de `IndiceClientes.asignar`
+    sobre las versiones de la partición, indexado por ID_Cliente local −
+    ID_CLIENTE_BASE − 1) trae la versión global de cada versión local. Las
+    versiones locales que continúan la vigente de otra partición no se escriben.
+    """
+    for ruta_bloque in bloques_locales['Fact_Prestamos']:
+        bloque = pd.read_pickle(ruta_bloque)
+        local = bloque['ID_Cliente'].to_numpy() - ID_CLIENTE_BASE - 1
+        bloque['ID_Proposito'] = id_proposito[bloque['ID_Proposito'].to_numpy()]
+        bloque['ID_Cliente'] = clientes['ID_Cliente'][local]
+        escritores['Fact_Prestamos'].escribir(aplicar_esquema(bloque, 'Fact_Prestamos'))
+    for ruta_bloque in bloques_locales['Dim_Cliente']:
+        bloque = pd.read_pickle(ruta_bloque)
+        local = bloque['ID_Cliente'].to_numpy() - ID_CLIENTE_BASE - 1
+        abre = clientes['Prestamo_Desde'][local] == bloque['Prestamo_Desde'].to_numpy()
+        bloque = bloque[abre].assign(**{columna: clientes[columna][local[abre]] for columna in COLUMNAS_SCD})
+        escritores['Dim_Cliente'].escribir(aplicar_esquema(bloque, 'Dim_Cliente'))
+
+
+def exportar_dimensiones(indice_proposito, cubo, publicacion, formato='csv', **opciones):
+    """Exporta las dimensiones pequeñas (Dim_Proposito desde el índice, el calendario, el catálogo) y el cubo.
+
+    Se suman a la `publicacion` de los modos por bloques, que ya tiene los
+    hechos: el conjunto se publica entero al cerrarla.
+    """
+    exportar_tablas({
+        'Dim_Proposito': construir_dim_proposito(indice_proposito),
+        'Dim_Tiempo': construir_dim_tiempo(),
+        'Dim_Riesgo': construir_dim_riesgo(),
+        'Cubo_Riesgo': cubo
+    }, formato, publicacion=publicacion, **opciones)
+
+
+def acumular_resumen(resumen, df):
+    """Suma las métricas y el cubo de un bloque procesado al resumen acumulado."""
+    resumen['metricas'] += calcular_metricas(df)
+    resumen['cubo'] = combinar_cubos(resumen.get('cubo'), construir_cubo(df))
+    return resumen
+
+
+def reporte_streaming(resumen, titulo="RESUMEN STREAMING", ruta_json=None):
+    """Resumen de KPIs acumulados durante el modo streaming (y su JSON, si hay `ruta_json`)."""
+    print("\n" + "="*70)
+    print(f"📊 {titulo}")
+    print("="*70)
+    imprimir_kpis(resumen['metricas'])
+    imprimir_validacion(resumen['validacion'])
+    imprimir_tasas(resumen['metricas'])
+    if ruta_json:
+        resumen['metricas'].a_json(ruta_json, validacion=resumen['validacion'].a_dict())
+    print(f"\n📂 Archivos generados en: {PROCESSED_DIR}")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PASO 8: MODO INCREMENTAL (solo filas nuevas, cargas append-only)
+# ═══════════════════════════════════════════════════════════════════════════
+
+RUTA_ESTADO = os.path.join(PROCESSED_DIR, "estado_etl.json")
+VERSION_ESTADO = 7          # cambia cuando cambian las columnas de las tablas anexadas
+BLOQUE_HUELLA = 1 << 20     # bytes del inicio y del final del tramo procesado que entran en la huella
+TABLAS_INCREMENTALES = ('Fact_Prestamos', 'Dim_Cliente', 'Dim_Proposito', 'Tabla_Completa', 'Cuarentena')
+RUTAS_INDICES = {
+    'Proposito': os.path.join(PROCESSED_DIR, "indice_proposito.npy"),
+    'Cliente': os.path.join(PROCESSED_DIR, "indice_cliente.npz")
+}
+
+
+def fin_lineas_completas(filepath):
+    """Offset justo después del último salto de línea (una fila a medio escribir espera)."""
+    with open(filepath, 'rb') as f:
+        fin = f.seek(0, os.SEEK_END)
+        while fin > 0:
+            inicio = max(0, fin - (1 << 16))
+            f.seek(inicio)
+            pos = f.read(fin - inicio).rfind(b'\n')
+            if pos >= 0:
+                return inicio + pos + 1
+            fin = inicio
+    return 0
+
+
+def huella_raw(filepath, offset):
+    """Huella del tramo [0, offset): tamaño + SHA-256 de su primer y último MiB."""
+    h = hashlib.sha256(str(offset).encode())
+    with open(filepath, 'rb') as f:
+        h.update(f.read(min(offset, BLOQUE_HUELLA)))
+        inicio_cola = max(0, offset - BLOQUE_HUELLA)
+        f.seek(inicio_cola)
+        h.update(f.read(offset - inicio_cola))
+    return h.hexdigest()
+
+
+def cargar_estado(ruta=RUTA_ESTADO):
+    """Lee el estado persistido de la última corrida (None si no existe)."""
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def guardar_estado(estado, ruta=RUTA_ESTADO):
+    """Persiste el estado de forma atómica (archivo temporal + rename)."""
+    tmp = f"{ruta}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(estado, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, ruta)
+
+
+def _ruta_tabla(nombre):
+    """Tabla CSV de la versión publicada (`actual`): la base sobre la que se anexa."""
+    return os.path.join(directorio_actual() or os.path.join(PROCESSED_DIR, PUNTERO_ACTUAL), f"{nombre}.csv")
+
+
+def _motivo_reconstruccion(estado, filepath, fin):
+    """Devuelve por qué no se puede continuar incrementalmente (None si se puede)."""
+    if estado is None:
+        return "no hay estado previo"
+    if estado.get('version') != VERSION_ESTADO:
+        return "el estado es de una versión anterior"
+    if estado.get('calendario') != os.path.basename(ruta_cache()):
+        return "cambió el rango o el año fiscal del calendario (Dim_Tiempo)"
+    if estado.get('clave_cliente') != list(CLAVE_CLIENTE):
+        return "cambió la clave de cliente (CLAVE_CLIENTE)"
+    if estado['archivo'] != os.path.basename(filepath):
+        return f"el estado corresponde a {estado['archivo']}"
+    if fin < estado['offset']:
+        return "el archivo crudo es más corto que lo ya procesado"
+    if huella_raw(filepath, estado['offset']) != estado['huella']:
+        return "el tramo ya procesado del archivo crudo cambió"
+    if directorio_actual() is None:
+        return "no hay una versión publicada de las tablas"
+    faltantes = [n for n in TABLAS_INCREMENTALES + ('Dim_Tiempo', 'Cubo_Riesgo') if not os.path.exists(_ruta_tabla(n))]
+    faltantes += [os.path.basename(r) for r in RUTAS_INDICES.values() if not os.path.exists(r)]
+    if faltantes:
+        return f"faltan archivos de la corrida anterior: {', '.join(faltantes)}"
+    # La versión se publica antes de confirmar el estado: si una corrida se
+    # interrumpió entre ambos pasos, la versión ya incluye filas sin confirmar
+    if any(os.path.getsize(_ruta_tabla(n)) != tamano for n, tamano in estado['tamanos'].items()):
+        return "las tablas publicadas no coinciden con el estado confirmado"
+    if leer_cubo(_ruta_tabla('Cubo_Riesgo'))['Creditos'].sum() != estado['filas']:
+        return "el cubo no coincide con las filas confirmadas"
+    # El índice de clientes se actualiza en el lugar (no solo crece): si se guardó
+    # y la corrida no llegó a confirmar el estado, no se puede recortar
+    clientes = INDICE_CLIENTES.cargar(RUTAS_INDICES['Cliente'])
+    if (len(clientes), clientes.total_versiones) != (estado['claves']['Cliente'], estado['versiones_cliente']):
+        return "el índice de clientes no coincide con el estado confirmado"
+    return None
+
+
+@instrumentar()
+def ejecutar_incremental(filepath, chunksize=CHUNKSIZE_DEFECTO):
+    """Procesa solo las filas agregadas al archivo crudo desde la última corrida.
+
+    El estado (`estado_etl.json`) guarda el offset procesado, su huella, las
+    filas confirmadas y en cuarentena, el tamaño confirmado de los índices de
+    claves, las versiones de clientes y el estado del generador aleatorio; los
+    índices se guardan aparte (`IndiceClaves` en `.npy`, `IndiceClientes` en
+    `.npz`). La corrida publica una versión nueva (`Publicacion`) que parte
+    de la actual: las filas nuevas se anexan a copias de Fact_Prestamos,
+    Tabla_Completa y Cuarentena, y las versiones de cliente que abren a
+    Dim_Cliente (las anteriores no se tocan: la vigente es la de mayor
+    Version); los propósitos nuevos se anexan a Dim_Proposito con IDs nuevos,
+    sin tocar los existentes. Dim_Tiempo es el calendario completo y no
+    cambia. Si el archivo crudo
+    cambió en el tramo ya procesado, o cambió el calendario o la clave de
+    cliente, se hace una reconstrucción completa. Solo CSV (formato append-only).
+    """
+    if not (filepath and os.path.exists(filepath)):
+        raise ValueError("El modo incremental requiere el archivo crudo en disco")
+
+    fin = fin_lineas_completas(filepath)
+    estado = cargar_estado(RUTA_ESTADO)
+    motivo = _motivo_reconstruccion(estado, filepath, fin)
+
+    if motivo:
+        print(f"\n🔁 Reconstrucción completa: {motivo}")
+        rng = np.random.default_rng(SEMILLA)
+        resumen = ejecutar_streaming(filepath, chunksize, 'csv', rng=rng, fin=fin)
+        resumen['reconstruccion'] = motivo
+        indices = {'Proposito': resumen['indice_proposito'], 'Cliente': resumen['indice_clientes']}
+        for nombre, indice in indices.items():
+            indice.guardar(RUTAS_INDICES[nombre])
+        guardar_estado({
+            'version': VERSION_ESTADO,
+            'calendario': os.path.basename(ruta_cache()),
+            'clave_cliente': list(CLAVE_CLIENTE),
+            'archivo': os.path.basename(filepath),
+            'offset': fin,
+            'filas': resumen['metricas'].total,
+            'cuarentena': resumen['validacion'].cuarentena,
+            'huella': huella_raw(filepath, fin),
+            'claves': {nombre: len(indice) for nombre, indice in indices.items()},
+            'versiones_cliente': resumen['indice_clientes'].total_versiones,
+            'rng': rng.bit_generator.state,
+            'tamanos': {n: os.path.getsize(_ruta_tabla(n)) for n in TABLAS_INCREMENTALES}
+        }, RUTA_ESTADO)
+        return resumen
+
+    if fin == estado['offset']:
+        print("\n✅ Sin filas nuevas desde la última corrida.")
+        return None
+
+    print(f"\n➕ Modo incremental: {fin - estado['offset']:,} bytes nuevos desde la fila {estado['filas']:,}...")
+
+    indice_proposito = IndiceClaves.cargar(RUTAS_INDICES['Proposito'], estado['claves']['Proposito'])
+    indice_clientes = INDICE_CLIENTES.cargar(RUTAS_INDICES['Cliente'])
+
+    rng = np.random.default_rng()
+    rng.bit_generator.state = estado['rng']
+
+    # Los IDs salen de la fila del crudo: las confirmadas más las que fueron a cuarentena
+    filas = estado['filas'] + estado['cuarentena']
+    resumen = {'metricas': MetricasRiesgo(), 'validacion': ValidacionCalidad(), 'cubo': None}
+    with Publicacion(base=directorio_actual()) as publicacion:
+        with ExitStack() as stack:
+            salidas = {
+                nombre: stack.enter_context(abrir_salida(nombre, 'csv', publicacion.directorio, anexar=True))
+                for nombre in TABLAS_INCREMENTALES
+            }
+
+            for chunk in leer_en_chunks(filepath, chunksize, inicio=estado['offset'], fin=fin):
+                n_previos = len(indice_proposito)
+                df = preparar_bloque(chunk, rng, filas + resumen['validacion'].filas, indice_proposito,
+                                     indice_clientes, salidas['Cuarentena'], resumen['validacion'])
+                if len(indice_proposito) > n_previos:
+                    salidas['Dim_Proposito'].escribir(construir_dim_proposito(indice_proposito, n_previos))
+
+                salidas['Fact_Prestamos'].escribir(construir_fact_prestamos(df))
+                salidas['Dim_Cliente'].escribir(construir_dim_cliente(df))
+                salidas['Tabla_Completa'].escribir(construir_tabla_completa(df))
+                acumular_resumen(resumen, df)
+                print(f"   ✓ {resumen['metricas'].total:,} filas nuevas anexadas")
+
+        # El cubo se combina con las celdas nuevas (el de la versión anterior no se toca)
+        with abrir_escritor('Cubo_Riesgo', 'csv', publicacion.directorio) as escritor:
+            escritor.escribir(combinar_cubos(leer_cubo(_ruta_tabla('Cubo_Riesgo')), resumen['cubo']))
+
+    # Primero la versión, después los índices y por último el estado que confirma la corrida
+    indice_proposito.guardar(RUTAS_INDICES['Proposito'])
+    indice_clientes.guardar(RUTAS_INDICES['Cliente'])
+    estado.update({
+        'offset': fin,
+        'filas': estado['filas'] + resumen['metricas'].total,
+        'cuarentena': estado['cuarentena'] + resumen['validacion'].cuarentena,
+        'huella': huella_raw(filepath, fin),
+        'claves': {'Proposito': len(indice_proposito), 'Cliente': len(indice_clientes)},
+        'versiones_cliente': indice_clientes.total_versiones,
+        'rng': rng.bit_generator.state,
+        'tamanos': {n: os.path.getsize(_ruta_tabla(n)) for n in TABLAS_INCREMENTALES}
+    })
+    guardar_estado(estado, RUTA_ESTADO)
+    return resumen
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PASO 9: MODO PARALELO (particiones del archivo crudo en varios procesos)
+# ═══════════════════════════════════════════════════════════════════════════
+
+TABLAS_PARTICIONADAS = ('Fact_Prestamos', 'Dim_Cliente', 'Tabla_Completa')
+# Tablas con claves locales en cada partición: se escriben en la segunda pasada
+TABLAS_LOCALES = ('Fact_Prestamos', 'Dim_Cliente')
+NOMBRE_CLIENTES = "clientes.npz"    # versiones de cliente (locales y luego globales) de una partición
+
+
+def particionar(filepath, n, fin=None):
+    """Divide [0, fin) en hasta `n` rangos de bytes de tamaño similar alineados a líneas."""
+    fin = os.path.getsize(filepath) if fin is None else fin
+    cortes = [0]
+    with open(filepath, 'rb') as f:
+        for k in range(1, n):
+            f.seek(max(fin * k // n - 1, cortes[-1]))
+            f.readline()                    # avanza hasta el inicio de la línea siguiente
+            cortes.append(min(f.tell(), fin))
+    cortes.append(fin)
+    return [(a, b) for a, b in zip(cortes, cortes[1:]) if b > a]
+
+
+def contar_filas(filepath, inicio, fin):
+    """Cantidad de filas (líneas no vacías) en los bytes [inicio, fin)."""
+    filas, anterior_salto = 0, True
+    with open(filepath, 'rb') as f:
+        for bloque in LectorAcotado(f, inicio, fin):
+            salto = np.frombuffer(bloque, dtype=np.uint8) == ord('\n')
+            # un salto cierra una fila si el byte anterior no era otro salto
+            filas += int(np.count_nonzero(salto[1:] & ~salto[:-1])) + bool(salto[0] and not anterior_salto)
+            anterior_salto = bool(salto[-1])
+    return filas + (not anterior_salto)     # última línea sin salto final
+
+
+def rng_particion(fila_inicial):
+    """Generador de una partición: el global (`SEMILLA`) adelantado 3 uniformes por fila previa.
+
+    `feature_engineering` consume exactamente tres uniformes por fila del crudo
+    (también por las que descarta la validación), así que cada partición
+    continúa la secuencia donde la dejaría el modo secuencial y el resultado
+    no depende de la cantidad de particiones.
+    """
+    rng = np.random.default_rng(SEMILLA)
+    rng.bit_generator.advance(3 * int(fila_inicial))
+    return rng
+
+
+def _procesar_particion(filepath, particion, fila_inicial, directorio, chunksize, formato, opciones):
+    """Worker: procesa una partición con claves locales y escribe sus partes en `directorio`.
+
+    Las versiones de cliente abiertas (hashes de clave y atributos, préstamo)
+    quedan en `NOMBRE_CLIENTES` para que el coordinador las resuelva.
+    """
+    inicio, fin = particion
+    os.makedirs(directorio)
+    REGISTRO.extraer()                      # descarta lo heredado del proceso padre
+    indice_proposito = IndiceClaves()
+    indice_clientes = INDICE_CLIENTES(registrar=True)
+    resumen = {'metricas': MetricasRiesgo(), 'validacion': ValidacionCalidad(), 'cubo': None}
+
+    with ExitStack() as stack:
+        salidas = {
+            nombre: stack.enter_context(abrir_salida(nombre, formato, directorio, **opciones))
+            for nombre in ('Tabla_Completa', 'Cuarentena')
+        }
+        bloques_locales = procesar_bloques(leer_en_chunks(filepath, chunksize, inicio, fin),
+                                           rng_particion(fila_inicial), fila_inicial, salidas, directorio,
+                                           indice_proposito, indice_clientes, resumen, verbose=False)
+    claves, atributos, prestamos = indice_clientes.aperturas()
+    np.savez(os.path.join(directorio, NOMBRE_CLIENTES), claves=claves, atributos=atributos, prestamos=prestamos)
+    return {
+        'bloques_locales': bloques_locales,
+        'claves_proposito': indice_proposito.claves,
+        'resumen': resumen,
+        'etapas': REGISTRO.extraer()
+    }
+
+
+def _etiquetar_particion(bloques_locales, directorio, id_proposito, formato, opciones):
+    """Worker: escribe las partes de Fact_Prestamos y Dim_Cliente de una partición con las claves globales.
+
+    Las versiones globales de sus clientes las dejó el coordinador en
+    `NOMBRE_CLIENTES`. Devuelve las etapas medidas en el worker.
+    """
+    REGISTRO.extraer()
+    with np.load(os.path.join(directorio, NOMBRE_CLIENTES)) as datos:
+        clientes = {columna: datos[columna] for columna in COLUMNAS_SCD}
+    with ExitStack() as stack:
+        escritores = {
+            nombre: stack.enter_context(abrir_escritor(nombre, formato, directorio, **opciones))
+            for nombre in TABLAS_LOCALES
+        }
+        etiquetar_bloques(bloques_locales, escritores, id_proposito, clientes)
+    return REGISTRO.extraer()
+
+
+@instrumentar()
+def ejecutar_paralelo(filepath, workers=None, chunksize=CHUNKSIZE_DEFECTO, formato='csv', **opciones):
+    """Ejecuta el ETL repartiendo particiones del archivo crudo en `workers` procesos.
+
+    1. Se cuentan las filas de cada partición (en paralelo) para conocer su
+       fila inicial global.
+    2. Cada worker valida, decodifica, calcula features y escribe sus partes
+       (y su cuarentena) con IDs de propósito y de cliente locales (ID_Tiempo
+       ya es la fecha); el ruido aleatorio sale de `rng_particion`, derivado
+       de la semilla global.
+    3. El coordinador une los índices en orden de partición (claves globales):
+       los propósitos por primera aparición y las versiones de cliente de cada
+       partición con un `IndiceClientes` global, como si fueran filas (la
+       primera versión local de un cliente que no cambió sus atributos
+       continúa la vigente). Los workers re-etiquetan sus hechos y clientes.
+    4. Las partes se concatenan en orden en una `Publicacion`, con las
+       dimensiones, y se publican juntas. La salida es idéntica byte a byte a
+       la del modo streaming y en memoria.
+    """
+    if not (filepath and os.path.exists(filepath)):
+        raise ValueError("El modo paralelo requiere el archivo crudo en disco")
+
+    workers = workers or os.cpu_count()
+    particiones = particionar(filepath, workers)
+    print(f"\n🚀 Modo paralelo: {len(particiones)} particiones en {workers} procesos...")
+
+    with ProcessPoolExecutor(workers) as pool, \
+            tempfile.TemporaryDirectory(prefix='paralelo.', dir=PROCESSED_DIR) as dir_tmp:
+        # ── 1. Filas por partición → fila inicial global de cada una ──
+        filas = [pool.submit(contar_filas, filepath, *p) for p in particiones]
+        filas_iniciales = np.cumsum([0] + [f.result() for f in filas])[:-1]
+
+        # ── 2. Decodificación, features y partes con claves locales ──
+        directorios = [os.path.join(dir_tmp, f"parte_{k:04d}") for k in range(len(particiones))]
+        resultados = [f.result() for f in [
+            pool.submit(_procesar_particion, filepath, p, fila, d, chunksize, formato, opciones)
+            for p, fila, d in zip(particiones, filas_iniciales, directorios)
+        ]]
+
+        # ── 3. Claves globales: propósitos en orden de primera aparición, versiones de cliente en orden ──
+        indice_proposito = IndiceClaves()
+        indice_clientes = INDICE_CLIENTES()
+        resumen = {'metricas': MetricasRiesgo(), 'validacion': ValidacionCalidad(), 'cubo': None}
+        for r, d in zip(resultados, directorios):
+            REGISTRO.combinar(r['etapas'])
+            indice_proposito.agregar(r['claves_proposito'])
+            ruta_clientes = os.path.join(d, NOMBRE_CLIENTES)
+            with np.load(ruta_clientes) as locales:
+                globales = indice_clientes.asignar(locales['claves'], locales['atributos'], locales['prestamos'])
+            np.savez(ruta_clientes, **globales)
+        ids_proposito = [np.append(0, indice_proposito.buscar(r['claves_proposito'])) for r in resultados]
+
+        for k, (r, id_proposito) in enumerate(zip(resultados, ids_proposito), start=1):
+            parcial = r['resumen']
+            resumen['metricas'] += parcial['metricas']
+            resumen['validacion'] += parcial['validacion']
+            if parcial['cubo'] is not None:
+                cubo = parcial['cubo'].assign(ID_Proposito=id_proposito[parcial['cubo']['ID_Proposito'].to_numpy()])
+                resumen['cubo'] = combinar_cubos(resumen['cubo'], cubo)
+            print(f"   ✓ Partición {k}: {parcial['metricas'].total:,} filas")
+        for f in [
+            pool.submit(_etiquetar_particion, r['bloques_locales'], d, id_proposito, formato, opciones)
+            for r, d, id_proposito in zip(resultados, directorios, ids_proposito)
+        ]:
+            REGISTRO.combinar(f.result())
+
+        # ── 4. Concatenar las partes en orden (y publicar con las dimensiones) ──
+        with Publicacion() as publicacion:
+            for nombre in TABLAS_PARTICIONADAS + ('Cuarentena',):
+                with abrir_salida(nombre, formato, publicacion.directorio, **opciones) as escritor:
+                    for d in directorios:
+                        escritor.copiar(os.path.join(d, os.path.basename(escritor.ruta)))
+
+            print(f"   ✓ Fact_Prestamos y Tabla_Completa: {resumen['metricas'].total:,} filas")
+            print(f"   ✓ Dim_Cliente: {len(indice_clientes):,} clientes, "
+                  f"{indice_clientes.total_versiones:,} versiones")
+            exportar_dimensiones(indice_proposito, resumen['cubo'], publicacion, formato, **opciones)
+
+    resumen['indice_proposito'] = indice_proposito
+    resumen['indice_clientes'] = indice_clientes
+    return resumen
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PASO 10: GENERADOR SINTÉTICO A ESCALA (pruebas de carga)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def codificar_crudo(df):
+    """Bloque → bytes en el formato de german_credit.data (separado por espacios, sin encabezado).
+
+    Equivale a `to_csv(sep=' ')` pero arma las líneas con numpy: cada columna
+    es una tabla de tokens (categorías o el rango de enteros) más un índice por
+    fila, y los bytes se copian posición a posición del token.
+    """
+    columnas = []
+    for col in COLUMN_NAMES:
+        serie = df[col]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            tokens, indices = serie.cat.categories.astype(str), serie.cat.codes.to_numpy()
+        else:
+            valores = serie.to_numpy()
+            minimo = valores.min()
+            tokens, indices = np.arange(minimo, valores.max() + 1).astype(str), valores - minimo
+        tabla = np.array(tokens, dtype='S')
+        largos = np.char.str_len(tabla)[indices]
+        columnas.append((tabla.view(np.uint8).reshape(len(tabla), -1), indices, largos))
+
+    # Cada token ocupa su largo + 1 (separador o salto de línea final)
+    largo_fila = sum(largos for _, _, largos in columnas) + len(columnas)
+    posicion = np.cumsum(largo_fila) - largo_fila
+    salida = np.full(int(largo_fila.sum()), ord(' '), dtype=np.uint8)
+    for bytes_token, indices, largos in columnas:
+        for c in range(bytes_token.shape[1]):
+            hay = largos > c
+            salida[posicion[hay] + c] = bytes_token[indices[hay], c]
+        posicion += largos + 1
+    salida[posicion - 1] = ord('\n')
+    return salida.tobytes()
+
+
+def escribir_crudo(df, ruta):
+    """Escribe un bloque en el formato de german_credit.data."""
+    with open(ruta, 'wb') as f:
+        f.write(codificar_crudo(df))
+
+
+def _generar_parte(ruta, filas, semilla, correlacionar, formato):
+    """Worker: genera un bloque con su propia semilla y lo escribe en `ruta`."""
+    df = generar_dataset_sintetico(filas, np.random.default_rng(semilla), correlacionar)
+    if formato == 'parquet':
+        df.to_parquet(ruta, index=False)
+    else:
+        escribir_crudo(df, ruta)
+    return ruta
+
+
+@instrumentar()
+def generar_archivo_sintetico(filas, ruta, chunksize=CHUNKSIZE_DEFECTO, workers=None,
+                              semilla=SEMILLA, correlacionar=False):
+    """Escribe `filas` registros sintéticos en `ruta` por bloques de `chunksize`.
+
+    El formato sale de la extensión: `.parquet` o, si no, el crudo de
+    german_credit.data. Cada bloque usa su propio `np.random.Generator`
+    (`SeedSequence(semilla).spawn`), así que el archivo solo depende de
+    `filas`, `chunksize` y `semilla`, no de la cantidad de procesos. Los
+    bloques se generan en paralelo y se concatenan en orden.
+    """
+    formato = 'parquet' if ruta.endswith('.parquet') else 'crudo'
+    if formato == 'parquet':
+        import pyarrow.parquet as pq
+    workers = workers or os.cpu_count()
+    tamanios = [min(chunksize, filas - inicio) for inicio in range(0, filas, chunksize)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanios))
+    print(f"\n🧪 Generando {filas:,} filas sintéticas → {ruta}")
+    print(f"   {len(tamanios)} bloques de hasta {chunksize:,} filas en {workers} procesos"
+          f"{' (correlacionadas con Riesgo)' if correlacionar else ''}")
+
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    with ProcessPoolExecutor(workers) as pool, \
+            tempfile.TemporaryDirectory(prefix='sintetico.', dir=directorio) as dir_tmp, \
+            open(ruta + '.tmp', 'wb') as salida:
+        partes = pool.map(_generar_parte,
+                          [os.path.join(dir_tmp, f"parte_{k:06d}") for k in range(len(tamanios))],
+                          tamanios, semillas, [correlacionar] * len(tamanios), [formato] * len(tamanios))
+        escritor = None
+        for k, parte in enumerate(partes, start=1):
+            if formato == 'parquet':
+                tabla = pq.read_table(parte)
+                escritor = escritor or pq.ParquetWriter(salida, tabla.schema)
+                escritor.write_table(tabla)
+            else:
+                with open(parte, 'rb') as origen:
+                    shutil.copyfileobj(origen, salida)
+            os.remove(parte)
+            if k % 10 == 0 or k == len(tamanios):
+                print(f"   ✓ {k}/{len(tamanios)} bloques")
+        if escritor is not None:
+            escritor.close()
+    os.replace(ruta + '.tmp', ruta)
+    print(f"   ✓ {ruta} ({os.path.getsize(ruta) / 1024 ** 2:,.1f} MB)")
+    return ruta
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# EJECUCIÓN COMPLETA (subcomando `export` del CLI: python3 -m etl_pipeline)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def ejecutar(args):
+    """Corre el pipeline con las opciones del subcomando `export` (ver etl_pipeline/cli.py)."""
+    os.makedirs(RAW_DIR, exist_ok=True)
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
+    opciones_exportacion = {'compresion': args.compresion, 'row_group_size': args.row_group_size}
+    modo = ('generar' if args.generar is not None else 'descargar' if args.descargar
+            else 'incremental' if args.incremental
+            else 'paralelo' if args.paralelo else 'streaming' if args.streaming else 'memoria')
+
+    with REGISTRO.corrida(args.log_metricas, args.prometheus, modo=modo, formato=args.formato):
+        if args.generar is not None:
+            generar_archivo_sintetico(args.generar, args.salida, args.chunksize, args.workers,
+                                      args.semilla, args.correlacionar)
+        elif args.descargar:
+            print(f"📥 Descargando {len(args.descargar)} fuentes en {RAW_DIR}...")
+            descargar_fuentes({os.path.basename(urlparse(url).path): url for url in args.descargar},
+                              workers=args.workers or 4)
+        else:
+            print("="*70)
+            print("🏦 DASHBOARD ESTRATÉGICO DE RIESGO CREDITICIO")
+            print("   ETL Pipeline — German Credit Data")
+            print("="*70)
+    
+            # 1. Descargar
+            filepath = descargar_dataset(revalidar=args.revalidar)
+            tablas = resumen = None
+    
+            if args.incremental:
+                # 2-5. Solo las filas nuevas desde la última corrida
+                resumen = ejecutar_incremental(filepath, args.chunksize)
+                if resumen:
+                    reporte_streaming(resumen, "RESUMEN INCREMENTAL (filas procesadas en esta corrida)")
+            elif args.paralelo:
+                # 2-5. Lo mismo que streaming, con una partición del archivo por proceso
+                reporte_streaming(ejecutar_paralelo(filepath, args.workers, args.chunksize, args.formato,
+                                                    **opciones_exportacion), "RESUMEN PARALELO", RUTA_METRICAS)
+            elif args.streaming:
+                # 2-5. Decodificar, Features, Star Schema y Exportar por bloques
+                reporte_streaming(ejecutar_streaming(filepath, args.chunksize, args.formato,
+                                                     **opciones_exportacion), ruta_json=RUTA_METRICAS)
+            else:
+                # La cuarentena y las tablas se publican juntas como una versión
+                with Publicacion() as publicacion:
+                    # 2. Cargar, Validar y Decodificar (las filas inválidas van a Cuarentena.csv)
+                    validacion = ValidacionCalidad()
+                    with Cuarentena(publicacion.directorio) as cuarentena:
+                        df = cargar_y_decodificar(filepath, cuarentena, validacion)
+
+                        # 3. Feature Engineering
+                        df = feature_engineering(df, n_filas=validacion.filas)
+
+                        # 4. Star Schema (proyecciones sobre una sola copia tipada de df)
+                        tablas = crear_star_schema(df, cuarentena, validacion)
+                        del df
+
+                    # 4B. Cubo de agregados para el dashboard
+                    tablas['Cubo_Riesgo'] = crear_cubo(tablas.base)
+
+                    # 5. Exportar
+                    exportar_tablas(tablas, args.formato, workers=args.workers, publicacion=publicacion,
+                                    **opciones_exportacion)
+
+                # 6. Reporte
+                reporte_calidad(tablas, validacion)
+
+            if args.base_datos:
+                # 7. Base de datos embebida (desde las tablas en memoria o los archivos exportados);
+                # en modo incremental solo se anexan las filas nuevas, salvo tras una reconstrucción
+                anexar = args.incremental and not (resumen or {}).get('reconstruccion')
+                cargar_base_datos(args.base_datos, tablas, args.formato, anexar=anexar)
@@ -0,0 +1,155 @@
+"""
+Reglas de negocio compartidas por el ETL batch, el scoring online y el CLI:
+scorecard de Score_Cliente (tarjeta_score.json compilado a tablas de lookup)
+y tramos de edad, score y monto. Solo requiere numpy; pandas se importa en
+las funciones que devuelven objetos de pandas.
+"""
+
+import functools
+import json
+import os
+
+import numpy as np
+
+from .catalogo import DECODIFICACIONES, numero_codigo
+from .config import BASE_DIR
+
+# Scorecard de Score_Cliente: puntos por código A de cada atributo y por tramo
+# del ratio Monto/(Duración+1). Se edita el JSON, no el código.
+RUTA_TARJETA_SCORE = os.path.join(BASE_DIR, "tarjeta_score.json")
+
+# Tramos (a, b] de edad, score y monto: los comparten el batch y el scoring online
+BORDES_EDAD = np.array([17, 25, 35, 50, 100])
+ETIQUETAS_EDAD = ['18-25 (Joven)', '26-35 (Adulto Joven)', '36-50 (Adulto)', '50+ (Senior)']
+BORDES_SCORE = np.array([299, 500, 600, 700, 850])
+ETIQUETAS_SCORE = ['Muy Alto Riesgo (300-500)', 'Alto Riesgo (501-600)',
+                   'Riesgo Medio (601-700)', 'Bajo Riesgo (701-850)']
+BORDES_MONTO = np.array([0, 1000, 3000, 5000, 10000, np.inf])
+ETIQUETAS_MONTO = ['Micro (<1K)', 'Pequeño (1K-3K)', 'Mediano (3K-5K)',
+                   'Grande (5K-10K)', 'Muy Grande (>10K)']
+
+
+def codigos_tramo(valores, bordes):
+    """Posición del tramo (a, b] de cada valor; -1 fuera de rango o NaN (como `pd.cut`)."""
+    codigos = np.searchsorted(bordes, valores, side='left') - 1
+    codigos[codigos >= len(bordes) - 1] = -1
+    return codigos
+
+
+def tramos(valores, bordes, etiquetas):
+    """Equivale a `pd.cut(valores, bordes, labels=etiquetas)` con un solo `searchsorted`."""
+    import pandas as pd
+    return pd.Categorical.from_codes(codigos_tramo(np.asarray(valores), bordes),
+                                     categories=etiquetas, ordered=True)
+
+
+class TarjetaScore:
+    """Scorecard declarativo compilado a tablas de lookup enteras.
+
+    Cada atributo se compila a un array int16 indexado por el número de su
+    código A (A34 → 34; los códigos sin puntos y el 0 valen 0) y los tramos
+    del ratio a bordes + puntos. Puntuar es un gather por atributo sobre los
+    códigos de la categórica y un `searchsorted`, con las columnas crudas
+    (códigos A) o ya decodificadas (la etiqueta se traduce a su código una
+    vez por categoría, no por fila).
+
+    Un código que no está en `DECODIFICACIONES` para su atributo no suma 0 en
+    silencio: `puntos_codigos` lanza ValueError. El 0 (nulo) sí es válido.
+    """
+
+    # Tablas indexadas hasta el código A más alto del catálogo (A410); el
+    # último lugar recibe los números fuera de rango y nunca es válido.
+    TAMANIO_TABLA = max(numero_codigo(codigo) for mapeo in DECODIFICACIONES.values() for codigo in mapeo) + 1
+    DESCONOCIDO = TAMANIO_TABLA
+
+    def __init__(self, config):
+        self.base = config['base']
+        self.minimo, self.maximo = config['limites']
+        self.tablas = {}
+        self.validos = {}
+        for columna, puntos in config['atributos'].items():
+            if columna not in DECODIFICACIONES:
+                raise ValueError(f"{columna}: no es un atributo con códigos A")
+            validos = np.zeros(self.TAMANIO_TABLA + 1, dtype=bool)
+            validos[[0] + [numero_codigo(codigo) for codigo in DECODIFICACIONES[columna]]] = True
+            tabla = np.zeros(self.TAMANIO_TABLA + 1, dtype=np.int16)
+            for codigo, valor in puntos.items():
+                if codigo not in DECODIFICACIONES[columna]:
+                    raise ValueError(f"{columna}: '{codigo}' no es un código de {columna}")
+                tabla[numero_codigo(codigo)] = valor
+            self.tablas[columna] = tabla
+            self.validos[columna] = validos
+
+        tramos = config['ratio_monto_duracion']
+        if len(tramos['puntos']) != len(tramos['bordes']) + 1:
+            raise ValueError("ratio_monto_duracion: se esperan len(bordes) + 1 puntos")
+        # Un borde +inf al final: los NaN caen después y no suman puntos
+        self.bordes = np.append(np.asarray(tramos['bordes'], dtype=float), np.inf)
+        self.puntos_ratio = np.append(np.asarray(tramos['puntos'], dtype=np.int16), 0)
+
+    @classmethod
+    def cargar(cls, ruta=RUTA_TARJETA_SCORE):
+        with open(ruta, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def numeros(cls, columna, serie):
+        """Número de código A por fila de un atributo (categórica cruda o decodificada).
+
+        0 si es nulo; `DESCONOCIDO` si la categoría no es un código ni una etiqueta del atributo.
+        """
+        if serie.dtype.name != 'category':
+            serie = serie.astype('category')
+        a_codigo = {etiqueta: codigo for codigo, etiqueta in DECODIFICACIONES.get(columna, {}).items()}
+        # El 0 final atiende el código -1 (nulo)
+        por_categoria = np.array([numero_codigo(a_codigo.get(c, c)) or cls.DESCONOCIDO
+                                  for c in serie.cat.categories] + [0])
+        return por_categoria[serie.cat.codes.to_numpy()]
+
+    def desconocidos(self, columna, numeros):
+        """Posiciones de los números que no son códigos de `columna` (ni 0)."""
+        numeros = np.minimum(numeros, self.DESCONOCIDO)
+        return np.flatnonzero(~self.validos[columna][numeros])
+
+    def puntos_codigos(self, numeros, monto, duracion):
+        """Puntaje sin límites (int32) a partir de {atributo: números de código A}, monto y duración.
+
+        ValueError si algún número no es un código del atributo (ver `desconocidos`).
+        """
+        total = np.full(len(monto), self.base, dtype=np.int32)
+        for columna, tabla in self.tablas.items():
+            columna_numeros = np.minimum(numeros[columna], self.DESCONOCIDO)
+            if not self.validos[columna][columna_numeros].all():
+                fila = self.desconocidos(columna, columna_numeros)[0]
+                raise ValueError(f"{columna}: código desconocido en la fila {fila + 1}")
+            total += tabla[columna_numeros]
+        ratio = np.asarray(monto, dtype=float) / (np.asarray(duracion, dtype=float) + 1)
+        total += self.puntos_ratio[np.searchsorted(self.bordes, ratio, side='left')]
+        return total
+
+    def puntos(self, df):
+        """Puntaje sin límites por fila (int32): base + atributos + tramo del ratio."""
+        numeros = {columna: self.numeros(columna, df[columna]) for columna in self.tablas}
+        return self.puntos_codigos(numeros, df['Monto_Credito'].to_numpy(), df['Duracion_Meses'].to_numpy())
+
+
+@functools.lru_cache(maxsize=None)
+def tarjeta_score(ruta=RUTA_TARJETA_SCORE):
+    """Scorecard compilado de `ruta` (se lee y compila una vez por proceso)."""
+    return TarjetaScore.cargar(ruta)
+
+
+def score(records, tarjeta=None):
+    """Score_Cliente de un lote de préstamos, sin pasar por el resto del ETL.
+
+    `records` puede ser un DataFrame (crudo con códigos A, p. ej. leído con
+    `DTYPES_CRUDOS`, o decodificado) o una lista de dicts con las columnas
+    del scorecard, `Monto_Credito` y `Duracion_Meses`. Devuelve un array
+    int16 acotado a los límites del scorecard; no incluye el ruido que
+    `feature_engineering` agrega para simular la dispersión del score.
+    """
+    import pandas as pd
+
+    tarjeta = tarjeta or tarjeta_score()
+    df = records if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+    return np.clip(tarjeta.puntos(df), tarjeta.minimo, tarjeta.maximo).astype(np.int16)
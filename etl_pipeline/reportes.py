@@ -0,0 +1,282 @@
+"""
+=============================================================================
+ REPORTES DE RIESGO — analisis_riesgo.sql sobre resúmenes materializados
+=============================================================================
+ Sirve las consultas 3.1–3.5 de analisis_riesgo.sql desde la base cargada por
+ el ETL (--base-datos), sin recorrer Fact_Prestamos en cada corrida:
+
+   - Resúmenes materializados en la misma base (tablas Resumen_*): agregados
+     aditivos por propósito, por vivienda y por cliente (con sus propósitos
+     y estados concatenados).
+   - Actualización incremental: los hechos se anexan con ID_Prestamo
+     creciente, así que solo se agregan las filas posteriores a la última
+     procesada (Resumen_Estado) y se combinan con lo ya materializado.
+   - Caché LRU de resultados con clave (sección, versión de los datos): la
+     versión la escribe cada carga en Version_Datos.
+
+   python3 -m etl_pipeline report --base-datos data/processed/riesgo.db
+   python3 -m etl_pipeline report --base-datos data/processed/riesgo.duckdb --secciones 3.2 3.4
+=============================================================================
+"""
+
+import functools
+import os
+import time
+
+import pandas as pd
+
+from . import pipeline as etl
+
+ID_MALO = "(SELECT ID_Riesgo FROM Dim_Riesgo WHERE Estado_Riesgo = 'Bad')"
+
+# Resúmenes materializados: columnas aditivas (las tasas y promedios se calculan al leer).
+# Propositos y Estados_Riesgo de un cliente se concatenan: también se anexan.
+RESUMENES = {
+    'Resumen_Proposito': "ID_Proposito INTEGER PRIMARY KEY, Creditos BIGINT, Creditos_Malos BIGINT, "
+                         "Monto_Total BIGINT, Monto_Malos BIGINT",
+    'Resumen_Vivienda': "Vivienda TEXT PRIMARY KEY, Creditos BIGINT, Creditos_Malos BIGINT, Monto_Total BIGINT",
+    'Resumen_Clientes': "Codigo_Cliente BIGINT PRIMARY KEY, Creditos BIGINT, Creditos_Malos BIGINT, "
+                        "Monto_Total BIGINT, Monto_Malos BIGINT, Ultimo_Cliente BIGINT, Edad BIGINT, "
+                        "Propositos TEXT, Estados_Riesgo TEXT",
+    'Resumen_Estado': "Ultimo_Prestamo BIGINT, Version BIGINT",
+}
+
+
+def concatenar(columna, motor):
+    """Valores de `columna` de cada grupo separados por ' | ', en orden de ID_Prestamo.
+
+    DuckDB agrega en paralelo y necesita el ORDER BY dentro del agregado;
+    SQLite (que lo admite recién desde 3.44) concatena en el orden de la
+    subconsulta, ya ordenada por cliente y préstamo.
+    """
+    if motor == 'duckdb':
+        return f"STRING_AGG({columna}, ' | ' ORDER BY f.ID_Prestamo)"
+    return f"GROUP_CONCAT({columna}, ' | ')"
+
+
+@functools.lru_cache(maxsize=None)
+def actualizaciones(motor):
+    """Sentencias que agregan los hechos nuevos a los resúmenes.
+
+    Cada una recibe como parámetro el último ID_Prestamo ya materializado
+    (las que no tienen '?' no reciben nada). UPSERT: misma sintaxis en
+    SQLite y DuckDB.
+    """
+    return [
+        f"""INSERT INTO Resumen_Proposito
+            SELECT f.ID_Proposito, COUNT(*),
+                   SUM(CASE WHEN f.ID_Riesgo = b.ID_Riesgo THEN 1 ELSE 0 END),
+                   SUM(f.Monto),
+                   SUM(CASE WHEN f.ID_Riesgo = b.ID_Riesgo THEN f.Monto ELSE 0 END)
+            FROM Fact_Prestamos f CROSS JOIN (SELECT {ID_MALO} AS ID_Riesgo) b
+            WHERE f.ID_Prestamo > ?
+            GROUP BY f.ID_Proposito
+            ON CONFLICT (ID_Proposito) DO UPDATE SET
+                Creditos = Creditos + excluded.Creditos,
+                Creditos_Malos = Creditos_Malos + excluded.Creditos_Malos,
+                Monto_Total = Monto_Total + excluded.Monto_Total,
+                Monto_Malos = Monto_Malos + excluded.Monto_Malos""",
+        f"""INSERT INTO Resumen_Vivienda
+            SELECT c.Vivienda, COUNT(*),
+                   SUM(CASE WHEN f.ID_Riesgo = b.ID_Riesgo THEN 1 ELSE 0 END),
+                   SUM(f.Monto)
+            FROM Fact_Prestamos f CROSS JOIN (SELECT {ID_MALO} AS ID_Riesgo) b
+            JOIN Dim_Cliente c ON f.ID_Cliente = c.ID_Cliente
+            WHERE f.ID_Prestamo > ?
+            GROUP BY c.Vivienda
+            ON CONFLICT (Vivienda) DO UPDATE SET
+                Creditos = Creditos + excluded.Creditos,
+                Creditos_Malos = Creditos_Malos + excluded.Creditos_Malos,
+                Monto_Total = Monto_Total + excluded.Monto_Total""",
+        # Los hechos nuevos de un cliente apuntan a su versión vigente, la de mayor
+        # ID_Cliente (las versiones siguen el orden de carga); Edad es la mayor de
+        # sus préstamos
+        f"""INSERT INTO Resumen_Clientes
+            SELECT f.Codigo_Cliente, COUNT(*), SUM(f.Malo), SUM(f.Monto), SUM(f.Malo * f.Monto),
+                   MAX(f.ID_Cliente), MAX(f.Edad),
+                   {concatenar('f.Proposito', motor)}, {concatenar('f.Estado_Riesgo', motor)}
+            FROM (SELECT c.Codigo_Cliente, f.ID_Prestamo, f.ID_Cliente, f.Edad, f.Monto, p.Proposito, r.Estado_Riesgo,
+                         CASE WHEN r.Estado_Riesgo = 'Bad' THEN 1 ELSE 0 END AS Malo
+                  FROM Fact_Prestamos f
+                  JOIN Dim_Cliente c ON f.ID_Cliente = c.ID_Cliente
+                  JOIN Dim_Proposito p ON f.ID_Proposito = p.ID_Proposito
+                  JOIN Dim_Riesgo r ON f.ID_Riesgo = r.ID_Riesgo
+                  WHERE f.ID_Prestamo > ?
+                  ORDER BY c.Codigo_Cliente, f.ID_Prestamo) f
+            GROUP BY f.Codigo_Cliente
+            ON CONFLICT (Codigo_Cliente) DO UPDATE SET
+                Creditos = Creditos + excluded.Creditos,
+                Creditos_Malos = Creditos_Malos + excluded.Creditos_Malos,
+                Monto_Total = Monto_Total + excluded.Monto_Total,
+                Monto_Malos = Monto_Malos + excluded.Monto_Malos,
+                Ultimo_Cliente = excluded.Ultimo_Cliente,
+                Edad = excluded.Edad,
+                Propositos = Propositos || ' | ' || excluded.Propositos,
+                Estados_Riesgo = Estados_Riesgo || ' | ' || excluded.Estados_Riesgo""",
+    ]
+
+
+# Sección de analisis_riesgo.sql → (título, consulta sobre los resúmenes); mismas columnas que el script
+REPORTES = {
+    '3.1': ("Consulta maestra de riesgo", """
+        SELECT p.Proposito AS Categoria,
+               SUM(r.Creditos) AS Total_Prestamos,
+               SUM(r.Monto_Total) AS Dinero_Total_Prestado,
+               SUM(r.Creditos_Malos) AS Prestamos_Riesgosos,
+               ROUND(CAST(SUM(r.Creditos_Malos) AS DOUBLE) / SUM(r.Creditos) * 100, 1) || '%' AS Tasa_Morosidad
+        FROM Resumen_Proposito r
+        JOIN Dim_Proposito p ON r.ID_Proposito = p.ID_Proposito
+        GROUP BY p.Proposito
+        ORDER BY Dinero_Total_Prestado DESC"""),
+    '3.2': ("Perfil de clientes morosos", """
+        SELECT r.Codigo_Cliente, r.Edad, c.Genero, c.Trabajo, c.Vivienda,
+               r.Creditos AS Num_Prestamos, r.Monto_Total AS Deuda_Total, r.Monto_Malos AS Monto_En_Riesgo
+        FROM Resumen_Clientes r
+        JOIN Dim_Cliente c ON r.Ultimo_Cliente = c.ID_Cliente
+        WHERE r.Creditos_Malos > 0
+        ORDER BY r.Monto_Malos DESC, r.Codigo_Cliente"""),
+    '3.3': ("Resumen ejecutivo de la cartera", """
+        SELECT SUM(Creditos) AS Total_Prestamos,
+               SUM(Monto_Total) AS Monto_Total_Prestado,
+               SUM(Monto_Malos) AS Monto_En_Riesgo,
+               ROUND(CAST(SUM(Creditos_Malos) AS DOUBLE) / SUM(Creditos) * 100, 1) || '%' AS Tasa_Morosidad_Global,
+               ROUND(CAST(SUM(Monto_Total) AS DOUBLE) / SUM(Creditos), 2) AS Monto_Promedio_Prestamo
+        FROM Resumen_Proposito"""),
+    '3.4': ("Análisis por tipo de vivienda", """
+        SELECT Vivienda,
+               Creditos AS Total_Prestamos,
+               ROUND(CAST(Monto_Total AS DOUBLE) / Creditos, 2) AS Monto_Promedio,
+               Creditos_Malos AS Malos,
+               ROUND(CAST(Creditos_Malos AS DOUBLE) / Creditos * 100, 1) || '%' AS Tasa_Morosidad
+        FROM Resumen_Vivienda
+        ORDER BY Tasa_Morosidad DESC"""),
+    '3.5': ("Top clientes por exposición", """
+        SELECT r.Codigo_Cliente,
+               c.Genero || ', ' || r.Edad || ' años, ' || c.Trabajo AS Perfil_Cliente,
+               r.Monto_Total AS Exposicion_Total, r.Propositos, r.Estados_Riesgo
+        FROM Resumen_Clientes r
+        JOIN Dim_Cliente c ON r.Ultimo_Cliente = c.ID_Cliente
+        ORDER BY r.Monto_Total DESC, r.Codigo_Cliente"""),
+}
+
+
+class ReportesRiesgo:
+    """Reportes de analisis_riesgo.sql sobre una base cargada por `etl.cargar_base_datos`.
+
+    Mantiene una conexión abierta (DuckDB tarda ~30 ms en conectar); si la
+    base se reconstruye (el archivo se reemplaza) se reconecta sola. Los
+    resúmenes asumen hechos append-only, que es como los carga el ETL.
+    """
+
+    def __init__(self, ruta=etl.RUTA_BASE_DATOS, tamanio_cache=128):
+        if not os.path.exists(ruta):
+            raise FileNotFoundError(f"No existe la base {ruta}: cárguela con python3 -m etl_pipeline --base-datos")
+        self.ruta = ruta
+        self.motor = 'duckdb' if ruta.endswith('.duckdb') else 'sqlite'
+        self._conexion = None
+        self._inodo = None
+        self._version_resumen = None
+        self._leer = functools.lru_cache(maxsize=tamanio_cache)(self._consultar)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
+
+    def _conectar(self):
+        """Conexión vigente; se renueva si el archivo de la base cambió de inodo."""
+        inodo = os.stat(self.ruta).st_ino
+        if self._conexion is None or inodo != self._inodo:
+            self.cerrar()
+            if self.motor == 'duckdb':
+                import duckdb
+                self._conexion = duckdb.connect(self.ruta)
+            else:
+                import sqlite3
+                self._conexion = sqlite3.connect(self.ruta)
+            self._inodo = inodo
+            self._version_resumen = None
+        return self._conexion
+
+    def version(self):
+        """Versión de los datos cargados (`Version_Datos`)."""
+        version, = self._conectar().execute(f"SELECT Version FROM {etl.TABLA_VERSION}").fetchone()
+        return version
+
+    def actualizar(self):
+        """Lleva los resúmenes a la versión actual agregando solo los hechos nuevos.
+
+        Devuelve cuántos hechos se agregaron (0 si ya estaban al día). Todo
+        ocurre en una transacción: una actualización fallida no deja
+        resúmenes a medias.
+        """
+        conexion = self._conectar()
+        for tabla, columnas in RESUMENES.items():
+            conexion.execute(f"CREATE TABLE IF NOT EXISTS {tabla} ({columnas})")
+        version = self.version()
+        estado = conexion.execute("SELECT Ultimo_Prestamo, Version FROM Resumen_Estado").fetchone()
+        desde = estado[0] if estado else 0
+        nuevos = 0
+        if estado is None or estado[1] != version:
+            conexion.execute("BEGIN")
+            try:
+                hasta, nuevos = conexion.execute(
+                    "SELECT COALESCE(MAX(ID_Prestamo), 0), COUNT(*) FROM Fact_Prestamos WHERE ID_Prestamo > ?",
+                    (desde,)).fetchone()
+                for sql in actualizaciones(self.motor):
+                    conexion.execute(sql, (desde,) if '?' in sql else ())
+                conexion.execute("DELETE FROM Resumen_Estado")
+                conexion.execute("INSERT INTO Resumen_Estado VALUES (?, ?)", (max(hasta, desde), version))
+                for tabla in RESUMENES:
+                    # Sin estadísticas, SQLite recorre los hechos en vez de partir del resumen
+                    conexion.execute(f"ANALYZE {tabla}")
+                conexion.commit()
+            except Exception:
+                conexion.rollback()
+                raise
+        self._version_resumen = version
+        return nuevos
+
+    def _consultar(self, seccion, version):
+        """Resultado de una sección (cacheado por `self._leer` con clave (sección, versión))."""
+        cursor = self._conectar().execute(REPORTES[seccion][1])
+        columnas = [d[0] for d in cursor.description]
+        return pd.DataFrame(cursor.fetchall(), columns=columnas)
+
+    def reporte(self, seccion):
+        """DataFrame de la sección `seccion` ('3.1' … '3.5'); actualiza los resúmenes si hay datos nuevos."""
+        if seccion not in REPORTES:
+            raise KeyError(f"Sección desconocida: {seccion} (válidas: {', '.join(REPORTES)})")
+        version = self.version()
+        if version != self._version_resumen:
+            self.actualizar()
+        return self._leer(seccion, version).copy()
+
+    def todos(self):
+        """Las cinco secciones, en orden."""
+        return {seccion: self.reporte(seccion) for seccion in REPORTES}
+
+
+def imprimir_reportes(ruta=etl.RUTA_BASE_DATOS, secciones=tuple(REPORTES)):
+    """Actualiza los resúmenes e imprime las secciones pedidas con sus tiempos (frío y en caché)."""
+    with ReportesRiesgo(ruta) as reportes:
+        inicio = time.perf_counter()
+        nuevos = reportes.actualizar()
+        print(f"🔄 Resúmenes al día ({nuevos:,} hechos nuevos agregados, {time.perf_counter() - inicio:.3f} s)")
+        for seccion in secciones:
+            inicio = time.perf_counter()
+            df = reportes.reporte(seccion)
+            t_frio = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            reportes.reporte(seccion)
+            t_cache = time.perf_counter() - inicio
+            print(f"\n📊 {seccion} {REPORTES[seccion][0].upper()} "
+                  f"({t_frio * 1000:.1f} ms, en caché {t_cache * 1000:.2f} ms)")
+            print(df.to_string(index=False))
+
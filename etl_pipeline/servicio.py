@@ -0,0 +1,262 @@
+"""
+=============================================================================
+ SERVICIO DE SCORING ONLINE — decodificación y score por solicitud
+=============================================================================
+ Recibe solicitudes de crédito con los códigos crudos del German Credit Data
+ (un dict con las columnas de COLUMN_NAMES o una línea del archivo crudo) y
+ devuelve los atributos decodificados, Score_Cliente, Categoria_Score,
+ Rango_Edad, Rango_Monto y Cuota_Mensual con las mismas tablas de
+ decodificación, scorecard y tramos que el ETL batch.
+
+   - EvaluadorSolicitudes: API en proceso; tablas precargadas al crearlo y
+     scoring vectorizado de un lote con `TarjetaScore.puntos_codigos`.
+   - MicroLotes: junta las solicitudes concurrentes de asyncio en un lote.
+   - Servidor HTTP asyncio (solo biblioteca estándar):
+       POST /score   {solicitud} o [solicitudes]  →  resultado(s)
+       GET  /salud
+
+   python3 -m etl_pipeline serve --puerto 8080
+   curl -s localhost:8080/score -d '"A11 6 A34 A43 1169 A65 A75 4 A93 A101 4 A121 67 A143 A152 2 A173 1 A192 A201"'
+
+ El score online no lleva el ruido N(0, 30) con el que el ETL simula la
+ dispersión: es el puntaje del scorecard acotado a sus límites (como `score`).
+=============================================================================
+"""
+
+import asyncio
+import json
+
+import numpy as np
+
+from . import catalogo, reglas
+
+COLUMNAS_SOLICITUD = catalogo.COLUMN_NAMES[:-1]      # sin Riesgo (es lo que se quiere estimar)
+NUMERICAS = ('Duracion_Meses', 'Monto_Credito', 'Edad')
+
+
+class SolicitudInvalida(ValueError):
+    """Solicitud sin las columnas mínimas, con códigos desconocidos o con valores no numéricos."""
+
+
+class EvaluadorSolicitudes:
+    """Decodifica y puntúa lotes de solicitudes crudas con las reglas del ETL."""
+
+    def __init__(self, tarjeta=None):
+        self.tarjeta = tarjeta or reglas.tarjeta_score()
+        self.requeridas = set(self.tarjeta.tablas) | set(NUMERICAS)
+        # Tablas precargadas: código A → etiqueta, y etiquetas de tramos (None = fuera de rango)
+        self.decodificaciones = {columna: dict(mapeo) for columna, mapeo in catalogo.DECODIFICACIONES.items()}
+        self.etiquetas = {
+            'Rango_Edad': np.array(reglas.ETIQUETAS_EDAD + [None], dtype=object),
+            'Categoria_Score': np.array(reglas.ETIQUETAS_SCORE + [None], dtype=object),
+            'Rango_Monto': np.array(reglas.ETIQUETAS_MONTO + [None], dtype=object),
+        }
+
+    def normalizar(self, solicitud):
+        """Solicitud como dict {columna: valor}; acepta una línea del archivo crudo."""
+        if isinstance(solicitud, str):
+            valores = solicitud.split()
+            if len(valores) not in (len(COLUMNAS_SOLICITUD), len(catalogo.COLUMN_NAMES)):
+                raise SolicitudInvalida(f"Se esperaban {len(COLUMNAS_SOLICITUD)} campos, llegaron {len(valores)}")
+            solicitud = dict(zip(COLUMNAS_SOLICITUD, valores))
+        if not isinstance(solicitud, dict):
+            raise SolicitudInvalida("La solicitud debe ser un objeto o una línea del archivo crudo")
+        faltantes = self.requeridas - solicitud.keys()
+        if faltantes:
+            raise SolicitudInvalida(f"Faltan columnas: {', '.join(sorted(faltantes))}")
+        for columna, mapeo in self.decodificaciones.items():
+            valor = solicitud.get(columna)
+            if valor is not None and not (isinstance(valor, str) and valor in mapeo):
+                raise SolicitudInvalida(f"{columna}: código desconocido {valor!r}")
+        try:
+            for columna in NUMERICAS:
+                float(solicitud[columna])
+        except (TypeError, ValueError):
+            raise SolicitudInvalida(f"{columna} debe ser numérico") from None
+        return solicitud
+
+    def evaluar(self, solicitudes):
+        """Lista de resultados (dicts) para una lista de solicitudes ya normalizadas."""
+        monto = np.array([float(s['Monto_Credito']) for s in solicitudes])
+        duracion = np.array([float(s['Duracion_Meses']) for s in solicitudes])
+        edad = np.array([float(s['Edad']) for s in solicitudes])
+        numeros = {columna: np.array([catalogo.numero_codigo(s[columna]) for s in solicitudes])
+                   for columna in self.tarjeta.tablas}
+
+        score = np.clip(self.tarjeta.puntos_codigos(numeros, monto, duracion),
+                        self.tarjeta.minimo, self.tarjeta.maximo)
+        tramos = {
+            'Rango_Edad': self.etiquetas['Rango_Edad'][reglas.codigos_tramo(edad, reglas.BORDES_EDAD)],
+            'Categoria_Score': self.etiquetas['Categoria_Score'][reglas.codigos_tramo(score, reglas.BORDES_SCORE)],
+            'Rango_Monto': self.etiquetas['Rango_Monto'][reglas.codigos_tramo(monto, reglas.BORDES_MONTO)],
+        }
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cuota = np.round(monto / duracion, 2)
+
+        resultados = []
+        for i, solicitud in enumerate(solicitudes):
+            resultado = {columna: mapeo.get(solicitud[columna], solicitud[columna])
+                         for columna, mapeo in self.decodificaciones.items() if columna in solicitud}
+            sexo = solicitud.get('Estado_Personal_Sexo')
+            if sexo is not None:
+                resultado['Genero'] = catalogo.GENERO_POR_CODIGO.get(sexo, 'Femenino')
+                resultado['Estado_Civil'] = catalogo.ESTADO_CIVIL_POR_CODIGO.get(sexo, 'Desconocido')
+            resultado['Score_Cliente'] = int(score[i])
+            for nombre, etiquetas in tramos.items():
+                resultado[nombre] = etiquetas[i]
+            resultado['Cuota_Mensual'] = float(cuota[i]) if np.isfinite(cuota[i]) else None
+            resultados.append(resultado)
+        return resultados
+
+
+class MicroLotes:
+    """Junta las solicitudes que llegan juntas y las evalúa en un solo lote.
+
+    Cada solicitud espera en una cola; el consumidor toma la primera, cede el
+    control `espera` segundos (0 = una vuelta del event loop) para que lleguen
+    las concurrentes y evalúa hasta `maximo` de una vez. Si el lote falla, se
+    evalúa cada solicitud por separado: el error llega solo a la que lo causó.
+    """
+
+    def __init__(self, evaluador, maximo=256, espera=0.0):
+        self.evaluador = evaluador
+        self.maximo = maximo
+        self.espera = espera
+        self._cola = asyncio.Queue()
+        self._tarea = None
+
+    async def evaluar(self, solicitud):
+        solicitud = self.evaluador.normalizar(solicitud)
+        if self._tarea is None:
+            self._tarea = asyncio.create_task(self._consumir())
+        futuro = asyncio.get_running_loop().create_future()
+        self._cola.put_nowait((solicitud, futuro))
+        return await futuro
+
+    async def _consumir(self):
+        while True:
+            lote = [await self._cola.get()]
+            await asyncio.sleep(self.espera)
+            while len(lote) < self.maximo and not self._cola.empty():
+                lote.append(self._cola.get_nowait())
+            try:
+                resultados = self.evaluador.evaluar([solicitud for solicitud, _ in lote])
+            except Exception:
+                self._evaluar_por_separado(lote)
+                continue
+            for (_, futuro), resultado in zip(lote, resultados):
+                if not futuro.done():
+                    futuro.set_result(resultado)
+
+    def _evaluar_por_separado(self, lote):
+        for solicitud, futuro in lote:
+            try:
+                resultado, = self.evaluador.evaluar([solicitud])
+            except Exception as e:
+                if not futuro.done():
+                    futuro.set_exception(e)
+                continue
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+
+# ─── HTTP ────────────────────────────────────────────────────────────────────
+
+ESTADOS_HTTP = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                500: 'Internal Server Error'}
+
+
+def respuesta_http(estado, cuerpo, cerrar=False):
+    datos = json.dumps(cuerpo, ensure_ascii=False).encode('utf-8')
+    encabezados = (f"HTTP/1.1 {estado} {ESTADOS_HTTP[estado]}\r\n"
+                   f"Content-Type: application/json; charset=utf-8\r\n"
+                   f"Content-Length: {len(datos)}\r\n"
+                   f"Connection: {'close' if cerrar else 'keep-alive'}\r\n\r\n")
+    return encabezados.encode('ascii') + datos
+
+
+async def leer_pedido(lector):
+    """(método, ruta, encabezados, cuerpo) del próximo pedido, o None si el cliente cerró.
+
+    Lanza ValueError si la línea de pedido, los encabezados o Content-Length
+    no respetan HTTP/1.1.
+    """
+    linea = await lector.readline()
+    if not linea:
+        return None
+    partes = linea.decode('latin-1').split(' ', 2)
+    if len(partes) != 3:
+        raise ValueError(f"Línea de pedido inválida: {linea[:80]!r}")
+    metodo, ruta, _ = partes
+    encabezados = {}
+    while (cabecera := await lector.readline()) not in (b'\r\n', b'\n', b''):
+        nombre, _, valor = cabecera.decode('latin-1').partition(':')
+        encabezados[nombre.strip().lower()] = valor.strip()
+    largo = encabezados.get('content-length', '0')
+    if not largo.isdigit():
+        raise ValueError(f"Content-Length inválido: {largo!r}")
+    return metodo, ruta, encabezados, await lector.readexactly(int(largo))
+
+
+async def atender(lotes, lector, escritor):
+    """Una conexión HTTP/1.1 con keep-alive: una respuesta por pedido, en orden.
+
+    Un pedido mal formado recibe un 400 y la conexión se cierra.
+    """
+    try:
+        while True:
+            try:
+                pedido = await leer_pedido(lector)
+            except ValueError as e:         # también una línea más larga que el límite del lector
+                escritor.write(respuesta_http(400, {'error': str(e)}, cerrar=True))
+                await escritor.drain()
+                break
+            if pedido is None:
+                break
+            metodo, ruta, encabezados, cuerpo = pedido
+            cerrar = encabezados.get('connection', '').lower() == 'close'
+
+            if ruta == '/salud':
+                estado, resultado = 200, {'estado': 'ok'}
+            elif ruta != '/score':
+                estado, resultado = 404, {'error': f"Ruta desconocida: {ruta}"}
+            elif metodo != 'POST':
+                estado, resultado = 405, {'error': "Usar POST"}
+            else:
+                try:
+                    datos = json.loads(cuerpo)
+                    if isinstance(datos, list):
+                        resultado = await asyncio.gather(*(lotes.evaluar(s) for s in datos),
+                                                         return_exceptions=True)
+                        for error in resultado:
+                            if isinstance(error, Exception):
+                                raise error
+                    else:
+                        resultado = await lotes.evaluar(datos)
+                    estado = 200
+                except ValueError as e:     # JSON mal formado o SolicitudInvalida
+                    estado, resultado = 400, {'error': str(e)}
+                except Exception as e:
+                    print(f"⚠️  Error evaluando /score: {e!r}")
+                    estado, resultado = 500, {'error': "Error interno evaluando la solicitud"}
+
+            escritor.write(respuesta_http(estado, resultado, cerrar))
+            await escritor.drain()
+            if cerrar:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        escritor.close()
+
+
+async def servir(host='127.0.0.1', puerto=8080, maximo=256, espera=0.0, listo=None):
+    """Levanta el servicio; `listo` (asyncio.Event) se activa cuando acepta conexiones."""
+    lotes = MicroLotes(EvaluadorSolicitudes(), maximo, espera)
+    servidor = await asyncio.start_server(lambda r, w: atender(lotes, r, w), host, puerto)
+    print(f"🚀 Servicio de scoring en http://{host}:{puerto}/score")
+    if listo is not None:
+        listo.set()
+    async with servidor:
+        await servidor.serve_forever()
+
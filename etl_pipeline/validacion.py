@@ -0,0 +1,150 @@
+"""
+Validación de calidad de datos: reglas declarativas evaluadas como máscaras
+vectorizadas, una pasada por bloque.
+
+`REGLAS_CRUDO` se evalúa sobre el bloque crudo, antes de decodificar: dominio
+de cada columna codificada (las claves de `DECODIFICACIONES`, así un código A
+desconocido ya no pasa en silencio) y de las ordinales, y rangos numéricos.
+Las reglas de tipo 'referencia' validan las claves foráneas de
+Fact_Prestamos contra las claves de cada dimensión. Cada regla se llama
+`tipo.columna` (p. ej. 'rango.Edad'). Solo requiere numpy; pandas se importa
+al convertir columnas que no llegaron como números.
+"""
+
+import contextlib
+
+import numpy as np
+
+from .catalogo import DECODE_RIESGO, DECODIFICACIONES
+
+# tipo de regla → {columna: parámetro}. Se agrega una regla sumando una entrada;
+# el tipo define cómo se evalúa (`CUMPLE`).
+REGLAS_CRUDO = {
+    'dominio': {
+        **{columna: tuple(mapping) for columna, mapping in DECODIFICACIONES.items()},
+        'Tasa_Cuota': (1, 2, 3, 4),
+        'Residencia_Desde': (1, 2, 3, 4),
+        'Creditos_Existentes': (1, 2, 3, 4),
+        'Personas_Dependientes': (1, 2),
+        'Riesgo': tuple(DECODE_RIESGO),
+    },
+    'rango': {
+        'Edad': (18, 100),                  # los tramos de edad cubren (17, 100]
+        'Monto_Credito': (1, 1_000_000),
+        'Duracion_Meses': (1, 120),         # Cuota_Mensual divide por la duración
+    },
+}
+
+# Amplitud máxima (máx − mín) de claves que `cumple_referencia` resuelve con una tabla booleana
+MAX_TABLA_DENSA = 1 << 24
+
+
+def numeros(serie):
+    """Valores numéricos de una columna; lo que no es número queda NaN (columnas leídas como texto)."""
+    if serie.dtype.kind in 'iuf':
+        return serie.to_numpy()
+    import pandas as pd
+    return pd.to_numeric(serie.astype(object), errors='coerce').to_numpy(dtype=float)
+
+
+def cumple_dominio(serie, dominio):
+    """Filas cuyo valor está en `dominio` (los nulos no cumplen).
+
+    En las categóricas la pertenencia se resuelve una vez por categoría y las
+    filas solo se indexan por código.
+    """
+    if serie.dtype.name == 'category':
+        codigos = serie.cat.codes.to_numpy()
+        permitidas = np.array([c in dominio for c in serie.cat.categories], dtype=bool)
+        if permitidas.all():
+            return codigos >= 0
+        return np.append(permitidas, False)[codigos]       # el código -1 (nulo) cae en el False
+    return np.isin(numeros(serie), dominio)
+
+
+def cumple_rango(serie, limites):
+    """Filas con valor numérico en [mínimo, máximo] (NaN y texto no cumplen)."""
+    minimo, maximo = limites
+    valores = numeros(serie)
+    return (valores >= minimo) & (valores <= maximo)
+
+
+def cumple_referencia(serie, claves):
+    """Filas cuya clave existe en la dimensión: `claves` es un `range` o un array ordenado.
+
+    Si las claves son densas (YYYYMMDD, IDs secuenciales con huecos) se usa
+    una tabla booleana indexada por valor; si no, búsqueda binaria.
+    """
+    valores = serie.to_numpy()
+    if isinstance(claves, range):
+        return (valores >= claves.start) & (valores < claves.stop)
+    if len(claves) == 0:
+        return np.zeros(len(valores), dtype=bool)
+    minimo, amplitud = int(claves[0]), int(claves[-1]) - int(claves[0])
+    if amplitud <= MAX_TABLA_DENSA:
+        tabla = np.zeros(amplitud + 2, dtype=bool)      # la última posición (False) recibe lo que está fuera
+        tabla[claves - minimo] = True
+        return tabla[np.clip(valores.astype(np.int64) - minimo, -1, amplitud + 1)]
+    posiciones = np.minimum(np.searchsorted(claves, valores), len(claves) - 1)
+    return claves[posiciones] == valores
+
+
+CUMPLE = {'dominio': cumple_dominio, 'rango': cumple_rango, 'referencia': cumple_referencia}
+
+
+def evaluar(df, reglas=REGLAS_CRUDO, etapa=None):
+    """Evalúa las reglas sobre `df`: (máscara de filas válidas, fallas por regla, motivos).
+
+    `etapa(nombre, filas)` es un context manager que mide cada regla (p. ej.
+    `REGISTRO.etapa`). Las máscaras solo se combinan si la regla tiene fallas;
+    `motivos` tiene, por cada fila inválida en orden, las reglas que incumple
+    separadas por ';'.
+    """
+    etapa = etapa or (lambda nombre, filas: contextlib.nullcontext())
+    n = len(df)
+    validas = np.ones(n, dtype=bool)
+    fallas, incumplidas = {}, []
+    for tipo, columnas in reglas.items():
+        for columna, parametro in columnas.items():
+            nombre = f"{tipo}.{columna}"
+            with etapa(nombre, n):
+                cumple = CUMPLE[tipo](df[columna], parametro)
+                fallas[nombre] = n - int(np.count_nonzero(cumple))
+            if fallas[nombre]:
+                validas &= cumple
+                incumplidas.append((nombre, cumple))
+    return validas, fallas, motivos(validas, incumplidas)
+
+
+def motivos(validas, incumplidas):
+    """Reglas incumplidas ('regla;regla') de cada fila inválida, en orden de fila."""
+    invalidas = ~validas
+    motivo = np.full(np.count_nonzero(invalidas), '', dtype=object)
+    for nombre, cumple in incumplidas:
+        motivo[~cumple[invalidas]] += f"{nombre};"
+    return np.array([m[:-1] for m in motivo], dtype=object)
+
+
+class ValidacionCalidad:
+    """Filas validadas, filas en cuarentena y fallas por regla; se combinan entre bloques con `+`."""
+
+    def __init__(self, filas=0, cuarentena=0, fallas=None):
+        self.filas = filas
+        self.cuarentena = cuarentena
+        self.fallas = fallas or {}      # regla → filas que la incumplen
+
+    def registrar(self, fallas, cuarentena, filas=0):
+        """Suma el resultado de `evaluar` sobre un bloque (`filas` solo en la primera validación)."""
+        self.filas += filas
+        self.cuarentena += cuarentena
+        for regla, n in fallas.items():
+            self.fallas[regla] = self.fallas.get(regla, 0) + n
+
+    def __add__(self, otra):
+        suma = ValidacionCalidad(self.filas, self.cuarentena, dict(self.fallas))
+        suma.registrar(otra.fallas, otra.cuarentena, otra.filas)
+        return suma
+
+    def a_dict(self):
+        return {'filas': self.filas, 'cuarentena': self.cuarentena,
+                'fallas': {regla: n for regla, n in self.fallas.items() if n}}
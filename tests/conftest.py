@@ -0,0 +1,34 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from etl_pipeline import calendario, pipeline as etl  # noqa: E402
+
+
+def aislar(monkeypatch, directorio):
+    """RAW_DIR, PROCESSED_DIR y las rutas derivadas de ellos dentro de `directorio`: (raw, processed).
+
+    También reinicia el generador global `RNG`: cada corrida arranca como en un proceso nuevo.
+    """
+    raw, processed = directorio / "raw", directorio / "processed"
+    raw.mkdir()
+    processed.mkdir()
+    monkeypatch.setattr(etl, 'RNG', np.random.default_rng(etl.SEMILLA))
+    monkeypatch.setattr(etl, 'RAW_DIR', str(raw))
+    monkeypatch.setattr(etl, 'PROCESSED_DIR', str(processed))
+    monkeypatch.setattr(calendario, 'PROCESSED_DIR', str(processed))
+    monkeypatch.setattr(etl, 'RUTA_METRICAS', str(processed / "metricas_calidad.json"))
+    monkeypatch.setattr(etl, 'RUTA_ESTADO', str(processed / "estado_etl.json"))
+    monkeypatch.setattr(etl, 'RUTAS_INDICES', {
+        'Proposito': str(processed / "indice_proposito.npy"),
+        'Cliente': str(processed / "indice_cliente.npz"),
+    })
+    return raw, processed
+
+
+@pytest.fixture
+def directorios(tmp_path, monkeypatch):
+    return aislar(monkeypatch, tmp_path)
@@ -0,0 +1,51 @@
+"""
+Dim_Cliente (SCD tipo 2): versiones en orden de carga, IDs que no dependen de
+cómo se parten las filas y, sin clave de cliente, un cliente por préstamo.
+"""
+
+import numpy as np
+
+from etl_pipeline import pipeline as etl
+
+
+def filas(n=400, semilla=3):
+    """(claves, atributos, préstamos) al azar: pocos clientes que cambian de atributos."""
+    rng = np.random.default_rng(semilla)
+    return rng.integers(0, 30, n).astype(np.uint64), rng.integers(0, 3, n).astype(np.uint64), np.arange(1, n + 1)
+
+
+def test_versiones_en_orden_de_carga():
+    clientes = etl.IndiceClientes().asignar(np.array([7, 7, 7, 9], np.uint64), np.array([2, 1, 1, 2], np.uint64),
+                                            np.array([1, 2, 3, 4]))
+    base = etl.ID_CLIENTE_BASE
+    assert clientes['Codigo_Cliente'].tolist() == [1, 1, 1, 2]
+    assert clientes['Version'].tolist() == [1, 2, 2, 1]
+    assert clientes['ID_Cliente'].tolist() == [base + 1, base + 2, base + 2, base + 3]
+    assert clientes['Prestamo_Desde'].tolist() == [1, 2, 2, 4]
+
+
+def test_lotes_igual_a_una_pasada(tmp_path):
+    claves, atributos, prestamos = filas()
+    completo = etl.IndiceClientes().asignar(claves, atributos, prestamos)
+
+    ruta = str(tmp_path / "indice_cliente.npz")
+    partes = []
+    for lote in np.array_split(np.arange(len(claves)), 7):
+        indice = etl.IndiceClientes.cargar(ruta) if partes else etl.IndiceClientes()
+        partes.append(indice.asignar(claves[lote], atributos[lote], prestamos[lote]))
+        indice.guardar(ruta)
+    for columna in etl.COLUMNAS_SCD:
+        assert np.array_equal(np.concatenate([parte[columna] for parte in partes]), completo[columna]), columna
+
+
+def test_sin_clave_un_cliente_por_prestamo(tmp_path):
+    _, atributos, prestamos = filas()
+    por_prestamo = etl.ClientesPorPrestamo()
+    ruta = str(tmp_path / "indice_cliente.npz")
+    primero = por_prestamo.asignar(prestamos[:150], atributos[:150], prestamos[:150])
+    por_prestamo.guardar(ruta)
+    segundo = etl.ClientesPorPrestamo.cargar(ruta).asignar(prestamos[150:], atributos[150:], prestamos[150:])
+
+    esperado = etl.IndiceClientes().asignar(prestamos.astype(np.uint64), atributos, prestamos)
+    for columna in etl.COLUMNAS_SCD:
+        assert np.array_equal(np.concatenate([primero[columna], segundo[columna]]), esperado[columna]), columna
@@ -0,0 +1,131 @@
+"""
+Descargas contra un servidor HTTP local: manifiesto, pedidos condicionales
+(304 con If-None-Match) y cortes retomados con Range + If-Range.
+"""
+
+import contextlib
+import io
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from etl_pipeline import pipeline as etl
+
+DATOS = bytes(range(256)) * 40          # 10 KB
+OTROS = b"A11 6 A34 A43 1169\n" * 100
+
+
+class Fuente(BaseHTTPRequestHandler):
+    """GET de `servidor.archivos` ({ruta: (bytes, etag)}) con ETag, 304 y Range/If-Range.
+
+    Una ruta en `servidor.cortes` ({ruta: bytes}) corta la próxima respuesta
+    después de esos bytes, con el Content-Length completo.
+    """
+
+    def do_GET(self):
+        self.server.pedidos.append((self.path, dict(self.headers)))
+        if self.path not in self.server.archivos:
+            self.send_error(404)
+            return
+        datos, etag = self.server.archivos[self.path]
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        inicio = 0
+        if self.headers.get('Range') and self.headers.get('If-Range', etag) == etag:
+            inicio = int(self.headers['Range'].removeprefix('bytes=').rstrip('-'))
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {inicio}-{len(datos) - 1}/{len(datos)}")
+        else:
+            self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(datos) - inicio))
+        self.end_headers()
+        self.wfile.write(datos[inicio:inicio + self.server.cortes.pop(self.path, len(datos))])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), Fuente)
+    servidor.archivos = {'/german.data': (DATOS, '"v1"'), '/otros.data': (OTROS, '"o1"')}
+    servidor.cortes = {}
+    servidor.pedidos = []
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    servidor.url = f"http://127.0.0.1:{servidor.server_address[1]}"
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def descargar(servidor, directorio):
+    """descargar_fuentes de las dos rutas del servidor; devuelve el manifiesto guardado."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        etl.descargar_fuentes({'german.data': f"{servidor.url}/german.data",
+                               'otros.data': f"{servidor.url}/otros.data"}, str(directorio), workers=2)
+    return json.loads((directorio / etl.NOMBRE_MANIFIESTO).read_text(encoding='utf-8'))
+
+
+def test_manifiesto_y_304(servidor, tmp_path):
+    manifiesto = descargar(servidor, tmp_path)
+    assert (tmp_path / "german.data").read_bytes() == DATOS
+    assert (tmp_path / "otros.data").read_bytes() == OTROS
+    assert manifiesto['german.data']['etag'] == '"v1"'
+    assert manifiesto['german.data']['bytes'] == len(DATOS)
+    assert manifiesto['german.data']['sha256'] == etl.sha256_archivo(tmp_path / "german.data")
+    assert not list(tmp_path.glob("*.parcial*"))
+
+    # Sin cambios en el servidor: pedidos condicionales, 304 y el manifiesto intacto
+    servidor.pedidos.clear()
+    assert descargar(servidor, tmp_path) == manifiesto
+    assert sorted(encabezados.get('If-None-Match') for _, encabezados in servidor.pedidos) == ['"o1"', '"v1"']
+
+    # Una fuente cambia: solo esa se descarga y su entrada se actualiza
+    servidor.archivos['/german.data'] = (DATOS[::-1], '"v2"')
+    nuevo = descargar(servidor, tmp_path)
+    assert (tmp_path / "german.data").read_bytes() == DATOS[::-1]
+    assert nuevo['german.data']['etag'] == '"v2"'
+    assert nuevo['german.data']['sha256'] != manifiesto['german.data']['sha256']
+    assert nuevo['otros.data'] == manifiesto['otros.data']
+
+
+def test_304_con_archivo_local_alterado(servidor, tmp_path):
+    """Si el archivo local ya no coincide con el manifiesto, un 304 no alcanza: se descarga de nuevo."""
+    descargar(servidor, tmp_path)
+    (tmp_path / "german.data").write_bytes(b"corrupto")
+    descargar(servidor, tmp_path)
+    assert (tmp_path / "german.data").read_bytes() == DATOS
+
+
+def test_corte_se_retoma_con_range(servidor, tmp_path, monkeypatch):
+    monkeypatch.setattr(etl, 'BLOQUE_DESCARGA', 1024)
+    servidor.cortes['/german.data'] = 3000
+    descargar(servidor, tmp_path)
+    assert (tmp_path / "german.data").read_bytes() == DATOS
+
+    pedidos = [encabezados for ruta, encabezados in servidor.pedidos if ruta == '/german.data']
+    assert len(pedidos) == 2
+    retomado = int(pedidos[1]['Range'].removeprefix('bytes=').rstrip('-'))
+    assert 0 < retomado <= 3000         # lo escrito antes del corte no se vuelve a pedir
+    assert pedidos[1]['If-Range'] == '"v1"'
+
+
+def test_parcial_de_otra_version_se_descarta(servidor, tmp_path):
+    """Un .parcial de una versión anterior: If-Range no coincide, el servidor responde 200 y se empieza de nuevo."""
+    destino = tmp_path / "german.data"
+    (tmp_path / "german.data.parcial").write_bytes(b"x" * 500)
+    etl.guardar_estado({'etag': '"v0"', 'last_modified': None}, str(tmp_path / "german.data.parcial.json"))
+
+    with etl.sesion_http(1) as sesion:
+        entrada = etl.descargar_archivo(f"{servidor.url}/german.data", str(destino), sesion)
+    assert destino.read_bytes() == DATOS
+    assert entrada['estado'] == 'descargado' and entrada['etag'] == '"v1"'
+    assert servidor.pedidos[0][1]['If-Range'] == '"v0"'
+    assert not list(tmp_path.glob("*.parcial*"))
@@ -0,0 +1,198 @@
+"""
+Los modos del ETL (memoria, streaming, paralelo e incremental) exportan los
+mismos bytes, con bloques que no dividen la cantidad de filas y filas
+inválidas que van a cuarentena.
+"""
+
+import contextlib
+import io
+import os
+import re
+import sqlite3
+
+import numpy as np
+import pytest
+
+from conftest import aislar
+from etl_pipeline import cli, config, pipeline as etl
+from etl_pipeline.reportes import ReportesRiesgo
+
+FILAS = 1003
+INVALIDAS = (5, 700)        # filas con Riesgo = 3 (van a Cuarentena.csv)
+CHUNKSIZE = 97
+
+
+def crudo_sintetico(filas=FILAS):
+    """Bytes de un german_credit.data sintético con las filas de INVALIDAS corruptas."""
+    df = etl.generar_dataset_sintetico(filas, np.random.default_rng(7))
+    df.loc[list(INVALIDAS), 'Riesgo'] = 3
+    return etl.codificar_crudo(df)
+
+
+def correr(*opciones):
+    """`python3 -m etl_pipeline export` con las opciones dadas, sin log de métricas ni salida."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli.main(['export', '--log-metricas', '', *opciones])
+
+
+def exportados(directorio):
+    """{archivo: bytes} de los CSV exportados en `directorio`."""
+    return {nombre: (directorio / nombre).read_bytes()
+            for nombre in sorted(os.listdir(directorio)) if nombre.endswith('.csv')}
+
+
+def publicados(processed):
+    """{archivo: bytes} de la versión `actual/`, comprobando que su manifiesto la describe entera."""
+    actual = processed / etl.PUNTERO_ACTUAL
+    manifiesto = etl.cargar_estado(str(actual / etl.NOMBRE_MANIFIESTO_EXPORTACION))
+    archivos = exportados(actual)
+    assert sorted(entrada['archivo'] for entrada in manifiesto['tablas'].values()) == sorted(archivos)
+    for entrada in manifiesto['tablas'].values():
+        datos = archivos[entrada['archivo']]
+        assert entrada['bytes'] == len(datos)
+        assert entrada['filas'] == datos.count(b'\n') - 1
+        assert entrada['sha256'] == etl.sha256_archivo(str(actual / entrada['archivo']))
+    assert not [v for v in os.listdir(processed / etl.DIR_VERSIONES) if v.endswith('.tmp')]
+    return archivos
+
+
+def tablas_bd(ruta):
+    """{tabla: filas ordenadas} de las tablas del Star Schema en una base SQLite."""
+    with contextlib.closing(sqlite3.connect(ruta)) as conexion:
+        return {nombre: sorted(conexion.execute(f"SELECT * FROM {nombre}").fetchall(), key=repr)
+                for nombre in etl.TABLAS_BD}
+
+
+def reportes_bd(ruta):
+    """{sección: filas} de los reportes 3.1–3.5 servidos desde los resúmenes materializados."""
+    with ReportesRiesgo(str(ruta)) as reportes:
+        return {seccion: df.values.tolist() for seccion, df in reportes.todos().items()}
+
+
+@pytest.fixture(scope='module')
+def referencia(tmp_path_factory):
+    """CSV, tablas de la base y reportes del modo en memoria sobre el crudo completo."""
+    directorio = tmp_path_factory.mktemp('referencia')
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        raw, processed = aislar(monkeypatch, directorio)
+        (raw / "german_credit.data").write_bytes(crudo_sintetico())
+        correr('--base-datos', str(processed / "riesgo.db"))
+    base = processed / "riesgo.db"
+    return {'archivos': exportados(processed), 'tablas': tablas_bd(base), 'reportes': reportes_bd(base),
+            'base': base}
+
+
+def test_memoria_exporta_todas_las_tablas(referencia):
+    archivos = referencia['archivos']
+    assert publicados(referencia['base'].parent) == archivos
+    for nombre in etl.TABLAS_BD + ('Tabla_Completa', 'Cuarentena'):
+        assert f"{nombre}.csv" in archivos
+    assert archivos['Cuarentena.csv'].count(b'\n') == 1 + len(INVALIDAS)
+
+
+def test_reportes_iguales_al_script(referencia):
+    """Los reportes desde los resúmenes devuelven lo mismo que analisis_riesgo.sql sobre el Star Schema."""
+    with open(os.path.join(config.BASE_DIR, "analisis_riesgo.sql"), encoding='utf-8') as f:
+        script = f.read()
+    secciones = {}
+    for bloque in script.split(';'):
+        seccion = re.search(r'─── (\d\.\d)', bloque)
+        if seccion:
+            secciones[seccion.group(1)] = bloque
+    assert set(secciones) == set(referencia['reportes'])
+    with contextlib.closing(sqlite3.connect(referencia['base'])) as conexion:
+        for seccion, sql in secciones.items():
+            cursor = conexion.execute(sql)
+            assert cursor.fetchall() == [tuple(fila) for fila in referencia['reportes'][seccion]], seccion
+
+
+@pytest.mark.parametrize('opciones', [
+    ('--streaming', '--chunksize', str(CHUNKSIZE)),
+    ('--paralelo', '--workers', '3', '--chunksize', str(CHUNKSIZE)),
+], ids=['streaming', 'paralelo'])
+def test_modos_identicos_a_memoria(directorios, referencia, opciones):
+    raw, processed = directorios
+    (raw / "german_credit.data").write_bytes(crudo_sintetico())
+    correr(*opciones)
+    assert exportados(processed) == referencia['archivos']
+    assert publicados(processed) == referencia['archivos']
+
+
+def test_incremental_igual_a_reconstruccion(directorios, referencia, monkeypatch):
+    raw, processed = directorios
+    crudo = crudo_sintetico()
+    corte = crudo.index(b'\n', len(crudo) * 3 // 5) + 1
+    ruta, base = raw / "german_credit.data", processed / "riesgo.db"
+
+    ruta.write_bytes(crudo[:corte])
+    correr('--incremental', '--chunksize', str(CHUNKSIZE), '--base-datos', str(base))
+    reportes_bd(base)           # resúmenes materializados con la primera parte
+    ruta.write_bytes(crudo)
+    monkeypatch.setattr(etl, 'ejecutar_streaming', None)       # las filas nuevas se anexan sin reconstruir
+    correr('--incremental', '--chunksize', str(CHUNKSIZE), '--base-datos', str(base))
+
+    assert etl.cargar_estado(etl.RUTA_ESTADO).get('filas') == FILAS - len(INVALIDAS)
+    assert exportados(processed) == referencia['archivos']
+    assert publicados(processed) == referencia['archivos']
+    assert tablas_bd(base) == referencia['tablas']
+    assert reportes_bd(base) == referencia['reportes']
+
+
+def test_corrida_fallida_no_publica(directorios, referencia, monkeypatch):
+    """Si una corrida por bloques falla a mitad, `actual` y las tablas de siempre quedan como estaban."""
+    raw, processed = directorios
+    (raw / "german_credit.data").write_bytes(crudo_sintetico())
+    correr('--streaming', '--chunksize', str(CHUNKSIZE))
+    version = etl.version_actual(str(processed))
+
+    def fallar(*args, **kwargs):
+        raise RuntimeError("corte simulado")
+    monkeypatch.setattr(etl, 'exportar_dimensiones', fallar)
+    with pytest.raises(RuntimeError):
+        correr('--streaming', '--chunksize', str(CHUNKSIZE))
+    assert etl.version_actual(str(processed)) == version
+    assert exportados(processed) == publicados(processed) == referencia['archivos']
+
+
+def test_offset_posterior(tmp_path):
+    ruta = tmp_path / "tabla.csv"
+    claves = [1, 2, 3, 5, 8, 13, 21, 34, 55, 89]
+    lineas = [b"ID,Valor\n"] + [f"{clave},{'x' * clave}\n".encode() for clave in claves]
+    ruta.write_bytes(b''.join(lineas))
+    inicios = np.cumsum([len(linea) for linea in lineas])
+    for ultima in range(0, 92):
+        esperado = inicios[sum(clave <= ultima for clave in claves)]
+        for bloque in (1, 16, 1 << 16):
+            assert etl.offset_posterior(ruta, ultima, bloque) == esperado
+
+
+def test_clave_de_cliente_configurada(tmp_path, monkeypatch):
+    """Con una clave que agrupa préstamos (varias versiones por cliente) los modos siguen iguales."""
+    clave = ('Genero', 'Extranjero')
+    monkeypatch.setattr(etl, 'CLAVE_CLIENTE', clave)
+    monkeypatch.setattr(etl, 'COLUMNAS_CLAVE_CLIENTE', clave)
+    monkeypatch.setattr(etl, 'ATRIBUTOS_CLIENTE', [c for c in etl.ATRIBUTOS_CLIENTE if c not in clave])
+    monkeypatch.setattr(etl, 'INDICE_CLIENTES', etl.IndiceClientes)
+    crudo = crudo_sintetico()
+    corte = crudo.index(b'\n', len(crudo) // 2) + 1
+
+    salidas = {}
+    for nombre, opciones in (('memoria', ()), ('streaming', ('--streaming', '--chunksize', str(CHUNKSIZE))),
+                             ('paralelo', ('--paralelo', '--workers', '3', '--chunksize', str(CHUNKSIZE))),
+                             ('incremental', ('--incremental', '--chunksize', str(CHUNKSIZE)))):
+        (tmp_path / nombre).mkdir()
+        with pytest.MonkeyPatch.context() as aislado:
+            raw, processed = aislar(aislado, tmp_path / nombre)
+            if nombre == 'incremental':
+                (raw / "german_credit.data").write_bytes(crudo[:corte])
+                correr(*opciones)
+                aislado.setattr(etl, 'ejecutar_streaming', None)       # una reconstrucción fallaría
+            (raw / "german_credit.data").write_bytes(crudo)
+            correr(*opciones)
+            salidas[nombre] = exportados(processed)
+
+    dim = salidas['memoria']['Dim_Cliente.csv'].decode().splitlines()
+    assert len({linea.split(',')[1] for linea in dim[1:]}) == 4      # Codigo_Cliente: 2 géneros × 2
+    assert len(dim) - 1 > 4                                          # y varias versiones por cliente
+    for nombre in ('streaming', 'paralelo', 'incremental'):
+        assert salidas[nombre] == salidas['memoria'], nombre
@@ -0,0 +1,54 @@
+"""
+Scorecard: tablas que cubren todos los códigos del catálogo y códigos
+desconocidos rechazados en vez de sumar 0.
+"""
+
+import io
+
+import numpy as np
+import pytest
+
+from etl_pipeline import cli
+from etl_pipeline.reglas import TarjetaScore, tarjeta_score
+
+LINEA = "A11 6 A34 A43 1169 A65 A75 4 A93 A101 4 A121 67 A143 {vivienda} 2 A173 1 A192 A201 1\n"
+
+
+def configuracion(**atributos):
+    return {'base': 500, 'limites': [300, 850], 'atributos': atributos,
+            'ratio_monto_duracion': {'bordes': [0], 'puntos': [0, 0]}}
+
+
+def test_tablas_cubren_el_codigo_mas_alto():
+    tarjeta = TarjetaScore(configuracion(Proposito={'A40': 5, 'A410': 7}, Extranjero={'A202': -5}))
+    assert tarjeta.TAMANIO_TABLA > 410
+    ceros = np.zeros(2, dtype=int)
+    puntos = tarjeta.puntos_codigos({'Proposito': np.array([410, 40]), 'Extranjero': np.array([202, 0])},
+                                    ceros, ceros)
+    assert puntos.tolist() == [502, 505]
+
+
+@pytest.mark.parametrize('atributos', [
+    {'Vivienda': {'A410': 10}},         # código de otro atributo
+    {'Vivienda': {'A999': 10}},
+    {'Vivienda': {'Propia': 10}},
+    {'Edad': {'A1': 10}},               # atributo sin códigos A
+])
+def test_tarjeta_rechaza_codigos_ajenos(atributos):
+    with pytest.raises(ValueError):
+        TarjetaScore(configuracion(**atributos))
+
+
+@pytest.mark.parametrize('numero', [99, 410, 999, TarjetaScore.DESCONOCIDO])
+def test_codigo_desconocido_no_suma_cero(numero):
+    tarjeta = tarjeta_score()
+    numeros = {columna: np.zeros(2, dtype=int) for columna in tarjeta.tablas}
+    numeros['Vivienda'] = np.array([152, numero])
+    with pytest.raises(ValueError, match='Vivienda.*fila 2'):
+        tarjeta.puntos_codigos(numeros, np.ones(2), np.ones(2))
+
+
+def test_cli_score_rechaza_codigo_desconocido(monkeypatch):
+    monkeypatch.setattr('sys.stdin', io.StringIO(LINEA.format(vivienda='A152') + LINEA.format(vivienda='A410')))
+    with pytest.raises(SystemExit, match="Línea 2: 'A410' no es un código de Vivienda"):
+        cli.main(['score', '-'])
@@ -0,0 +1,93 @@
+"""
+Servicio de scoring: validación por solicitud, micro-lotes que aíslan la
+solicitud que falla y respuestas HTTP 400/500 en vez de cortar la conexión.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from etl_pipeline.servicio import EvaluadorSolicitudes, MicroLotes, SolicitudInvalida, atender
+
+LINEA = "A11 6 A34 A43 1169 A65 A75 4 A93 A101 4 A121 67 A143 A152 2 A173 1 A192 A201"
+
+
+def solicitud(**cambios):
+    return {**EvaluadorSolicitudes().normalizar(LINEA), **cambios}
+
+
+@pytest.mark.parametrize('cambios', [
+    {'Vivienda': 'A410'},               # código de otro atributo
+    {'Vivienda': 'A999'},
+    {'Vivienda': 152},
+    {'Status_Cuenta': ['A11']},
+    {'Monto_Credito': [1169]},
+    {'Edad': 'sesenta'},
+])
+def test_normalizar_rechaza(cambios):
+    with pytest.raises(SolicitudInvalida):
+        EvaluadorSolicitudes().normalizar(solicitud(**cambios))
+
+
+class EvaluadorFragil(EvaluadorSolicitudes):
+    """Falla en cualquier lote que contenga una solicitud con Monto_Credito 13."""
+
+    def evaluar(self, solicitudes):
+        if any(s['Monto_Credito'] == '13' for s in solicitudes):
+            raise RuntimeError("falla del lote")
+        return super().evaluar(solicitudes)
+
+
+def test_micro_lote_aisla_la_solicitud_que_falla():
+    async def escenario():
+        lotes = MicroLotes(EvaluadorFragil())
+        return await asyncio.gather(*(lotes.evaluar(solicitud(Monto_Credito=monto))
+                                      for monto in ('1000', '13', '2000')), return_exceptions=True)
+
+    bien, mal, otra = asyncio.run(escenario())
+    assert isinstance(mal, RuntimeError)
+    assert bien['Score_Cliente'] and otra['Score_Cliente']
+
+
+async def enviar(lotes, pedido):
+    """(estado, json) de la respuesta de `atender` a los bytes `pedido`."""
+    servidor = await asyncio.start_server(lambda r, w: atender(lotes, r, w), '127.0.0.1', 0)
+    async with servidor:
+        lector, escritor = await asyncio.open_connection(*servidor.sockets[0].getsockname())
+        escritor.write(pedido)
+        respuesta = await lector.read()
+        escritor.close()
+    encabezados, _, cuerpo = respuesta.partition(b"\r\n\r\n")
+    return int(encabezados.split()[1]), json.loads(cuerpo)
+
+
+async def pedir(lotes, cuerpo):
+    """(estado, json) de un POST /score atendido por `atender`."""
+    datos = json.dumps(cuerpo).encode('utf-8')
+    return await enviar(lotes, b"POST /score HTTP/1.1\r\nConnection: close\r\n"
+                        + f"Content-Length: {len(datos)}\r\n\r\n".encode('ascii') + datos)
+
+
+@pytest.mark.parametrize('cuerpo, estado', [
+    (LINEA, 200),
+    ([LINEA, LINEA], 200),
+    ([LINEA, LINEA.replace('A152', 'A999')], 400),
+    ({'Vivienda': 'A152'}, 400),
+    (LINEA.replace('1169', '13'), 500),
+])
+def test_atender_responde_siempre(cuerpo, estado):
+    respuesta, datos = asyncio.run(pedir(MicroLotes(EvaluadorFragil()), cuerpo))
+    assert respuesta == estado
+    assert ('error' in datos) == (estado != 200)
+
+
+@pytest.mark.parametrize('pedido', [
+    b"BASURA\r\n\r\n",
+    b"POST /score HTTP/1.1\r\nContent-Length: diez\r\n\r\n{}",
+    b"POST /score HTTP/1.1\r\nContent-Length: -1\r\n\r\n",
+], ids=['linea', 'content-length', 'negativo'])
+def test_pedido_mal_formado_recibe_400(pedido):
+    estado, datos = asyncio.run(enviar(MicroLotes(EvaluadorFragil()), pedido))
+    assert estado == 400
+    assert 'error' in datos